@@ -3,7 +3,8 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
-_backend_env = Path(__file__).resolve().parent.parent / ".env"
+_backend_dir = Path(__file__).resolve().parent.parent
+_backend_env = _backend_dir / ".env"
 load_dotenv(dotenv_path=_backend_env, override=False)
 load_dotenv(override=False)
 
@@ -12,6 +13,9 @@ class Settings:
     NEO4J_URI = os.getenv("NEO4J_URI", "bolt://127.0.0.1:7687")
     NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
     NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password123")
+    # /stats: "cached" (recomputed on the next call after each ingestion batch or graph clear)
+    # or "incremental" (kept current by every ingestion batch GraphService writes, no rescans)
+    GRAPH_STATS_MODE = os.getenv("GRAPH_STATS_MODE", "cached").lower()
 
     # Optional path to ffmpeg executable (e.g. C:\\ffmpeg\\bin\\ffmpeg.exe)
     FFMPEG_PATH = os.getenv("FFMPEG_PATH")
@@ -23,5 +27,101 @@ class Settings:
     S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", os.getenv("MINIO_BUCKET_NAME", "raw-uploads"))
     S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", os.getenv("MINIO_ENDPOINT_URL", "http://localhost:9000"))
 
+    # Semantic answer cache (matches rephrased questions by embedding similarity)
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    SEMANTIC_CACHE_MAXSIZE = int(os.getenv("SEMANTIC_CACHE_MAXSIZE", "256"))
+    SEMANTIC_CACHE_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+
+    # Query embeddings: concurrent requests are micro-batched into one forward pass
+    EMBED_MICROBATCH = os.getenv("EMBED_MICROBATCH", "true").lower() == "true"
+    # Max wait for more requests before a batch runs, and max texts per batch
+    EMBED_MICROBATCH_MAX_WAIT_MS = float(os.getenv("EMBED_MICROBATCH_MAX_WAIT_MS", "5"))
+    EMBED_MICROBATCH_MAX_SIZE = int(os.getenv("EMBED_MICROBATCH_MAX_SIZE", "64"))
+    # LRU cache of recent query embeddings (0 disables it)
+    QUERY_EMBED_CACHE_SIZE = int(os.getenv("QUERY_EMBED_CACHE_SIZE", "1024"))
+
+    # Max /chat queries running at once (each holds a worker thread off the event loop)
+    CHAT_MAX_WORKERS = int(os.getenv("CHAT_MAX_WORKERS", "8"))
+
+    # Groq tokens-per-minute quota (free tier: 6000 TPM). Extraction reserves from it;
+    # chat only reports Groq's rate-limit headers into it, so queries never queue behind ingestion
+    GROQ_TPM_LIMIT = int(os.getenv("GROQ_TPM_LIMIT", "6000"))
+    # Times an extraction call that got a 429 is retried once the limiter's pause is over
+    GROQ_RATE_LIMIT_RETRIES = int(os.getenv("GROQ_RATE_LIMIT_RETRIES", "3"))
+
+    # PDF chunk sizing: "tokens" (tiktoken, PDF_CHUNK_TOKENS with PDF_CHUNK_OVERLAP_TOKENS overlap)
+    # or "chars" (the original 1000 characters with 200 overlap)
+    PDF_SPLITTER = os.getenv("PDF_SPLITTER", "tokens").lower()
+    PDF_TOKENIZER = os.getenv("PDF_TOKENIZER", "cl100k_base")
+    PDF_CHUNK_TOKENS = int(os.getenv("PDF_CHUNK_TOKENS", "512"))
+    PDF_CHUNK_OVERLAP_TOKENS = int(os.getenv("PDF_CHUNK_OVERLAP_TOKENS", "32"))
+
+    # Processes extracting PDF pages in parallel (1 = single-threaded)
+    PDF_WORKERS = int(os.getenv("PDF_WORKERS", "1"))
+    # Stream PDF chunks page by page into graph extraction instead of parsing the whole file first
+    PDF_STREAMING = os.getenv("PDF_STREAMING", "true").lower() == "true"
+    # Parsed chunks buffered ahead of extraction when streaming (bounds memory)
+    PDF_STREAM_QUEUE_SIZE = int(os.getenv("PDF_STREAM_QUEUE_SIZE", "64"))
+
+    # How video audio reaches Whisper: "pcm" (16 kHz PCM piped from ffmpeg, no temp file)
+    # or "mp3" (ffmpeg writes an MP3 next to the upload, Whisper decodes it again)
+    AUDIO_EXTRACTION = os.getenv("AUDIO_EXTRACTION", "pcm").lower()
+
+    # Heavy singletons built by the background warm-up at startup, in order; /ready waits for them.
+    # Add "transcriber" on nodes that process videos to preload Whisper as well.
+    WARMUP_COMPONENTS = [
+        name.strip()
+        for name in os.getenv("WARMUP_COMPONENTS", "llm_factory,query_service").split(",")
+        if name.strip()
+    ]
+
+    # Whisper model, loaded on the first video job and unloaded after this many idle seconds (0 = never)
+    WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "small")
+    WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+    WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+    WHISPER_IDLE_UNLOAD_SECONDS = float(os.getenv("WHISPER_IDLE_UNLOAD_SECONDS", "600"))
+
+    # Whisper windows transcribed in parallel for long audio (1 = one pass over the whole file)
+    TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", "1"))
+    # Target window length when splitting audio at silences
+    TRANSCRIBE_WINDOW_SECONDS = float(os.getenv("TRANSCRIBE_WINDOW_SECONDS", "120"))
+
+    # Whisper segments are merged into chunks of up to this many tokens / seconds before
+    # graph extraction, each repeating the last OVERLAP seconds of the previous one
+    TRANSCRIPT_CHUNKING = os.getenv("TRANSCRIPT_CHUNKING", "true").lower() == "true"
+    TRANSCRIPT_CHUNK_TOKENS = int(os.getenv("TRANSCRIPT_CHUNK_TOKENS", "400"))
+    TRANSCRIPT_CHUNK_SECONDS = float(os.getenv("TRANSCRIPT_CHUNK_SECONDS", "120"))
+    TRANSCRIPT_CHUNK_OVERLAP_SECONDS = float(os.getenv("TRANSCRIPT_CHUNK_OVERLAP_SECONDS", "10"))
+
+    # Graph extraction calls kept in flight per document (1 = sequential)
+    EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "1"))
+
+    # Extracted chunks written to Neo4j per batch (one embedding pass + UNWIND upserts)
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "16"))
+    # ...or sooner, once the oldest unwritten chunk has waited this long
+    INGEST_FLUSH_SECONDS = float(os.getenv("INGEST_FLUSH_SECONDS", "5"))
+    # Texts per HuggingFace embedding forward pass
+    EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+    # Embedding backend: "huggingface" (torch) or "onnx" (int8 ONNX Runtime, needs onnxruntime)
+    EMBED_BACKEND = os.getenv("EMBED_BACKEND", "huggingface").lower()
+    # ONNX Runtime intra-op threads (0 = one per physical core)
+    EMBED_ONNX_THREADS = int(os.getenv("EMBED_ONNX_THREADS", "0"))
+    # Quantize the ONNX model's weights to int8 (cached under DATA_DIR/onnx)
+    EMBED_ONNX_QUANTIZE = os.getenv("EMBED_ONNX_QUANTIZE", "true").lower() == "true"
+
+    # Persistent ingestion job queue (SQLite) and its worker threads
+    DATA_DIR = os.getenv("NEUROSPACE_DATA_DIR", str(_backend_dir / "data"))
+    JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join(DATA_DIR, "jobs.db"))
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))
+    # Runs a job may start; one interrupted this often (e.g. it OOM-kills the process) is failed
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    # Uploaded files wait here (one unique file per upload) until their job has run
+    UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", os.path.join(DATA_DIR, "uploads"))
+
+    # On-disk cache of extracted triplets (keyed by chunk text, prompt and model)
+    EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+    EXTRACTION_CACHE_PATH = os.getenv("EXTRACTION_CACHE_PATH", os.path.join(DATA_DIR, "extraction_cache.db"))
+    EXTRACTION_CACHE_MAX_MB = int(os.getenv("EXTRACTION_CACHE_MAX_MB", "256"))
+
 
 settings = Settings()
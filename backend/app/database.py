@@ -1,3 +1,5 @@
+import threading
+
 from neo4j import GraphDatabase
 
 from .config import settings
@@ -7,6 +9,21 @@ class GraphDB:
     def __init__(self):
         self.driver = None
 
+        # Monotonic counter bumped whenever the graph contents change
+        # (ingestion finished, graph cleared). Long-lived readers such as the
+        # query engines compare against it to know when to rebuild.
+        self.graph_version = 0
+        self._version_lock = threading.Lock()
+
+        # Cached /stats result and the (graph version, batch writes) it was computed for
+        self._stats = None
+        self._stats_version = None
+        self._stats_lock = threading.Lock()
+        # Batches written by GraphService (see record_graph_write), and the last
+        # one whose count-store figures were applied in incremental mode
+        self._stats_writes = 0
+        self._stats_applied = 0
+
     def connect(self):
         if not self.driver:
             self.driver = GraphDatabase.driver(
@@ -24,59 +41,130 @@ class GraphDB:
     def get_session(self):
         return self.driver.session()
 
+    def bump_graph_version(self) -> int:
+        """Marks the graph as changed and returns the new version."""
+        with self._version_lock:
+            self.graph_version += 1
+            return self.graph_version
+
     def clear_graph(self):
         """Deletes ALL nodes and relationships from the Neo4j database."""
         with self.driver.session() as session:
             session.run("MATCH (n) DETACH DELETE n")
             print("🗑️ Neo4j graph cleared — all nodes and relationships deleted.")
+        with self._stats_lock:
+            self._stats = None  # Also drops incremental counters
+        self.bump_graph_version()
 
-    def get_graph_stats(self) -> dict:
+    @staticmethod
+    def _quote(name: str) -> str:
+        """Backtick-quotes a label or relationship type for use in Cypher."""
+        return "`" + name.replace("`", "``") + "`"
+
+    def _count_store_stats(self, session) -> dict:
         """
-        Returns comprehensive statistics about the current knowledge graph.
-        Used for the /stats API endpoint and for CV metrics.
+        Node/relationship totals and per-label/per-type counts, read from Neo4j's
+        count store: every branch of the UNION is an unfiltered count over at most
+        one label or type, which the planner answers without touching the graph.
         """
+        labels = [r["label"] for r in session.run("CALL db.labels() YIELD label RETURN label")]
+        rel_types = [r["relationshipType"] for r in session.run(
+            "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType"
+        )]
+
+        parts = [
+            "MATCH (n) RETURN 'nodes' AS kind, '' AS name, count(n) AS count",
+            "MATCH ()-[r]->() RETURN 'relationships' AS kind, '' AS name, count(r) AS count",
+        ]
+        params = {}
+        for i, label in enumerate(labels):
+            parts.append(f"MATCH (n:{self._quote(label)}) RETURN 'label' AS kind, $label_{i} AS name, count(n) AS count")
+            params[f"label_{i}"] = label
+        for i, rel_type in enumerate(rel_types):
+            parts.append(f"MATCH ()-[r:{self._quote(rel_type)}]->() RETURN 'type' AS kind, $type_{i} AS name, count(r) AS count")
+            params[f"type_{i}"] = rel_type
+
+        node_labels, relationship_types = {}, {}
         stats = {}
-        with self.driver.session() as session:
-            # Total nodes and relationships
-            result = session.run("MATCH (n) RETURN count(n) as total_nodes")
-            stats["total_nodes"] = result.single()["total_nodes"]
-
-            result = session.run("MATCH ()-[r]->() RETURN count(r) as total_relationships")
-            stats["total_relationships"] = result.single()["total_relationships"]
-
-            # Node counts by label
-            result = session.run(
-                "MATCH (n) UNWIND labels(n) AS label "
-                "RETURN label, count(*) AS count ORDER BY count DESC"
-            )
-            stats["node_labels"] = {record["label"]: record["count"] for record in result}
-
-            # Relationship counts by type
-            result = session.run(
-                "MATCH ()-[r]->() RETURN type(r) AS rel_type, count(*) AS count "
-                "ORDER BY count DESC"
-            )
-            stats["relationship_types"] = {record["rel_type"]: record["count"] for record in result}
-
-            # Documents ingested
-            result = session.run("MATCH (d:Document) RETURN count(d) as doc_count")
-            stats["documents_ingested"] = result.single()["doc_count"]
+        for record in session.run(" UNION ALL ".join(parts), **params):
+            if record["kind"] == "label":
+                node_labels[record["name"]] = record["count"]
+            elif record["kind"] == "type":
+                relationship_types[record["name"]] = record["count"]
+            else:
+                stats[f"total_{record['kind']}"] = record["count"]
+
+        # Labels/types listed in the catalog but no longer in use count 0
+        stats["node_labels"] = dict(sorted(
+            ((k, v) for k, v in node_labels.items() if v), key=lambda item: -item[1]))
+        stats["relationship_types"] = dict(sorted(
+            ((k, v) for k, v in relationship_types.items() if v), key=lambda item: -item[1]))
+        stats["documents_ingested"] = node_labels.get("Document", 0)
+        # Chunk and Document nodes never share a label, so everything else is an entity
+        stats["total_entities"] = stats["total_nodes"] - node_labels.get("Chunk", 0) - node_labels.get("Document", 0)
+        return stats
 
-            # Chunks with vectors
-            result = session.run(
-                "MATCH (c:Chunk) WHERE c.embedding IS NOT NULL "
-                "RETURN count(c) as vector_count"
-            )
-            stats["vector_indexed_chunks"] = result.single()["vector_count"]
+    def get_graph_stats(self) -> dict:
+        """
+        Returns comprehensive statistics about the current knowledge graph.
+        Used for the /stats API endpoint and for CV metrics.
 
-            # Entity count (non-Chunk, non-Document nodes)
-            result = session.run(
-                "MATCH (e) WHERE NOT e:Chunk AND NOT e:Document "
-                "RETURN count(e) as entity_count"
-            )
-            stats["total_entities"] = result.single()["entity_count"]
+        Everything but the embedded-chunk count comes from the count store. The
+        result is cached until the graph version moves (graph cleared) or
+        GraphService writes another batch; in incremental mode GraphService keeps
+        it current after every batch instead (see record_graph_write).
+        """
+        with self._stats_lock:
+            if self._stats is not None and (
+                settings.GRAPH_STATS_MODE == "incremental"
+                or self._stats_version == (self.graph_version, self._stats_writes)
+            ):
+                return dict(self._stats)
+
+            version = (self.graph_version, self._stats_writes)
+            with self.driver.session() as session:
+                stats = self._count_store_stats(session)
+                # Chunks with vectors (the one figure that needs a scan, over Chunk nodes only)
+                result = session.run(
+                    "MATCH (c:Chunk) WHERE c.embedding IS NOT NULL "
+                    "RETURN count(c) as vector_count"
+                )
+                stats["vector_indexed_chunks"] = result.single()["vector_count"]
+
+            self._stats, self._stats_version = stats, version
+            self._stats_applied = self._stats_writes
+            return dict(stats)
+
+    def record_graph_write(self, new_chunks: int):
+        """
+        Called by GraphService after each batch it writes; `new_chunks` is the
+        number of Chunk nodes the batch newly linked to their Document (all of
+        them are written with an embedding).
+
+        Cached mode: the next /stats recomputes. Incremental mode: the count-store
+        figures (constant-time lookups) are re-read outside the stats lock, so
+        /stats never waits on Neo4j, and the embedded-chunk count advances by
+        `new_chunks`. No-op until the first /stats has seeded the stats.
+        """
+        with self._stats_lock:
+            self._stats_writes += 1
+            write = self._stats_writes
+            if settings.GRAPH_STATS_MODE != "incremental" or self._stats is None:
+                return
 
-        return stats
+        with self.driver.session() as session:
+            counts = self._count_store_stats(session)
+
+        with self._stats_lock:
+            if self._stats is None:
+                return  # Graph cleared meanwhile; the next /stats reseeds
+            stats = dict(self._stats)
+            stats["vector_indexed_chunks"] += new_chunks
+            # Concurrent ingestions can finish their reads out of order: keep the newest
+            if write > self._stats_applied:
+                stats.update(counts)
+                self._stats_applied = write
+            self._stats = stats
 
 
 # Singleton instance
@@ -1,38 +1,65 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .database import db
 from .services.video import video_processor
 from .services.transcription import transcriber
 from .services.pdf import pdf_processor
 from .services.graph_setup import setup_constraints
-from .services.llm_factory import llm_factory
 from .schemas import PDFResult, TranscriptionResult, ChatRequest, ChatResponse, GraphDataResponse
 import os
-import shutil
+import json
 import mimetypes
+import threading
+import time
+from .config import settings
 from .worker import process_file_background
 from app.services.query_engine import query_service
 from app.services.graph_visualizer import graph_visualizer
+from app.services.timings import timing_stats
+from app.services.job_queue import job_queue
+from app.services.graph_service import graph_service
+from app.services.extraction_cache import extraction_cache
+from app.services.embedding_batcher import embedding_batcher
+from app.services.lazy import components as lazy_components
+from app.services.upload import abort_quietly, spool_upload
+from starlette.concurrency import run_in_threadpool
 from app.services.storage import get_storage
 
+def _warm_up():
+    """
+    Builds the heavy singletons in the background so the API starts serving
+    (health checks, /ready) immediately. Components are warmed in
+    WARMUP_COMPONENTS order; anything not listed is built on first use.
+    """
+    start = time.perf_counter()
+    for name in settings.WARMUP_COMPONENTS:
+        if name == "transcriber":
+            try:
+                transcriber.load()
+            except Exception as e:
+                print(f"❌ transcriber warm-up failed: {e}")
+        elif name in lazy_components:
+            lazy_components[name].warm()
+        else:
+            print(f"⚠️ Unknown warm-up component: {name}")
+    print(f"🔥 Warm-up finished in {time.perf_counter() - start:.1f}s")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     db.connect()
     setup_constraints()
 
-    # Test: Initialize LlamaIndex Storage
-    if llm_factory is not None:
-        try:
-            storage = llm_factory.get_storage_context()
-            print("✅ LlamaIndex successfully connected to Neo4j!")
-        except Exception as e:
-            print(f"❌ LlamaIndex Connection Failed: {e}")
-    else:
-        print("⚠️ LLM Factory not initialized — check your API keys")
+    # Warm llm_factory / query_service (and optionally Whisper) off the startup path
+    threading.Thread(target=_warm_up, name="neurospace-warmup", daemon=True).start()
+
+    # Start the ingestion workers (also resumes jobs interrupted by a restart)
+    job_queue.start(process_file_background, alias_handler=graph_service.add_alias)
 
     yield
+    job_queue.stop()
     db.close()
 
 
@@ -61,6 +88,27 @@ app.add_middleware(
 def health_check():
     return {"status": "active", "system": "NeuroSpace Graph Engine"}
 
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness probe: 200 once every component in WARMUP_COMPONENTS is warm,
+    503 while warm-up is still running (or failed). Lists the state of each component.
+    """
+    status = {name: component.status() for name, component in lazy_components.items()}
+    status["transcriber"] = transcriber.status()
+    # Ready once Whisper has loaded successfully, even if it was since unloaded
+    # after WHISPER_IDLE_UNLOAD_SECONDS: it reloads on the next video job, so an
+    # idle pod must not fail its readiness probe.
+    status["transcriber"]["ready"] = transcriber.load_seconds is not None
+    status["neo4j"] = {"ready": db.driver is not None}
+
+    required = [name for name in settings.WARMUP_COMPONENTS if name in status] + ["neo4j"]
+    ready = all(status[name]["ready"] for name in required)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "required": required, "components": status},
+    )
+
 @app.get("/documents")
 def list_uploaded_documents():
     """
@@ -137,42 +185,106 @@ def test_pdf_processing(pdf_path: str):
         raise HTTPException(status_code=400, detail=str(e))
     
 
+def _find_duplicate(content_hash: str, filename: str) -> str | None:
+    """
+    Filename already holding this content: an ingested Document (`filename` is
+    recorded as its alias) or a queued/running job (which records the alias once
+    it is done).
+    """
+    try:
+        existing = graph_service.find_document_by_hash(content_hash)
+    except Exception as e:
+        print(f"  ⚠️ Content index lookup failed: {e}")
+        existing = None
+    if existing is None:
+        return job_queue.find_active_by_hash(content_hash, filename)
+
+    if existing != filename:
+        try:
+            graph_service.add_alias(filename, existing)
+        except Exception as e:
+            print(f"  ⚠️ Could not record {filename} as an alias of {existing}: {e}")
+    return existing
+
+def _duplicate_response(filename: str, existing: str) -> dict:
+    print(f"♻️ {filename} has the same content as {existing} — skipping ingestion.")
+    return {
+        "status": "duplicate",
+        "filename": filename,
+        "duplicate_of": existing,
+        "message": f"Identical content is already ingested as {existing}.",
+    }
+
 @app.post("/ingest")
-async def ingest_file(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...)
-):
+async def ingest_file(file: UploadFile = File(...)):
     """
     The Main Entrance.
-    1. Receives file.
-    2. Saves to temp disk.
-    3. Triggers background processing.
-    4. Returns 'Accepted' immediately.
+    1. Receives file — spooled to a unique local file, hashed, and streamed to MinIO at the same time.
+    2. Skips ingestion if identical content is already known.
+    3. Queues a persistent ingestion job (see /jobs).
+    4. Returns 'Accepted' immediately with the job id.
     """
     # Validate file type
     if file.content_type not in ["application/pdf", "video/mp4"]:
         raise HTTPException(400, detail="Only .pdf and .mp4 supported for now.")
 
-    # Save to a temporary folder
-    temp_filename = f"temp_{file.filename}"
-    with open(temp_filename, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    # Trigger Background Task
-    # We pass the file path, not the file object (because the request closes)
-    background_tasks.add_task(
-        process_file_background, 
-        temp_filename, 
-        file.filename, 
-        file.content_type
+    # Spool + hash + multipart upload, all off the event loop
+    upload = await spool_upload(file, file.filename)
+    print(f"📦 Received {file.filename}: {upload.size / (1024 * 1024):.1f} MB in {upload.elapsed_s:.1f}s "
+          f"({upload.throughput_mb_s:.1f} MB/s)")
+
+    # Known content (under any filename)? Alias it instead of re-transcribing / re-extracting
+    existing = await run_in_threadpool(_find_duplicate, upload.content_hash, file.filename)
+    if existing is not None:
+        await run_in_threadpool(abort_quietly, upload.multipart)
+        os.remove(upload.path)
+        return _duplicate_response(file.filename, existing)
+
+    # New content: publish the streamed object in MinIO
+    uploaded = False
+    if upload.multipart is not None:
+        try:
+            await run_in_threadpool(upload.multipart.complete)
+            uploaded = True
+        except Exception as e:
+            print(f" MinIO upload failed (the job will retry): {e}")
+            await run_in_threadpool(abort_quietly, upload.multipart)
+
+    # Queue the job
+    # We pass the file path, not the file object (because the request closes).
+    # The job check is repeated atomically with the insert: an identical upload
+    # may have been queued since the check above.
+    job_id, existing = await run_in_threadpool(
+        job_queue.enqueue_unique, upload.path, file.filename, file.content_type,
+        upload.content_hash, uploaded=uploaded,
     )
+    if existing is not None:
+        os.remove(upload.path)
+        return _duplicate_response(file.filename, existing)
 
     return {
-        "status": "accepted", 
-        "filename": file.filename, 
-        "message": "Processing started in background."
+        "status": "accepted",
+        "filename": file.filename,
+        "job_id": job_id,
+        "message": "Processing queued. Track it at /jobs/" + job_id,
     }
 
+@app.get("/jobs")
+def list_jobs(limit: int = 50):
+    """Returns queue depth, per-state counts and the most recent ingestion jobs."""
+    return job_queue.list_jobs(limit=limit)
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    Returns one ingestion job: state, stage, chunks done/total and throughput.
+    For streamed PDFs chunks_total is null until the whole file has been parsed.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat_with_neurospace(request: ChatRequest):
     """
@@ -183,7 +295,12 @@ async def chat_with_neurospace(request: ChatRequest):
     """
     try:
         # Pass the user's message and retrieval mode to the engine
-        result = query_service.ask(request.message, mode=request.mode)
+        # Runs off the event loop so one slow query can't stall other requests
+        # (and so a request arriving mid warm-up waits in the threadpool, not on the loop)
+        service = query_service.get() if query_service.is_ready else await run_in_threadpool(query_service.get)
+        result = await service.aask(
+            request.message, mode=request.mode, include_timings=request.include_timings
+        )
         
         # FastAPI will automatically validate this dictionary against our ChatResponse schema
         return result
@@ -197,17 +314,71 @@ async def chat_with_neurospace(request: ChatRequest):
             "latency_ms": None
         }
 
+@app.post("/chat/stream")
+def chat_with_neurospace_stream(request: ChatRequest):
+    """
+    Server-Sent Events variant of /chat.
+    Emits a `sources` event as soon as retrieval finishes, then one `token` event per
+    answer token from the LLM, and a final `done` event with the cited sources,
+    total latency (latency_ms) and time to first token (ttfb_ms).
+    """
+    def event_stream():
+        try:
+            for event, data in query_service.ask_stream(request.message, mode=request.mode):
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            print(f"❌ Chat Stream Error: {str(e)}")
+            error = {"answer": "I'm sorry, my neural pathways are experiencing some turbulence. Please try again."}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.delete("/clear-cache")
 def clear_query_cache():
     """Flushes the in-memory query cache so new prompts/settings take effect immediately."""
-    query_service.cache.clear()
+    query_service.clear_caches()
     return {"status": "cleared", "message": "Query cache flushed."}
 
+@app.get("/cache-stats")
+def get_cache_stats():
+    """Returns hit/miss counters and occupancy of the semantic answer cache."""
+    return query_service.semantic_cache.stats()
+
+@app.get("/embedding-stats")
+def get_embedding_stats():
+    """Returns query-embedding micro-batch sizes and LRU cache hit rate."""
+    return embedding_batcher.stats()
+
+@app.get("/extraction-cache")
+def get_extraction_cache_stats():
+    """Returns hit rate, size and evictions of the on-disk graph extraction cache."""
+    return extraction_cache.stats()
+
+@app.delete("/extraction-cache")
+def clear_extraction_cache():
+    """Empties the extraction cache so the next ingestion re-extracts every chunk."""
+    extraction_cache.clear()
+    return {"status": "cleared", "message": "Extraction cache emptied."}
+
+@app.get("/timings")
+def get_stage_timings():
+    """
+    Returns p50/p95 latency per query stage (embedding, synonym expansion, graph traversal,
+    vector search, prompt assembly, LLM synthesis, ...) for each retrieval mode,
+    over the most recent /chat requests.
+    """
+    return timing_stats.summary()
+
 @app.get("/stats")
 def get_graph_stats():
     """
     Returns comprehensive statistics about the current knowledge graph.
     Node counts, relationship counts, entity types, documents ingested, etc.
+    Served from a cache that is refreshed after ingestion or /clear.
     """
     try:
         stats = db.get_graph_stats()
@@ -253,7 +424,21 @@ async def serve_file(filename: str):
         )
         
     except FileNotFoundError:
-        # Fallback: Make file serving case-insensitive.
+        # Fallback 1: The name may be an alias of identical content stored under another name.
+        try:
+            canonical = graph_service.resolve_alias(filename)
+            if canonical:
+                file_stream, content_type = get_storage().get_file_stream(canonical)
+                guessed_type, _ = mimetypes.guess_type(canonical)
+                return StreamingResponse(
+                    content=file_stream.iter_chunks(),
+                    media_type=guessed_type or content_type or "application/octet-stream",
+                    headers={"Content-Disposition": f'inline; filename="{filename}"'}
+                )
+        except Exception as alias_err:
+            print(f"Alias lookup failed: {alias_err}")
+
+        # Fallback 2: Make file serving case-insensitive.
         # The AI extraction sometimes lowercases text, creating graph nodes like "simple rag.pdf" 
         # instead of the exact original case "Simple RAG.pdf" in MinIO.
         try:
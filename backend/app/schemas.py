@@ -34,6 +34,7 @@ class PDFResult(BaseModel):
 class ChatRequest(BaseModel):
     message: str
     mode: str = "hybrid"  # Retrieval mode: "hybrid", "vector_only", or "synonym_only"
+    include_timings: bool = False  # Return the per-stage latency breakdown in ChatResponse.timings
     # We will add 'chat_history' here later when we want the bot to remember context
 
 class SourceItem(BaseModel):
@@ -49,6 +50,7 @@ class ChatResponse(BaseModel):
     answer: str
     sources: List[SourceItem]
     latency_ms: Optional[float] = None
+    timings: Optional[Dict[str, float]] = None  # Per-stage latency (ms), only when requested
 
 class GraphNode(BaseModel):
     id: str
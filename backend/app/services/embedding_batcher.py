@@ -0,0 +1,185 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from app.config import settings
+
+
+class EmbeddingBatcher:
+    """
+    Dynamic micro-batching in front of the local embedding model.
+
+    Concurrent /chat and vector-search requests each need one query embedding.
+    Instead of one forward pass per request, callers submit their text and get
+    a Future; a single background thread collects submissions for up to
+    `max_wait_ms` (or until `max_batch_size` are waiting), embeds them in one
+    batched pass and resolves every Future. Identical texts in flight share a
+    Future, and recent results are kept in an LRU cache of `cache_size` entries.
+
+    all-MiniLM-L6-v2 has no query instruction, so query and text embeddings are
+    the same vectors and the batch goes through get_text_embedding_batch.
+
+    Exposes get_query_embedding(), so it can stand in for the embed model
+    wherever only query embeddings are needed (e.g. SemanticCache).
+
+    A failed batch fails its Futures. Should the thread itself die, every
+    waiting Future gets the error and the next submit() starts a new thread.
+    """
+
+    def __init__(self, get_embed_model, max_batch_size: int = 64, max_wait_ms: float = 5,
+                 cache_size: int = 1024, enabled: bool = True):
+        self._get_embed_model = get_embed_model  # Called on use, so the model loads lazily
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self.cache_size = cache_size
+        self.enabled = enabled
+
+        self._cache = OrderedDict()  # text -> vector, least recently used first
+        self._pending = {}  # text -> Future, for texts queued or being embedded
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.batches = 0
+        self.batched_texts = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _cached(self, text: str):
+        """Cache lookup; must hold the lock."""
+        vector = self._cache.get(text)
+        if vector is None:
+            self.cache_misses += 1
+            return None
+        self._cache.move_to_end(text)  # Mark as most recently used
+        self.cache_hits += 1
+        return vector
+
+    def _remember(self, text: str, vector):
+        """Cache store; must hold the lock."""
+        if self.cache_size <= 0:
+            return
+        self._cache[text] = vector
+        self._cache.move_to_end(text)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)  # Drop least recently used
+
+    def submit(self, text: str) -> Future:
+        """Queues `text` for the next batch; the Future resolves to its embedding."""
+        with self._lock:
+            vector = self._cached(text)
+            if vector is not None:
+                future = Future()
+                future.set_result(vector)
+                return future
+            future = self._pending.get(text)
+            if future is not None:
+                return future  # Same text already queued: share its result
+
+            future = Future()
+            self._pending[text] = future
+            # Queued under the lock, so a dying thread can't drain the queue between the two
+            self._queue.put(text)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="neurospace-embed-batcher", daemon=True)
+                self._thread.start()
+        return future
+
+    def get_query_embedding(self, text: str) -> list[float]:
+        if not self.enabled:
+            with self._lock:
+                vector = self._cached(text)
+            if vector is None:
+                vector = self._get_embed_model().get_query_embedding(text)
+                with self._lock:
+                    self._remember(text, vector)
+            return vector
+        return self.submit(text).result()
+
+    def _run(self):
+        try:
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.max_wait_s
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=timeout))
+                    except queue.Empty:
+                        break
+                self._flush(batch)
+        except BaseException as e:
+            # Nothing would resolve the waiting Futures any more: fail them all
+            with self._lock:
+                futures = list(self._pending.values())
+                self._pending.clear()
+                while not self._queue.empty():
+                    self._queue.get_nowait()
+                if self._thread is threading.current_thread():
+                    self._thread = None  # The next submit() starts a new thread
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+
+    def _flush(self, batch: list[str]):
+        try:
+            vectors = self._get_embed_model().get_text_embedding_batch(batch)
+            if len(vectors) != len(batch):
+                raise RuntimeError(f"Embedding model returned {len(vectors)} vectors for {len(batch)} texts")
+        except Exception as e:
+            with self._lock:
+                futures = [self._pending.pop(text) for text in batch]
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self.batches += 1
+            self.batched_texts += len(batch)
+            futures = []
+            for text, vector in zip(batch, vectors):
+                self._remember(text, vector)
+                futures.append(self._pending.pop(text))
+        for future, vector in zip(futures, vectors):
+            future.set_result(vector)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                "enabled": self.enabled,
+                "batches": self.batches,
+                "batched_texts": self.batched_texts,
+                "avg_batch_size": round(self.batched_texts / self.batches, 2) if self.batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_s * 1000,
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "cache_hit_rate": round(self.cache_hits / lookups, 3) if lookups else 0.0,
+                "cache_entries": len(self._cache),
+                "cache_size": self.cache_size,
+            }
+
+
+def _shared_embed_model():
+    from app.services.llm_factory import llm_factory
+    return llm_factory.embed_model
+
+
+# Singleton instance, shared by every query path
+embedding_batcher = EmbeddingBatcher(
+    _shared_embed_model,
+    max_batch_size=settings.EMBED_MICROBATCH_MAX_SIZE,
+    max_wait_ms=settings.EMBED_MICROBATCH_MAX_WAIT_MS,
+    cache_size=settings.QUERY_EMBED_CACHE_SIZE,
+    enabled=settings.EMBED_MICROBATCH,
+)
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from app.config import settings
+
+
+class ExtractionCache:
+    """
+    On-disk cache of graph extraction output, backed by a local SQLite file.
+
+    Entries map (chunk text, extraction prompt, model name) to the list of
+    (subject, relation, object) triplets the LLM returned for that text, so
+    re-ingesting a file (or rebuilding the graph after /clear) replays them
+    instead of calling Groq again. Changing the prompt or the model changes the
+    key, so stale extractions are never replayed.
+
+    The file is kept under `max_bytes` by evicting the least recently used entries.
+    Hit/miss counters cover this process; the entry count and size cover the file.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection per operation: commits on success, always closes."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extractions (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    triplets TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS extractions_last_used ON extractions (last_used)")
+
+    @staticmethod
+    def make_key(text: str, prompt: str, model: str) -> str:
+        digest = hashlib.sha256()
+        for part in (model, prompt, text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> list[tuple[str, str, str]] | None:
+        """Returns the cached triplets for `key` (possibly an empty list), or None on a miss."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT triplets FROM extractions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE extractions SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return [tuple(triplet) for triplet in json.loads(row[0])]
+
+    def put(self, key: str, model: str, triplets: list[tuple[str, str, str]]):
+        payload = json.dumps([list(triplet) for triplet in triplets])
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, model, triplets, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, payload, len(key) + len(payload), now, now),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        """Drops least recently used entries until the cache fits in max_bytes."""
+        total = conn.execute("SELECT coalesce(sum(size), 0) FROM extractions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM extractions ORDER BY last_used").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM extractions WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM extractions")
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock, self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT count(*), coalesce(sum(size), 0) FROM extractions"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Singleton — shared by every extraction worker thread
+extraction_cache = ExtractionCache(
+    db_path=settings.EXTRACTION_CACHE_PATH,
+    max_bytes=settings.EXTRACTION_CACHE_MAX_MB * 1024 * 1024,
+)
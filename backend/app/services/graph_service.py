@@ -1,8 +1,20 @@
+import asyncio
+import hashlib
+import itertools
 import threading
-from llama_index.core import PropertyGraphIndex
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from llama_index.core import PropertyGraphIndex, Settings
 from llama_index.core.indices.property_graph import SimpleLLMPathExtractor
 from llama_index.core import Document
+from llama_index.core.graph_stores.types import KG_NODES_KEY, KG_RELATIONS_KEY, EntityNode, Relation
+from llama_index.core.ingestion import run_transformations
+from llama_index.core.schema import TransformComponent
+from app.config import settings
+from app.services.extraction_cache import extraction_cache
 from app.services.llm_factory import LLMFactory
+from app.services.rate_limiter import groq_limiter, is_rate_limited
 import nest_asyncio
 
 # Patch asyncio to allow nested event loops.
@@ -10,6 +22,17 @@ import nest_asyncio
 nest_asyncio.apply()
 
 
+class PrecomputedPathExtractor(TransformComponent):
+    """
+    No-op kg extractor for nodes whose triplets were already extracted
+    (they sit in node.metadata). Lets PropertyGraphIndex.insert_nodes() write
+    them to Neo4j without calling the LLM again.
+    """
+
+    def __call__(self, nodes, **kwargs):
+        return nodes
+
+
 class GraphService:
     def __init__(self):
         self._llm_factory = None
@@ -20,6 +43,9 @@ class GraphService:
         self._processing_lock = threading.Lock()
         self._files_in_progress = set()
 
+        # Per-thread extractors for parallel extraction (each with its own Groq client)
+        self._thread_local = threading.local()
+
         # Define what we want the AI to extract
         self.entities = ["Person", "Organization", "Event", "Concept", "Place"]
         self.relations = ["FOUNDED", "LOCATED_AT", "PART_OF", "CAUSES", "MENTIONS", "RELATED_TO"]
@@ -32,35 +58,369 @@ class GraphService:
         self._storage_context = self._llm_factory.get_storage_context()
 
         # Configure the Extractor
-        # Groq is fast enough to handle higher parallelism
-        self._extractor = SimpleLLMPathExtractor(
-            llm=self._llm_factory.llm,
+        # Parallelism across chunks is handled by _extract_parallel (EXTRACTION_WORKERS)
+        self._extractor = self._make_extractor(self._llm_factory.llm)
+
+    def _make_extractor(self, llm) -> SimpleLLMPathExtractor:
+        return SimpleLLMPathExtractor(
+            llm=llm,
             max_paths_per_chunk=5,
             num_workers=1,
         )
 
-    def _is_already_ingested(self, filename: str) -> bool:
-        """Check if this file has already been ingested into Neo4j."""
+    def _thread_extractor(self) -> SimpleLLMPathExtractor:
+        extractor = getattr(self._thread_local, "extractor", None)
+        if extractor is None:
+            # A persistent loop per worker keeps this thread's AsyncClient on one loop
+            asyncio.set_event_loop(asyncio.new_event_loop())
+            extractor = self._make_extractor(self._llm_factory.create_llm())
+            self._thread_local.extractor = extractor
+        return extractor
+
+    def _estimate_tokens(self, text: str) -> int:
+        """
+        Rough token estimate for one extraction call: chunk text + extraction prompt
+        (~4 characters per token) + room for the returned triplets.
+        The limiter settles this against the real usage afterwards.
+        """
+        prompt = getattr(self._extractor, "extract_prompt", None)
+        prompt_chars = len(getattr(prompt, "template", "") or "")
+        output_tokens = self._extractor.max_paths_per_chunk * 25
+        return (len(text) + prompt_chars) // 4 + output_tokens
+
+    @staticmethod
+    def _chunk_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    def _completed_chunks(self, filename: str) -> tuple[set, bool]:
+        """
+        Chunk-level checkpoint lookup. Returns ({(chunk_index, chunk_hash), ...}, legacy)
+        for chunks of this file already linked to its Document node.
+        `legacy` is True when the file was ingested before checkpoints existed
+        (linked chunks without a chunk_hash); such files are treated as complete.
+        """
+        done = set()
+        legacy = False
         try:
             from app.database import db
             with db.get_session() as session:
                 result = session.run(
                     "MATCH (d:Document {id: $filename})-[:HAS_CHUNK]->(c:Chunk) "
-                    "RETURN count(c) as chunk_count",
+                    "RETURN c.chunk_index AS chunk_index, c.chunk_hash AS chunk_hash",
                     filename=filename
                 )
-                record = result.single()
-                if record and record["chunk_count"] > 0:
-                    return True
+                for record in result:
+                    if record["chunk_hash"] is None:
+                        legacy = True
+                    else:
+                        done.add((record["chunk_index"], record["chunk_hash"]))
         except Exception as e:
             print(f"  ⚠️ Could not check for existing document: {e}")
-        return False
+        return done, legacy
+
+    def _remove_unlinked_chunks(self, filename: str) -> int:
+        """
+        Deletes Chunk nodes of this file that never got linked to its Document:
+        a batch whose insert_nodes succeeded but whose HAS_CHUNK query failed.
+        The checkpoint doesn't count them, so they are re-extracted (under new ids)
+        and would otherwise linger as duplicate vectors.
+        """
+        from app.database import db
+        with db.get_session() as session:
+            record = session.run(
+                "MATCH (c:Chunk {filename: $filename}) "
+                "WHERE NOT (:Document {id: $filename})-[:HAS_CHUNK]->(c) "
+                "DETACH DELETE c RETURN count(c) AS removed",
+                filename=filename,
+            ).single()
+        return record["removed"] if record else 0
+
+    # --- Content index (deduplication by file content) ---
+
+    def find_document_by_hash(self, content_hash: str) -> str | None:
+        """Returns the filename of an ingested Document with this SHA-256, if any."""
+        from app.database import db
+        with db.get_session() as session:
+            record = session.run(
+                "MATCH (d:Document {content_hash: $content_hash}) RETURN d.id AS filename LIMIT 1",
+                content_hash=content_hash,
+            ).single()
+        return record["filename"] if record else None
+
+    def register_content_hash(self, filename: str, content_hash: str):
+        """Records the SHA-256 of an ingested file on its Document node."""
+        from app.database import db
+        with db.get_session() as session:
+            session.run(
+                "MERGE (d:Document {id: $filename}) ON CREATE SET d.name = $filename "
+                "SET d.content_hash = $content_hash",
+                filename=filename, content_hash=content_hash,
+            )
+
+    def add_alias(self, alias: str, filename: str) -> bool:
+        """
+        Records `alias` as another upload name of the Document `filename` (no re-ingestion).
+        Only an existing Document is touched; returns False if there is none. Uploads that
+        duplicate a queued or running job are aliased once it is done (see JobQueue).
+        """
+        from app.database import db
+        with db.get_session() as session:
+            record = session.run(
+                "MATCH (d:Document {id: $filename}) "
+                "SET d.aliases = CASE WHEN $alias IN coalesce(d.aliases, []) "
+                "THEN d.aliases ELSE coalesce(d.aliases, []) + $alias END "
+                "RETURN d.id AS filename",
+                filename=filename, alias=alias,
+            ).single()
+        if record is None:
+            print(f"  ⚠️ Cannot alias {alias}: no Document {filename} in the graph.")
+        return record is not None
+
+    def resolve_alias(self, alias: str) -> str | None:
+        """Returns the canonical filename for an aliased upload name, if any."""
+        from app.database import db
+        with db.get_session() as session:
+            record = session.run(
+                "MATCH (d:Document) WHERE $alias IN d.aliases RETURN d.id AS filename LIMIT 1",
+                alias=alias,
+            ).single()
+        return record["filename"] if record else None
+
+    @staticmethod
+    def _extraction_cache_key(node, extractor) -> str:
+        """Cache key: chunk text + extraction prompt (and path limit) + model name."""
+        prompt = getattr(extractor.extract_prompt, "template", str(extractor.extract_prompt))
+        prompt = f"{prompt}\nmax_paths_per_chunk={extractor.max_paths_per_chunk}"
+        model = getattr(extractor.llm, "model", type(extractor.llm).__name__)
+        return extraction_cache.make_key(node.text, prompt, model)
+
+    @staticmethod
+    def _replay_triplets(node, triplets: list):
+        """Attaches cached triplets to a node the same way SimpleLLMPathExtractor does."""
+        kg_nodes = node.metadata.pop(KG_NODES_KEY, [])
+        kg_relations = node.metadata.pop(KG_RELATIONS_KEY, [])
+        metadata = node.metadata.copy()
+        for subj, rel, obj in triplets:
+            subj_node = EntityNode(name=subj, properties=metadata)
+            obj_node = EntityNode(name=obj, properties=metadata)
+            kg_nodes.extend([subj_node, obj_node])
+            kg_relations.append(Relation(
+                label=rel, source_id=subj_node.id, target_id=obj_node.id, properties=metadata,
+            ))
+        node.metadata[KG_NODES_KEY] = kg_nodes
+        node.metadata[KG_RELATIONS_KEY] = kg_relations
+
+    def _extract_chunk(self, doc, extractor):
+        """
+        Parses one document into nodes and extracts their triplets (no Neo4j writes).
+        Nodes found in the extraction cache are replayed; only the rest call the LLM.
+        """
+        nodes = run_transformations([doc], Settings.transformations)
+
+        misses = []
+        cached = 0
+        for node in nodes:
+            key = self._extraction_cache_key(node, extractor) if settings.EXTRACTION_CACHE_ENABLED else None
+            triplets = extraction_cache.get(key) if key else None
+            if triplets is None:
+                misses.append((node, key))
+            else:
+                self._replay_triplets(node, triplets)
+                cached += 1
+
+        if not misses:
+            return nodes, {"tokens": 0, "calls": 0, "seen": set(), "cached": cached}
+
+        # A 429 pauses the limiter; the nodes still without triplets are retried once it's over
+        pending = [node for node, _ in misses]
+        for attempt in range(settings.GROQ_RATE_LIMIT_RETRIES + 1):
+            estimated = sum(self._estimate_tokens(node.text) for node in pending)
+            try:
+                with groq_limiter.reserve(estimated) as usage:
+                    extractor(pending)
+                break
+            except Exception as e:
+                pending = [node for node in pending if KG_RELATIONS_KEY not in node.metadata]
+                if not is_rate_limited(e) or attempt == settings.GROQ_RATE_LIMIT_RETRIES or not pending:
+                    raise
+                print(f"  ⏳ Extraction rate-limited, retrying {len(pending)} node(s) after the pause "
+                      f"({attempt + 1}/{settings.GROQ_RATE_LIMIT_RETRIES})")
+        usage["cached"] = cached
+
+        # The extractor fills the nodes in place; store what it found.
+        # Empty results are not stored, so a failed parse is retried next time.
+        for node, key in misses:
+            triplets = [(rel.source_id, rel.label, rel.target_id)
+                        for rel in node.metadata.get(KG_RELATIONS_KEY, [])]
+            if key and triplets:
+                extraction_cache.put(key, getattr(extractor.llm, "model", ""), triplets)
+        return nodes, usage
+
+    def _extract_chunk_in_worker(self, doc):
+        return self._extract_chunk(doc, self._thread_extractor())
+
+    def _extract_sequential(self, documents, total: int | None = None):
+        """One extraction call at a time. Yields (chunk_index, nodes, usage) in order."""
+        for i, doc in enumerate(documents):
+            print(f"  Extracting Graph from Chunk {i+1}/{total or '?'}...")
+            try:
+                nodes, usage = self._extract_chunk(doc, self._extractor)
+                yield i, nodes, usage
+            except Exception as e:
+                print(f"  ⚠️ Chunk {i+1} extraction failed: {e}")
+
+    def _extract_parallel(self, documents, workers: int):
+        """
+        Keeps up to `workers` extraction calls in flight (each gated by the shared
+        limiter). Yields (chunk_index, nodes, usage) in chunk order.
+        Documents are pulled from the iterable only as slots free up, so a
+        streamed input is never read far ahead of extraction.
+        """
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="neurospace-extract") as pool:
+            in_flight = deque()
+            documents = iter(documents)
+            i = 0
+            while True:
+                while len(in_flight) < workers * 2:
+                    doc = next(documents, None)
+                    if doc is None:
+                        break
+                    in_flight.append(pool.submit(self._extract_chunk_in_worker, doc))
+                if not in_flight:
+                    return
+                try:
+                    nodes, usage = in_flight.popleft().result()
+                    yield i, nodes, usage
+                except Exception as e:
+                    print(f"  ⚠️ Chunk {i+1} extraction failed: {e}")
+                i += 1
+
+    def _write_batch(self, index, nodes: list, filename: str):
+        """
+        Writes one batch of extracted nodes: a single batched embedding pass,
+        UNWIND upserts of chunks, entities and relations (Neo4jPropertyGraphStore),
+        and one UNWIND query linking the batch's chunks to their Document.
+        The store writes in its own sessions, so the two can't share a transaction:
+        if linking fails the chunks stay unlinked until the next run removes them
+        (see _remove_unlinked_chunks) and extracts them again.
+        The /stats figures are then told how many chunks the batch added.
+        """
+        index.insert_nodes(nodes)
+
+        from app.database import db
+        with db.get_session() as session:
+            summary = session.run(
+                "MERGE (d:Document {id: $filename}) ON CREATE SET d.name = $filename "
+                "WITH d UNWIND $chunk_ids AS chunk_id "
+                "MATCH (c:Chunk {id: chunk_id}) "
+                "MERGE (d)-[:HAS_CHUNK]->(c)",
+                filename=filename,
+                chunk_ids=[node.node_id for node in nodes],
+            ).consume()
+        db.record_graph_write(summary.counters.relationships_created)
 
-    def process_document(self, text_chunks: list, filename: str):
+    def _write_in_batches(self, index, extracted, total: int | None, filename: str, batch_size: int,
+                          progress=None, already_done: int = 0, usage_totals: dict | None = None) -> int:
         """
-        Takes a list of text chunks (strings or dicts), creates Document objects,
+        Buffers extracted chunks and flushes them in batches of `batch_size`, or
+        sooner once the oldest buffered chunk has waited INGEST_FLUSH_SECONDS,
+        so the first triplets reach Neo4j quickly even when extraction is slow.
+        Returns chunks written in this run (`already_done` only offsets the progress report).
+        `total` may be None when the chunks are streamed.
+        `usage_totals` ({"tokens", "calls", "chunks"}) accumulates the LLM usage of every chunk.
+        """
+        written = 0
+        pending, pending_chunks = [], 0
+        pending_since = None
+
+        def flush():
+            nonlocal written, pending, pending_chunks, pending_since
+            if not pending:
+                return
+            start = time.perf_counter()
+            try:
+                self._write_batch(index, pending, filename)
+                written += pending_chunks
+                print(f"  Wrote {pending_chunks} chunk(s) to Neo4j in {(time.perf_counter() - start) * 1000:.0f}ms "
+                      f"({already_done + written}/{total or '?'})")
+                if progress:
+                    progress("building_graph", chunks_done=already_done + written, chunks_total=total)
+            except Exception as e:
+                print(f"  ⚠️ Batch write failed ({pending_chunks} chunks): {e}")
+            pending, pending_chunks = [], 0
+            pending_since = None
+
+        for i, nodes, usage in extracted:
+            if usage_totals is not None:
+                usage_totals["tokens"] += usage["tokens"]
+                usage_totals["calls"] += usage["calls"]
+                usage_totals["chunks"] += 1
+            if usage.get("cached") and not usage["calls"]:
+                print(f"    Chunk {i+1}: replayed from extraction cache")
+            else:
+                print(f"    Chunk {i+1}: {usage['tokens']} tokens in {usage['calls']} LLM call(s)")
+            pending.extend(nodes)
+            pending_chunks += 1
+            if pending_since is None:
+                pending_since = time.perf_counter()
+            if (pending_chunks >= batch_size
+                    or time.perf_counter() - pending_since >= settings.INGEST_FLUSH_SECONDS):
+                flush()
+        flush()
+        return written
+
+    def _iter_documents(self, text_chunks, filename: str, completed: set, counts: dict):
+        """
+        Lazily converts incoming chunks (strings or dicts) to LlamaIndex Documents,
+        skipping chunks already checkpointed. `counts` tracks {"seen", "skipped"}.
+        """
+        # IMPORTANT: Do NOT mutate the input dicts (no .pop())
+        for chunk_index, chunk in enumerate(text_chunks):
+            counts["seen"] += 1
+            if isinstance(chunk, dict):
+                text = chunk.get("text", "")
+                # Build metadata without mutating the original dict
+                meta = {k: v for k, v in chunk.items() if k != "text"}
+                # Preserve source filename in both custom and LlamaIndex-standard keys
+                meta["filename"] = filename
+                meta["file_name"] = filename
+                # Normalize page_number for LlamaIndex compatibility
+                if "page_number" in meta:
+                    meta["page_label"] = str(meta["page_number"])
+            else:
+                # Backwards compatible for plain string chunks
+                text = chunk
+                meta = {"filename": filename, "file_name": filename}
+
+            # Checkpoint key (stored on the Chunk node, hidden from the LLM and embedder)
+            meta["chunk_index"] = chunk_index
+            meta["chunk_hash"] = self._chunk_hash(text)
+            if (chunk_index, meta["chunk_hash"]) in completed:
+                counts["skipped"] += 1
+                continue
+            yield Document(
+                text=text,
+                metadata=meta,
+                excluded_embed_metadata_keys=["chunk_index", "chunk_hash"],
+                excluded_llm_metadata_keys=["chunk_index", "chunk_hash"],
+            )
+
+    def process_document(self, text_chunks, filename: str, workers: int | None = None,
+                         progress=None, chunk_counts: dict | None = None):
+        """
+        Takes text chunks (strings or dicts), creates Document objects,
         and builds the Graph.
         Includes deduplication: skips if the file is already in the graph or currently being processed.
+        Chunks already written by an earlier, interrupted run (same filename, chunk index and
+        text hash) are skipped, so ingestion resumes at the first unfinished chunk.
+
+        `text_chunks` may be a list or any iterable (e.g. a streamed PDF); chunks are
+        pulled only as extraction needs them, so a stream is never fully buffered.
+        `workers` sets how many extraction calls run at once (defaults to EXTRACTION_WORKERS;
+        1 keeps the original sequential loop). `progress(stage, chunks_done, chunks_total)`
+        is called after every batch written to Neo4j.
+        `chunk_counts`, if given, is filled with the {"seen", "skipped", "failed"} chunks of
+        this run; failed chunks (extraction or write errors) are retried by the next run.
         """
         # --- Deduplication Guard ---
         with self._processing_lock:
@@ -72,73 +432,84 @@ class GraphService:
         try:
             self._init_components()
 
-            # Check if already ingested in Neo4j
-            if self._is_already_ingested(filename):
+            # Chunk-level checkpoints: which chunks of this file are already in Neo4j?
+            try:
+                removed = self._remove_unlinked_chunks(filename)
+                if removed:
+                    print(f"  Removed {removed} unlinked chunk(s) left by a failed batch of {filename}.")
+            except Exception as e:
+                print(f"  ⚠️ Could not clean up unlinked chunks: {e}")
+            completed, legacy = self._completed_chunks(filename)
+            if legacy:
+                print(f"  ⚠️ SKIPPED: {filename} is already in the Knowledge Graph. "
+                      f"Use /clear to re-ingest.")
+                return None
+
+            total = len(text_chunks) if hasattr(text_chunks, "__len__") else None
+            counts = chunk_counts if chunk_counts is not None else {}
+            counts.update(seen=0, skipped=0, failed=0)
+            documents = self._iter_documents(text_chunks, filename, completed, counts)
+
+            # Pull the first pending chunk to tell "nothing left to do" from a fresh/resumed run
+            first = next(documents, None)
+            if first is None:
                 print(f"  ⚠️ SKIPPED: {filename} is already in the Knowledge Graph. "
                       f"Use /clear to re-ingest.")
                 return None
+            documents = itertools.chain([first], documents)
+            # Resumed runs pick up where the checkpoints end; offsets the progress report
+            already_done = len(completed)
+            if already_done:
+                print(f"  Resuming {filename}: {already_done} chunks already done, "
+                      f"continuing from chunk {first.metadata['chunk_index'] + 1}...")
+            else:
+                print(f"  Building Knowledge Graph for {filename}...")
+
+            workers = max(1, workers or settings.EXTRACTION_WORKERS)
 
-            print(f"  Building Knowledge Graph for {filename}...")
-
-            # Convert the incoming data to LlamaIndex Document objects
-            # IMPORTANT: Do NOT mutate the input dicts (no .pop())
-            documents = []
-            for chunk in text_chunks:
-                if isinstance(chunk, dict):
-                    text = chunk.get("text", "")
-                    # Build metadata without mutating the original dict
-                    meta = {k: v for k, v in chunk.items() if k != "text"}
-                    # Preserve source filename in both custom and LlamaIndex-standard keys
-                    meta["filename"] = filename
-                    meta["file_name"] = filename
-                    # Normalize page_number for LlamaIndex compatibility
-                    if "page_number" in meta:
-                        meta["page_label"] = str(meta["page_number"])
-                    documents.append(Document(text=text, metadata=meta))
-                else:
-                    # Backwards compatible for plain string chunks
-                    documents.append(Document(
-                        text=chunk,
-                        metadata={"filename": filename, "file_name": filename}
-                    ))
-
-            import time
-
-            # Create the Property Graph Index with an empty document list first
+            # Create the Property Graph Index with an empty document list first.
+            # Extraction happens before the index sees the nodes, so the index only writes.
             print(f"  Initializing empty graph index...")
             index = PropertyGraphIndex.from_documents(
                 [],
                 storage_context=self._storage_context,
-                kg_extractors=[self._extractor],
+                kg_extractors=[PrecomputedPathExtractor()],
                 embed_model=self._llm_factory.embed_model,
             )
 
-            # Intelligent Batching to prevent Groq API 6000 TPM Rate Limit
-            print(f"  Start extraction sequence for {len(documents)} chunks (Token Rate-Limit Safe)...")
-            for i, doc in enumerate(documents):
-                print(f"  Extracting Graph from Chunk {i+1}/{len(documents)}...")
-                try:
-                    index.insert(doc)
-                    # A chunk + extraction prompt is ~1500 tokens. 
-                    # 6000 TPM Limit / 1500 tokens = 4 chunks per minute.
-                    # 60 seconds / 4 chunks = 15 seconds sleep per chunk.
-                    time.sleep(15)
-                except Exception as e:
-                    print(f"  ⚠️ Chunk {i+1} extraction failed (likely rate limits): {e}")
-                    time.sleep(30) # Back-off if we hit a hard 429 Error
+            # Token-bucket rate limiting against the shared Groq TPM budget:
+            # each chunk reserves its estimated tokens, then settles with the real usage.
+            # 429s pause the limiter for their Retry-After instead of a fixed back-off.
+            pending_total = max(0, total - already_done) if total is not None else None
+            print(f"  Start extraction sequence for {pending_total or 'streamed'} chunks "
+                  f"(Token Rate-Limit Safe, workers={workers})...")
+            start_time = time.perf_counter()
+            if workers == 1:
+                extracted = self._extract_sequential(documents, pending_total)
+            else:
+                extracted = self._extract_parallel(documents, workers)
+            usage_totals = {"tokens": 0, "calls": 0, "chunks": 0}
+            chunks_done = self._write_in_batches(
+                index, extracted, total, filename, settings.INGEST_BATCH_SIZE,
+                progress=progress, already_done=already_done, usage_totals=usage_totals,
+            )
+            elapsed_s = time.perf_counter() - start_time
+            counts["failed"] = counts["seen"] - counts["skipped"] - chunks_done
+            if counts["failed"]:
+                print(f"  ⚠️ {counts['failed']} chunk(s) of {filename} failed; re-ingest the file to retry them.")
+            chunks_per_minute = chunks_done / elapsed_s * 60 if elapsed_s else 0.0
+            print(f"  Extracted {chunks_done}/{counts['seen'] - counts['skipped']} chunks in {elapsed_s:.1f}s "
+                  f"({chunks_per_minute:.1f} chunks/min, workers={workers})")
+            print(f"  Sent {usage_totals['tokens']} tokens to the LLM in {usage_totals['calls']} extraction call(s) "
+                  f"({usage_totals['tokens'] / max(1, usage_totals['chunks']):.0f} tokens/chunk) for {filename}")
+            if settings.EXTRACTION_CACHE_ENABLED:
+                cache_stats = extraction_cache.stats()
+                print(f"  Extraction cache: {cache_stats['hit_rate']:.0%} hit rate, "
+                      f"{cache_stats['entries']} entries ({cache_stats['size_bytes'] / 1024:.0f} KB)")
 
-            try:
-                from app.database import db
-                with db.get_session() as session:
-                    session.run(
-                        "MATCH (c:Chunk) WHERE c.filename = $filename "
-                        "MERGE (d:Document {id: $filename, name: $filename}) "
-                        "MERGE (d)-[:HAS_CHUNK]->(c)",
-                        filename=filename
-                    )
-                print(f"  Linked chunks to Document node for {filename}")
-            except Exception as e:
-                print(f"  Failed to link Document node: {e}")
+            # Let long-lived readers (query engines) know the graph changed
+            from app.database import db
+            db.bump_graph_version()
 
             print(f"  Graph built successfully for {filename}!")
             return index
@@ -13,7 +13,9 @@ def setup_constraints():
         "CREATE CONSTRAINT chunk_id_unique IF NOT EXISTS FOR (c:Chunk) REQUIRE c.id IS UNIQUE",
         # 3. Ensure Entities (Concepts) are unique (Don't create duplicate 'Elon Musk' nodes)
         "CREATE CONSTRAINT entity_id_unique IF NOT EXISTS FOR (e:Entity) REQUIRE e.name IS UNIQUE",
-        # 4. Create a Vector Index for Chunks (for Similarity Search)
+        # 4. Look up Documents by file content (upload deduplication)
+        "CREATE INDEX doc_content_hash IF NOT EXISTS FOR (d:Document) ON (d.content_hash)",
+        # 5. Create a Vector Index for Chunks (for Similarity Search)
         # We call it 'chunk_vector_index'.
         # dimensions=1536 is standard for OpenAI embeddings.
         """
@@ -0,0 +1,98 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from llama_index.core.indices.property_graph.sub_retrievers.llm_synonym import LLMSynonymRetriever
+from llama_index.core.indices.property_graph.sub_retrievers.vector import VectorContextRetriever
+from llama_index.core.retrievers import BaseRetriever
+
+from app.services.timings import current_timer, stage
+
+
+class TimedLLMSynonymRetriever(LLMSynonymRetriever):
+    """LLMSynonymRetriever that records synonym expansion and graph traversal separately."""
+
+    def retrieve_from_graph(self, query_bundle):
+        timer = current_timer()
+        if timer is None:
+            return super().retrieve_from_graph(query_bundle)
+
+        # Expansion runs from here until the parsed synonyms are handed to
+        # _prepare_matches; the graph lookup after that counts as traversal.
+        timer.start("synonym_expansion")
+        try:
+            return super().retrieve_from_graph(query_bundle)
+        finally:
+            timer.stop("synonym_expansion", "synonym_expansion")  # No-op if already stopped
+
+    def _prepare_matches(self, matches, *args, **kwargs):
+        timer = current_timer()
+        if timer is not None:
+            timer.stop("synonym_expansion", "synonym_expansion")
+        with stage("graph_traversal"):
+            return super()._prepare_matches(matches, *args, **kwargs)
+
+
+class TimedVectorContextRetriever(VectorContextRetriever):
+    """VectorContextRetriever that records the Neo4j vector lookup as its own stage."""
+
+    def retrieve_from_graph(self, query_bundle):
+        with stage("vector_search"):
+            return super().retrieve_from_graph(query_bundle)
+
+
+class ParallelHybridRetriever(BaseRetriever):
+    """
+    Runs several graph sub-retrievers at the same time and merges their nodes.
+
+    PGRetriever with use_async=True already gathers its sub-retrievers on one
+    event loop, but their async methods wrap the synchronous Neo4j store calls
+    (and the query embedding), which block that loop, so in practice the
+    branches still run back to back: synonym LLM call + vector search. Running
+    each branch's sync path on its own thread makes hybrid latency roughly the
+    slower of the two.
+    """
+
+    def __init__(self, sub_retrievers: dict, executor: ThreadPoolExecutor, **kwargs):
+        # sub_retrievers: branch name -> retriever, e.g. {"synonym": ..., "vector": ...}
+        self.sub_retrievers = sub_retrievers
+        self._executor = executor
+        super().__init__(**kwargs)
+
+    def _run_branch(self, name: str, retriever, query_bundle):
+        start = time.perf_counter()
+        nodes = retriever.retrieve(query_bundle)
+        return name, nodes, (time.perf_counter() - start) * 1000
+
+    def _retrieve(self, query_bundle):
+        start = time.perf_counter()
+        # Each branch runs in a copy of this context so it records into the request's timer
+        futures = [
+            self._executor.submit(
+                contextvars.copy_context().run, self._run_branch, name, retriever, query_bundle
+            )
+            for name, retriever in self.sub_retrievers.items()
+        ]
+
+        all_nodes = []
+        branch_ms = {}
+        for future in futures:
+            name, nodes, elapsed_ms = future.result()
+            branch_ms[name] = round(elapsed_ms, 1)
+            all_nodes.extend(nodes)
+
+        total_ms = (time.perf_counter() - start) * 1000
+        branches = ", ".join(f"{name}={ms:.0f}ms" for name, ms in branch_ms.items())
+        print(f"  🔀 Hybrid retrieval: {branches} | total {total_ms:.0f}ms")
+        return self._deduplicate(all_nodes)
+
+    @staticmethod
+    def _deduplicate(nodes: list) -> list:
+        """Merges nodes with identical text (same as PGRetriever), keeping the best score."""
+        best = {}
+        for node in nodes:
+            key = node.text
+            current = best.get(key)
+            if current is None or (node.score or 0.0) > (current.score or 0.0):
+                best[key] = node
+        return list(best.values())
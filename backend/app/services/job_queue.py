@@ -0,0 +1,413 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+
+from app.config import settings
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueue:
+    """
+    Persistent ingestion job queue backed by a local SQLite file.
+
+    /ingest enqueues a job for the uploaded file; worker threads claim queued jobs
+    one at a time and run the ingestion pipeline, which reports its stage and
+    chunk progress back here. Several processes may share the same file: a claim
+    is a conditional UPDATE, so only one of them wins a job.
+
+    Running jobs record their owner (this queue instance) and a heartbeat. Jobs
+    whose heartbeat is older than `stale_after` seconds — their process crashed
+    or was restarted — are put back in the queue, so in-flight work is never
+    silently lost, while jobs another live process is working on are left alone.
+    A job interrupted `max_attempts` times is failed instead, so one that keeps
+    crashing its process can't crash-loop and block the jobs behind it.
+
+    Uploads whose content is already queued or running don't get a job of their
+    own: their filename is recorded on the existing job as an alias and handed
+    to the alias handler once that job is done.
+    """
+
+    def __init__(self, db_path: str, workers: int = 1, poll_interval: float = 2.0,
+                 heartbeat_interval: float = 10.0, stale_after: float = 60.0, max_attempts: int = 3):
+        self.db_path = db_path
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.max_attempts = max(1, max_attempts)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handler = None
+        self._alias_handler = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection per operation: commits on success, always closes."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    content_type TEXT NOT NULL,
+                    content_hash TEXT,
+                    uploaded INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    chunks_done INTEGER NOT NULL DEFAULT 0,
+                    chunks_total INTEGER,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            # Databases created before content hashing existed
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "content_hash" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN content_hash TEXT")
+            if "uploaded" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN uploaded INTEGER NOT NULL DEFAULT 0")
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            if "heartbeat_at" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_content_hash ON jobs (content_hash)")
+            # Upload names deferred until their job is done (see find_active_by_hash)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_aliases ("
+                "job_id TEXT NOT NULL, alias TEXT NOT NULL, PRIMARY KEY (job_id, alias))"
+            )
+
+    # --- Queue operations ---
+
+    def enqueue(self, file_path: str, filename: str, content_type: str, content_hash: str | None = None,
+                uploaded: bool = False) -> str:
+        """Queues a file for ingestion. `uploaded` means it is already in MinIO."""
+        with self._lock, self._connect() as conn:
+            job_id = self._insert(conn, file_path, filename, content_type, content_hash, uploaded)
+        self._wakeup.set()
+        return job_id
+
+    def enqueue_unique(self, file_path: str, filename: str, content_type: str, content_hash: str,
+                       uploaded: bool = False) -> tuple[str | None, str | None]:
+        """
+        Queues a file for ingestion unless a queued or running job already has
+        its content (`filename` is then deferred as that job's alias, see
+        find_active_by_hash). Returns (job_id, None) or (None, duplicate_of).
+
+        The check and the insert run in one write transaction, so concurrent
+        uploads of the same content, from any process sharing this file, queue
+        exactly one job. Only SQLite is touched inside it; look up ingested
+        copies (Neo4j) before calling.
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            duplicate_of = self._active_duplicate(conn, content_hash, filename)
+            if duplicate_of is not None:
+                return None, duplicate_of
+            job_id = self._insert(conn, file_path, filename, content_type, content_hash, uploaded)
+        self._wakeup.set()
+        return job_id, None
+
+    @staticmethod
+    def _insert(conn, file_path: str, filename: str, content_type: str, content_hash: str | None,
+                uploaded: bool) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn.execute(
+            "INSERT INTO jobs (id, filename, file_path, content_type, content_hash, uploaded, status, "
+            "stage, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, filename, file_path, content_type, content_hash, int(uploaded),
+             QUEUED, QUEUED, now, now),
+        )
+        return job_id
+
+    @staticmethod
+    def _active_duplicate(conn, content_hash: str, alias: str) -> str | None:
+        """find_active_by_hash inside the caller's write transaction."""
+        row = conn.execute(
+            "SELECT id, filename FROM jobs WHERE content_hash = ? AND status IN (?, ?) "
+            "ORDER BY created_at LIMIT 1",
+            (content_hash, QUEUED, RUNNING),
+        ).fetchone()
+        if row is None:
+            return None
+        if alias != row["filename"]:
+            conn.execute(
+                "INSERT OR IGNORE INTO job_aliases (job_id, alias) VALUES (?, ?)", (row["id"], alias)
+            )
+        return row["filename"]
+
+    def find_active_by_hash(self, content_hash: str, alias: str) -> str | None:
+        """
+        Returns the filename of a queued or running job for the same file content,
+        if any, and records `alias` (the new upload's name) on it. Recording and
+        finishing the job are serialized, so the alias reaches the alias handler
+        unless the job fails.
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            return self._active_duplicate(conn, content_hash, alias)
+
+    def _claim_next(self):
+        """
+        Moves the oldest queued job to running and returns it (or None).
+        The UPDATE only matches while the job is still queued, so when several
+        processes race for the same job exactly one of them gets rowcount 1.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            candidates = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 8", (QUEUED,)
+            ).fetchall()
+            for candidate in candidates:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = ?, stage = ?, attempts = attempts + 1, owner = ?, "
+                    "heartbeat_at = ?, started_at = ?, updated_at = ? WHERE id = ? AND status = ?",
+                    (RUNNING, "starting", self.owner, now, now, now, candidate["id"], QUEUED),
+                )
+                if cursor.rowcount == 1:
+                    return dict(conn.execute("SELECT * FROM jobs WHERE id = ?", (candidate["id"],)).fetchone())
+            return None
+
+    def update(self, job_id: str, **fields) -> bool:
+        """
+        Updates progress fields (stage, chunks_done, chunks_total, ...) of a job this
+        instance is running. Returns False (and changes nothing) if the job was
+        requeued since, e.g. because this worker stalled past `stale_after`.
+        """
+        if not fields:
+            return True
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {columns} WHERE id = ? AND owner = ?", (*fields.values(), job_id, self.owner)
+            )
+            return cursor.rowcount == 1
+
+    def _finish(self, job_id: str, status: str, error: str | None = None) -> list[str] | None:
+        """
+        Marks the job done or failed and returns (and forgets) the aliases deferred onto it.
+        Returns None if the job is no longer this instance's (requeued, maybe running elsewhere):
+        its state then belongs to the new run.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, error = ?, finished_at = ?, updated_at = ? "
+                "WHERE id = ? AND owner = ?",
+                (status, status, error, now, now, job_id, self.owner),
+            )
+            if cursor.rowcount != 1:
+                return None
+            aliases = [row["alias"] for row in conn.execute(
+                "SELECT alias FROM job_aliases WHERE job_id = ?", (job_id,)
+            )]
+            conn.execute("DELETE FROM job_aliases WHERE job_id = ?", (job_id,))
+        return aliases
+
+    def _heartbeat(self):
+        """Marks this instance's running jobs as alive."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE status = ? AND owner = ?",
+                (time.time(), RUNNING, self.owner),
+            )
+
+    def _requeue_interrupted(self) -> int:
+        """
+        Puts running jobs whose owner stopped sending heartbeats (crashed or
+        restarted process) back in the queue. Jobs from before heartbeats existed
+        fall back to their last progress update. Jobs that already used
+        `max_attempts` runs are failed instead.
+        """
+        now = time.time()
+        stale = (RUNNING, now - self.stale_after)
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")  # Nobody claims or finishes between the two steps
+            given_up = [row["id"] for row in conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND COALESCE(heartbeat_at, updated_at) < ? "
+                "AND attempts >= ?",
+                (*stale, self.max_attempts),
+            )]
+            for job_id in given_up:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, stage = ?, error = 'interrupted ' || attempts || ' times', "
+                    "owner = NULL, finished_at = ?, updated_at = ? WHERE id = ?",
+                    (FAILED, FAILED, now, now, job_id),
+                )
+                conn.execute("DELETE FROM job_aliases WHERE job_id = ?", (job_id,))
+            if given_up:
+                print(f"❌ Failed {len(given_up)} ingestion job(s) interrupted {self.max_attempts} times")
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, owner = NULL, updated_at = ? "
+                "WHERE status = ? AND COALESCE(heartbeat_at, updated_at) < ?",
+                (QUEUED, "requeued after restart", now, *stale),
+            )
+            return cursor.rowcount
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self._heartbeat()
+                requeued = self._requeue_interrupted()
+                if requeued:
+                    print(f"🔁 Requeued {requeued} stale ingestion job(s)")
+                    self._wakeup.set()
+            except sqlite3.Error as e:
+                print(f"⚠️ Job heartbeat failed: {e}")
+
+    # --- Status API ---
+
+    @staticmethod
+    def _describe(row) -> dict:
+        job = dict(row)
+        job.pop("file_path", None)
+        elapsed = None
+        if job["started_at"]:
+            elapsed = (job["finished_at"] or time.time()) - job["started_at"]
+        job["elapsed_s"] = round(elapsed, 1) if elapsed is not None else None
+        job["chunks_per_minute"] = (
+            round(job["chunks_done"] / elapsed * 60, 2) if elapsed and job["chunks_done"] else None
+        )
+        return job
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._describe(row) if row else None
+
+    def list_jobs(self, limit: int = 50) -> dict:
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+            counts = conn.execute("SELECT status, count(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {
+            "queue_depth": next((c["n"] for c in counts if c["status"] == QUEUED), 0),
+            "counts": {c["status"]: c["n"] for c in counts},
+            "jobs": [self._describe(row) for row in rows],
+        }
+
+    # --- Workers ---
+
+    def start(self, handler, alias_handler=None):
+        """
+        Starts the worker threads.
+        `handler(file_path, filename, content_type, progress, content_hash, already_uploaded)`
+        runs one job; `progress(stage, chunks_done=None, chunks_total=None)` reports back.
+        `alias_handler(alias, filename)` records the aliases deferred onto a job once it is done.
+        """
+        if self._threads:
+            return
+        self._handler = handler
+        self._alias_handler = alias_handler
+        requeued = self._requeue_interrupted()
+        if requeued:
+            print(f"🔁 Requeued {requeued} interrupted ingestion job(s)")
+
+        self._stop.clear()
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"neurospace-job-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        # Keeps this instance's jobs alive and picks up jobs whose owner died later on
+        thread = threading.Thread(target=self._heartbeat_loop, name="neurospace-job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        print(f"✅ Ingestion job queue started ({self.workers} worker(s), {self.db_path})")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _progress_callback(self, job_id: str):
+        def progress(stage: str, chunks_done: int | None = None, chunks_total: int | None = None):
+            fields = {"stage": stage}
+            if chunks_done is not None:
+                fields["chunks_done"] = chunks_done
+            if chunks_total is not None:
+                fields["chunks_total"] = chunks_total
+            self.update(job_id, **fields)
+        return progress
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            job = self._claim_next()
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            print(f"📥 Job {job['id']} started: {job['filename']}")
+            try:
+                if not os.path.exists(job["file_path"]):
+                    raise FileNotFoundError(f"Upload for {job['filename']} is no longer on disk")
+                self._handler(
+                    job["file_path"], job["filename"], job["content_type"],
+                    progress=self._progress_callback(job["id"]),
+                    content_hash=job["content_hash"],
+                    already_uploaded=bool(job["uploaded"]),
+                )
+            except Exception as e:
+                traceback.print_exc()
+                aliases = self._finish(job["id"], FAILED, error=str(e))
+                if aliases is None:
+                    print(f"⚠️ Job {job['id']} was requeued while it ran; dropping this run's failure: {e}")
+                    continue
+                print(f"❌ Job {job['id']} failed: {e}")
+                if aliases:
+                    print(f"⚠️ Dropped {len(aliases)} duplicate upload(s) of {job['filename']}: {', '.join(aliases)}")
+                continue
+
+            aliases = self._finish(job["id"], DONE)
+            if aliases is None:
+                print(f"⚠️ Job {job['id']} was requeued while it ran; dropping this run's result")
+                continue
+            print(f"✅ Job {job['id']} done: {job['filename']}")
+            for alias in aliases:
+                try:
+                    if self._alias_handler:
+                        self._alias_handler(alias, job["filename"])
+                except Exception as e:
+                    print(f"⚠️ Could not record {alias} as an alias of {job['filename']}: {e}")
+
+
+# Singleton — workers are started from the FastAPI lifespan
+job_queue = JobQueue(db_path=settings.JOB_DB_PATH, workers=settings.JOB_WORKERS,
+                     max_attempts=settings.JOB_MAX_ATTEMPTS)
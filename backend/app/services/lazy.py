@@ -0,0 +1,66 @@
+import threading
+import time
+
+# Every LazySingleton by name, for warm-up and the readiness endpoint
+components = {}
+
+
+class LazySingleton:
+    """
+    Module-level stand-in for an expensive singleton (model loads, Neo4j storage
+    contexts). Nothing is built at import: the object is created on first
+    attribute access, or ahead of time by warm() from a background thread.
+    Concurrent first accesses wait for a single build.
+
+    A failed build is recorded (see status()) and retried on the next access.
+    """
+
+    def __init__(self, name: str, factory):
+        self._name = name
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+        self._error = None
+        self._build_seconds = None
+        components[name] = self
+
+    def get(self):
+        instance = self._instance
+        if instance is not None:
+            return instance
+        with self._lock:
+            if self._instance is None:
+                start = time.perf_counter()
+                try:
+                    self._instance = self._factory()
+                except Exception as e:
+                    self._error = str(e)
+                    raise
+                self._error = None
+                self._build_seconds = time.perf_counter() - start
+                print(f"✅ {self._name} ready in {self._build_seconds:.1f}s")
+            return self._instance
+
+    def __getattr__(self, attr):
+        # Only called for attributes not found on the proxy itself
+        return getattr(self.get(), attr)
+
+    def warm(self) -> bool:
+        """Builds the instance now; returns False (and logs) if that fails."""
+        try:
+            self.get()
+            return True
+        except Exception as e:
+            print(f"❌ {self._name} warm-up failed: {e}")
+            return False
+
+    @property
+    def is_ready(self) -> bool:
+        return self._instance is not None
+
+    def status(self) -> dict:
+        return {
+            "ready": self._instance is not None,
+            "build_seconds": round(self._build_seconds, 2) if self._build_seconds else None,
+            "error": self._error,
+        }
@@ -1,10 +1,12 @@
 import os
+import httpx
 from llama_index.core import Settings
-from llama_index.llms.groq import Groq
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from llama_index.graph_stores.neo4j import Neo4jGraphStore, Neo4jPropertyGraphStore
-from llama_index.core import StorageContext
 from app.config import settings
+from app.services.lazy import LazySingleton
+from app.services.rate_limiter import LLMUsageHandler, groq_limiter
+
+# The Groq, HuggingFace (torch) and Neo4j store integrations are imported inside
+# the methods that use them, so importing this module stays cheap.
 
 
 class LLMFactory:
@@ -15,27 +17,73 @@ class LLMFactory:
         if not groq_key:
             raise ValueError("Error: GROQ_API_KEY not found in .env file!")
 
+        self._groq_key = groq_key
+
         print("⚡ Initializing Groq (Llama 3.1 8B)...")
-        self.llm = Groq(
-            model="llama-3.1-8b-instant",
-            api_key=groq_key,
-            temperature=0
-        )
+        self.llm = self.create_llm()
 
-        # 2. Setup the Embedder (Local HuggingFace)
+        # 2. Setup the Embedder (local: HuggingFace/torch or int8 ONNX Runtime)
         # This runs ON YOUR CPU. No API calls. No Rate Limits.
         # 'all-MiniLM-L6-v2' is the industry standard for fast, efficient embeddings.
-        print(" Initializing Local HuggingFace Embeddings...")
-        self.embed_model = HuggingFaceEmbedding(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
+        self.embed_model = self.create_embed_model()
 
         # 3. Apply to Global Settings
         Settings.llm = self.llm
         Settings.embed_model = self.embed_model
-        Settings.chunk_size = 1024  # Must be >= pdf.py's chunk_size (1000) to prevent re-chunking
+        # Must hold a whole pdf.py chunk plus its metadata, or LlamaIndex re-chunks it
+        Settings.chunk_size = max(1024, settings.PDF_CHUNK_TOKENS + 256)
+
+    def create_llm(self):
+        """
+        Builds a new Groq client. Threads that run their own event loops
+        (e.g. parallel extraction workers) each need their own instance,
+        since an httpx.AsyncClient can't be shared across loops.
+        """
+        # The httpx hooks feed Groq's rate-limit headers (and 429 Retry-After)
+        # into the shared limiter; the usage handler reports real token counts.
+        from llama_index.llms.groq import Groq
+        llm = Groq(
+            model="llama-3.1-8b-instant",
+            api_key=self._groq_key,
+            temperature=0,
+            http_client=httpx.Client(
+                timeout=httpx.Timeout(60.0),
+                event_hooks=groq_limiter.httpx_event_hooks(),
+            ),
+            async_http_client=httpx.AsyncClient(
+                timeout=httpx.Timeout(60.0),
+                event_hooks=groq_limiter.httpx_event_hooks(is_async=True),
+            ),
+        )
+        llm.callback_manager.add_handler(LLMUsageHandler())
+        return llm
+
+    @staticmethod
+    def create_embed_model():
+        """
+        Both backends produce the same 384-dim normalised vectors, so switching
+        EMBED_BACKEND doesn't require re-indexing (see eval/bench_embeddings.py
+        for the measured drift).
+        """
+        model_name = "sentence-transformers/all-MiniLM-L6-v2"
+        if settings.EMBED_BACKEND == "onnx":
+            print(" Initializing Local ONNX Runtime Embeddings...")
+            from app.services.onnx_embedding import OnnxEmbedding
+            return OnnxEmbedding(
+                model_name=model_name,
+                quantize=settings.EMBED_ONNX_QUANTIZE,
+                intra_op_threads=settings.EMBED_ONNX_THREADS,
+                embed_batch_size=settings.EMBED_BATCH_SIZE,
+            )
+
+        print(" Initializing Local HuggingFace Embeddings...")
+        from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+        return HuggingFaceEmbedding(model_name=model_name, embed_batch_size=settings.EMBED_BATCH_SIZE)
 
     def get_storage_context(self):
+        from llama_index.core import StorageContext
+        from llama_index.graph_stores.neo4j import Neo4jGraphStore, Neo4jPropertyGraphStore
+
         graph_store = Neo4jGraphStore(
             username=settings.NEO4J_USER,
             password=settings.NEO4J_PASSWORD,
@@ -57,9 +105,5 @@ class LLMFactory:
         )
 
 
-# Initialize
-try:
-    llm_factory = LLMFactory()
-except Exception as e:
-    print(f"Error: LLM Factory Init Failed: {e}")
-    llm_factory = None
+# Lazy singleton — built on first use or by the startup warm-up (see main.py)
+llm_factory = LazySingleton("llm_factory", LLMFactory)
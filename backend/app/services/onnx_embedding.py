@@ -0,0 +1,96 @@
+import os
+from typing import List
+
+import numpy as np
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from pydantic import PrivateAttr
+
+from app.config import settings
+
+
+class OnnxEmbedding(BaseEmbedding):
+    """
+    CPU embedding backend on ONNX Runtime, a drop-in for HuggingFaceEmbedding.
+
+    Loads the ONNX export that ships with the sentence-transformers model repo
+    (onnx/model.onnx), dynamically quantizes its weights to int8 once (cached
+    under DATA_DIR/onnx), and reproduces the sentence-transformers pipeline:
+    tokenizer -> transformer -> mean pooling over the attention mask -> L2
+    normalisation. For all-MiniLM-L6-v2 that gives the same 384-dim, unit-length
+    vectors chunk_vector_index is built for.
+
+    Requires `onnxruntime` (pip install onnxruntime); only imported when
+    EMBED_BACKEND=onnx.
+    """
+
+    max_length: int = 256  # all-MiniLM-L6-v2's max_seq_length
+    _session = PrivateAttr()
+    _tokenizer = PrivateAttr()
+    _input_names = PrivateAttr()
+
+    def __init__(self, model_name: str, quantize: bool = True, intra_op_threads: int = 0,
+                 cache_dir: str | None = None, **kwargs):
+        super().__init__(model_name=model_name, **kwargs)
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("EMBED_BACKEND=onnx needs onnxruntime: pip install onnxruntime") from e
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        model_path = hf_hub_download(model_name, "onnx/model.onnx")
+        if quantize:
+            model_path = self._quantized(model_path, model_name, cache_dir or os.path.join(settings.DATA_DIR, "onnx"))
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads  # 0 = one thread per physical core
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self._session.get_inputs()}
+
+        self._tokenizer = Tokenizer.from_file(hf_hub_download(model_name, "tokenizer.json"))
+        self._tokenizer.enable_truncation(max_length=self.max_length)
+        self._tokenizer.enable_padding()
+        print(f" ONNX embeddings ready ({os.path.basename(model_path)}, intra-op threads={intra_op_threads or 'auto'})")
+
+    @staticmethod
+    def _quantized(model_path: str, model_name: str, cache_dir: str) -> str:
+        """Int8 dynamic quantization of the weights, done once and cached."""
+        target = os.path.join(cache_dir, f"{model_name.replace('/', '__')}-int8.onnx")
+        if not os.path.exists(target):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            os.makedirs(cache_dir, exist_ok=True)
+            print(f" Quantizing {model_name} to int8 ({target})...")
+            quantize_dynamic(model_path, target, weight_type=QuantType.QInt8)
+        return target
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "OnnxEmbedding"
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        encodings = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self._session.run(None, inputs)[0]  # (batch, seq, 384)
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.tolist()
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed([query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts)
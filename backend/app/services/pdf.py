@@ -1,62 +1,252 @@
 from __future__ import annotations
 
+import multiprocessing
 import os
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from pypdf import PdfReader
 
+from ..config import settings
 from ..schemas import DocumentChunk, PDFResult
 
 
+def _make_splitter() -> RecursiveCharacterTextSplitter:
+    # Chunk the text into manageable pieces for embedding and graph extraction
+    if settings.PDF_SPLITTER == "chars":
+        # Original character-based sizing
+        return RecursiveCharacterTextSplitter(
+            chunk_size=1000,
+            chunk_overlap=200,
+            length_function=len,
+            is_separator_regex=False,
+        )
+    # Sized in tokens of the extraction model, so every chunk fills its extraction
+    # call to the same budget (Llama 3's tokenizer extends cl100k_base)
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        encoding_name=settings.PDF_TOKENIZER,
+        chunk_size=settings.PDF_CHUNK_TOKENS,
+        chunk_overlap=settings.PDF_CHUNK_OVERLAP_TOKENS,
+        is_separator_regex=False,
+    )
+
+
+def count_tokens(text: str) -> int:
+    """Tokens in `text` under PDF_TOKENIZER (used for reporting)."""
+    import tiktoken
+    return len(tiktoken.get_encoding(settings.PDF_TOKENIZER).encode(text, disallowed_special=()))
+
+
+def _split_pages(reader: PdfReader, splitter, start: int, end: int) -> list[tuple[int, list[str]]]:
+    """Extracts and splits pages [start, end). Returns [(page_number, [chunk_text, ...]), ...]."""
+    pages = []
+    for page_num in range(start, end):
+        raw_text = reader.pages[page_num].extract_text() or ""
+        raw_text = raw_text.strip()
+        if not raw_text:
+            continue
+        pages.append((page_num + 1, splitter.split_text(raw_text)))
+    return pages
+
+
+def _split_page_range(pdf_path: str, start: int, end: int) -> list[tuple[int, list[str]]]:
+    """Process-pool entry point: each worker opens its own reader for its page range."""
+    return _split_pages(PdfReader(pdf_path), _make_splitter(), start, end)
+
+
+# Marks the end of a streamed PDF in the producer/consumer queue
+_STREAM_END = object()
+
+
 # Class does 2 main things:
 # 1) Extract text from each page of the PDF using PyPDF2.
 # 2) Split the extracted text into smaller chunks using LangChain's RecursiveCharacterTextSplitter.
 class PDFProcessor:
+    # Below this many pages per worker, process start-up costs more than it saves
+    MIN_PAGES_PER_WORKER = 16
+    # Page ranges per worker, so a few slow (dense) ranges don't leave workers idle
+    RANGES_PER_WORKER = 4
+
     def __init__(self):
-        # Chunk the text into manageable pieces for embedding
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-            is_separator_regex=False,
+        self.splitter = _make_splitter()
+
+    def _workers_for(self, total_pages: int, workers: int | None) -> int:
+        """`workers` (default PDF_WORKERS), capped so each gets MIN_PAGES_PER_WORKER pages."""
+        return min(
+            max(1, workers or settings.PDF_WORKERS),
+            max(1, total_pages // self.MIN_PAGES_PER_WORKER),
         )
 
-    def process_pdf(self, pdf_path: str) -> PDFResult:
+    def _iter_pages_parallel(self, pdf_path: str, total_pages: int, workers: int) -> Iterator[tuple[int, list[str]]]:
+        """
+        Extracts page ranges on a process pool and yields pages in page order.
+        At most 2 ranges per worker are in flight, so a slow consumer (streaming)
+        doesn't make the pool parse the whole document ahead of it.
+        """
+        range_count = min(total_pages, workers * self.RANGES_PER_WORKER)
+        bounds = [total_pages * n // range_count for n in range(range_count + 1)]
+        ranges = iter(zip(bounds[:-1], bounds[1:]))
+        # spawn, not fork: the API process holds Neo4j connections, model threads and locks
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            window = deque()
+            try:
+                for start, end in ranges:
+                    window.append(pool.submit(_split_page_range, pdf_path, start, end))
+                    if len(window) >= workers * 2:
+                        yield from window.popleft().result()
+                while window:
+                    yield from window.popleft().result()
+            finally:
+                for future in window:
+                    future.cancel()  # Closed early: don't parse ranges nobody will read
+
+    def _split_parallel(self, pdf_path: str, total_pages: int, workers: int) -> list[tuple[int, list[str]]]:
+        """Extracts page ranges on a process pool; results come back in page order."""
+        return list(self._iter_pages_parallel(pdf_path, total_pages, workers))
+
+    def process_pdf(self, pdf_path: str, workers: int | None = None) -> PDFResult:
+        """
+        Extracts and splits every page of a PDF.
+        `workers` > 1 (default PDF_WORKERS) extracts page ranges on a process pool;
+        chunks keep the same global chunk_index order as the serial path.
+        """
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
         print(f"Processing PDF: {pdf_path}...")
+        start_time = time.perf_counter()
         reader = PdfReader(pdf_path)
         total_pages = len(reader.pages)
 
+        workers = self._workers_for(total_pages, workers)
+        if workers > 1:
+            pages = self._split_parallel(pdf_path, total_pages, workers)
+        else:
+            pages = _split_pages(reader, self.splitter, 0, total_pages)
+
         all_chunks: list[DocumentChunk] = []
         global_chunk_index = 0
 
-        for page_num, page in enumerate(reader.pages):
-            raw_text = page.extract_text() or ""
-            raw_text = raw_text.strip()
-            if not raw_text:
-                continue
-
-            text_chunks = self.splitter.split_text(raw_text)
+        for page_number, text_chunks in pages:
             for chunk_text in text_chunks:
                 all_chunks.append(
                     DocumentChunk(
                         text=chunk_text,
-                        page_number=page_num + 1,
+                        page_number=page_number,
                         chunk_index=global_chunk_index,
                         metadata={"source": os.path.basename(pdf_path)},
                     )
                 )
                 global_chunk_index += 1
 
-        print(f"Extracted {len(all_chunks)} chunks from {total_pages} pages.")
+        elapsed_s = time.perf_counter() - start_time
+        pages_per_second = total_pages / elapsed_s if elapsed_s else 0.0
+        print(f"Extracted {len(all_chunks)} chunks from {total_pages} pages "
+              f"in {elapsed_s:.1f}s ({pages_per_second:.1f} pages/s, workers={workers}).")
+        if all_chunks:
+            total_tokens = sum(count_tokens(chunk.text) for chunk in all_chunks)
+            print(f"Chunk text: {total_tokens} tokens ({total_tokens / len(all_chunks):.0f}/chunk, "
+                  f"splitter={settings.PDF_SPLITTER}).")
         return PDFResult(
             filename=os.path.basename(pdf_path),
             total_pages=total_pages,
             chunks=all_chunks,
         )
 
+    def iter_chunks(self, pdf_path: str, workers: int | None = None) -> Iterator[DocumentChunk]:
+        """
+        Generator version of process_pdf: yields DocumentChunks page by page
+        (same text, page_number and chunk_index) without building the full PDFResult.
+        With `workers` > 1 (default PDF_WORKERS) page ranges are parsed ahead on the
+        process pool, as in process_pdf.
+        """
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+
+        reader = PdfReader(pdf_path)
+        total_pages = len(reader.pages)
+        workers = self._workers_for(total_pages, workers)
+        if workers > 1:
+            pages = self._iter_pages_parallel(pdf_path, total_pages, workers)
+        else:
+            pages = (page for page_num in range(total_pages)
+                     for page in _split_pages(reader, self.splitter, page_num, page_num + 1))
+
+        source = os.path.basename(pdf_path)
+        global_chunk_index = 0
+        for page_number, text_chunks in pages:
+            for chunk_text in text_chunks:
+                yield DocumentChunk(
+                    text=chunk_text,
+                    page_number=page_number,
+                    chunk_index=global_chunk_index,
+                    metadata={"source": source},
+                )
+                global_chunk_index += 1
+
+    def stream_chunks(self, pdf_path: str, maxsize: int | None = None,
+                      on_total: Callable[[int], None] | None = None) -> Iterator[DocumentChunk]:
+        """
+        Parses the PDF on a producer thread that feeds a bounded queue, and yields
+        chunks as they arrive. Parsing stays at most `maxsize` chunks (default
+        PDF_STREAM_QUEUE_SIZE) ahead of the consumer, so memory stays flat for any
+        document size. Parser errors are re-raised in the consumer. With PDF_WORKERS > 1
+        the producer parses page ranges on the process pool (see iter_chunks).
+        The chunk count is only known once parsing finishes; `on_total(count)` is
+        called from the producer thread at that point (usually well before the
+        consumer has caught up).
+        """
+        chunks = queue.Queue(maxsize=maxsize or settings.PDF_STREAM_QUEUE_SIZE)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            # Blocks while the queue is full, but gives up once the consumer has gone away
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            start_time = time.perf_counter()
+            count = 0
+            try:
+                with closing(self.iter_chunks(pdf_path)) as pdf_chunks:
+                    for chunk in pdf_chunks:
+                        if not put(chunk):
+                            return
+                        count += 1
+            except Exception as e:
+                put(e)
+                return
+            print(f"Streamed {count} chunks from {os.path.basename(pdf_path)} "
+                  f"in {time.perf_counter() - start_time:.1f}s.")
+            if on_total is not None:
+                on_total(count)
+            put(_STREAM_END)
+
+        print(f"Streaming PDF: {pdf_path}...")
+        producer = threading.Thread(target=produce, name="neurospace-pdf-stream", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = chunks.get()
+                if item is _STREAM_END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
 
 # Singleton instance
 pdf_processor = PDFProcessor()
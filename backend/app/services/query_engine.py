@@ -1,9 +1,24 @@
 
 from llama_index.core import PropertyGraphIndex, PromptTemplate
+from app.config import settings
+from app.database import db
+from app.services.lazy import LazySingleton
 from app.services.llm_factory import llm_factory
+from app.services.embedding_batcher import embedding_batcher
+from app.services.semantic_cache import SemanticCache
+from app.services.hybrid_retriever import (
+    ParallelHybridRetriever,
+    TimedLLMSynonymRetriever,
+    TimedVectorContextRetriever,
+)
+from app.services.timings import LLMTimingHandler, stage, start_request_timer, timing_stats
+from llama_index.core import QueryBundle
 from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import hashlib
 import re
+import threading
 import time
 
 # --- 🛡️ THE NEUROSPACE ANTI-HALLUCINATION PROMPT ---
@@ -42,14 +57,78 @@ class QueryService:
         # maxsize=100: Remembers the last 100 questions.
         # ttl=3600: Forgets them after 1 hour (3600 seconds).
         self.cache = TTLCache(maxsize=100, ttl=3600)
+        # TTLCache isn't thread-safe and aask() runs queries on CHAT_MAX_WORKERS threads
+        self._cache_lock = threading.Lock()
+        # Graph version the cached answers were computed on (both caches are emptied when it moves)
+        self._cache_version = db.graph_version
+        # 🧲 Semantic Cache: catches rephrased questions by query-embedding similarity.
+        # Namespaced per retrieval mode so modes never share answers.
+        # Questions are embedded through the shared micro-batcher (one forward pass
+        # for all concurrent requests, plus an LRU cache of recent query vectors).
+        self.semantic_cache = SemanticCache(
+            embed_model=embedding_batcher,
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            maxsize=settings.SEMANTIC_CACHE_MAXSIZE,
+            ttl=settings.SEMANTIC_CACHE_TTL,
+        )
+
+        # 🔁 Long-lived query engines: (mode, streaming) -> (graph_version, engine).
+        # Rebuilt only when db.graph_version moves (ingestion finished or /clear).
+        self._engines = {}
+        self._engine_lock = threading.Lock()
+        self.last_engine_build_ms = {}
+
+        # 🧵 Bounded pool for aask(): embedding, Neo4j and Groq calls are blocking,
+        # so they run here instead of on the uvicorn event loop.
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.CHAT_MAX_WORKERS,
+            thread_name_prefix="neurospace-chat",
+        )
+        # Hybrid mode fans its two sub-retrievers out here (two branches per query)
+        self._retrieval_executor = ThreadPoolExecutor(
+            max_workers=settings.CHAT_MAX_WORKERS * 2,
+            thread_name_prefix="neurospace-retrieve",
+        )
+        # ⏱️ Times the synthesis LLM call so it can be split from prompt assembly.
+        # Every engine build hands this manager to its response synthesizer: the
+        # synthesizer assigns its callback manager to the LLM, and would otherwise
+        # swap in Settings.callback_manager and drop this handler.
+        self._callback_manager = llm_factory.llm.callback_manager
+        self._callback_manager.add_handler(LLMTimingHandler())
         print("✅ Query Engine Cache Ready!")
 
-    def _get_query_engine(self, mode: str = "hybrid"):
+    def _is_engine_warm(self, mode: str, streaming: bool = False) -> bool:
+        cached = self._engines.get((mode, streaming))
+        return cached is not None and cached[0] == db.graph_version
+
+    def _get_query_engine(self, mode: str = "hybrid", streaming: bool = False):
+        """
+        Returns the query engine for this mode, reusing the one built for the
+        current graph version. A new engine is only built on first use or after
+        the graph has changed.
+        """
+        key = (mode, streaming)
+        graph_version = db.graph_version
+        with self._engine_lock:
+            cached = self._engines.get(key)
+            if cached is not None and cached[0] == graph_version:
+                return cached[1]
+
+            build_start = time.perf_counter()
+            engine = self._build_query_engine(mode=mode, streaming=streaming)
+            build_ms = (time.perf_counter() - build_start) * 1000
+
+            self._engines[key] = (graph_version, engine)
+            self.last_engine_build_ms[mode] = round(build_ms, 1)
+            print(f"  🔧 Built {mode} query engine for graph v{graph_version} in {build_ms:.0f}ms")
+            return engine
+
+    def _build_query_engine(self, mode: str = "hybrid", streaming: bool = False):
         """
-        Builds the query engine dynamically to ensure it captures newly ingested files.
+        Builds a fresh query engine against the live Neo4j property graph.
 
         Modes:
-            - "hybrid": Uses both LLM Synonym + Vector retrievers (default)
+            - "hybrid": Uses both LLM Synonym + Vector retrievers, run in parallel (default)
             - "vector_only": Uses only the Vector Context Retriever
             - "synonym_only": Uses only the LLM Synonym Retriever
         """
@@ -58,12 +137,9 @@ class QueryService:
             embed_model=llm_factory.embed_model,
             llm=llm_factory.llm,
         )
-        # We use explicit graph traversal sub-retrievers
-        from llama_index.core.indices.property_graph.sub_retrievers.llm_synonym import LLMSynonymRetriever
-        from llama_index.core.indices.property_graph.sub_retrievers.vector import VectorContextRetriever
-
+        # We use explicit graph traversal sub-retrievers (timed subclasses of the LlamaIndex ones)
         # 1. LLM Synonym Retriever: Uses the LLM to generate synonyms for the query, and searches the Neo4j graph for them explicitly.
-        synonym_retriever = LLMSynonymRetriever(
+        synonym_retriever = TimedLLMSynonymRetriever(
             index.property_graph_store,
             llm=llm_factory.llm,
             include_text=True,
@@ -71,24 +147,42 @@ class QueryService:
 
         # 2. Vector Context Retriever: Extracts paragraphs and metadata directly from the Node's properties
         # Higher similarity_top_k = more chunks = better coverage for citations
-        vector_retriever = VectorContextRetriever(
+        vector_retriever = TimedVectorContextRetriever(
             index.property_graph_store,
             embed_model=llm_factory.embed_model,
             include_text=True,
             similarity_top_k=5,
         )
 
+        from llama_index.core import get_response_synthesizer
+        from llama_index.core.indices.property_graph import PGRetriever
+        from llama_index.core.query_engine import RetrieverQueryEngine
+
         # Select sub-retrievers based on mode
         if mode == "vector_only":
-            sub_retrievers = [vector_retriever]
+            retriever = PGRetriever([vector_retriever], use_async=False)
         elif mode == "synonym_only":
-            sub_retrievers = [synonym_retriever]
+            retriever = PGRetriever([synonym_retriever], use_async=False)
         else:  # "hybrid" — default
-            sub_retrievers = [synonym_retriever, vector_retriever]
-
-        return index.as_query_engine(
-            sub_retrievers=sub_retrievers,
-            text_qa_template=neurospace_prompt
+            # The vector lookup doesn't depend on the synonym LLM call, so run both at once
+            retriever = ParallelHybridRetriever(
+                {"synonym": synonym_retriever, "vector": vector_retriever},
+                executor=self._retrieval_executor,
+            )
+        # Single-retriever modes use the sync path (use_async=False): the async
+        # one would bypass the timed retrieve_from_graph/_prepare_matches overrides.
+        # Built here rather than by from_args, which doesn't pass callback_manager on
+        response_synthesizer = get_response_synthesizer(
+            llm=llm_factory.llm,
+            text_qa_template=neurospace_prompt,
+            streaming=streaming,
+            callback_manager=self._callback_manager,
+        )
+        return RetrieverQueryEngine.from_args(
+            retriever,
+            llm=llm_factory.llm,
+            response_synthesizer=response_synthesizer,
+            callback_manager=self._callback_manager,
         )
 
     def _generate_cache_key(self, text: str, mode: str = "hybrid") -> str:
@@ -171,7 +265,119 @@ class QueryService:
         return cited_sources
 
 
-    def ask(self, question: str, mode: str = "hybrid") -> dict:
+    def _build_sources(self, source_nodes) -> list:
+        """Turns retrieved nodes into deduplicated source dicts for the ChatResponse."""
+        all_sources = []
+        seen_sources = set()  # Deduplicate citations
+
+        for node in source_nodes or []:
+            meta = node.metadata
+            # Debug: log exactly what metadata comes back from Neo4j
+            print(f"  📋 Source node metadata keys: {list(meta.keys())}")
+            print(f"  📋 Source node metadata: {meta}")
+
+            # Try multiple key variants for filename
+            # LlamaIndex may store as file_name, we store as filename
+            filename = (
+                meta.get("filename")
+                or meta.get("file_name")
+                or meta.get("source")
+                or "Unknown File"
+            )
+
+            # Try multiple key variants for page number
+            page = meta.get("page_number") or meta.get("page_label")
+            if page is not None:
+                try:
+                    page = int(page)
+                except (ValueError, TypeError):
+                    page = None
+
+            # Try multiple key variants for timestamps (video)
+            start = meta.get("start")
+            end = meta.get("end")
+            timestamp = None
+            if start is not None and end is not None:
+                timestamp = f"{start}s - {end}s"
+
+            # Deduplicate by (filename, page, timestamp)
+            dedup_key = (filename, page, timestamp)
+            if dedup_key in seen_sources:
+                continue
+            seen_sources.add(dedup_key)
+
+            # Build text snippet — node.text can sometimes be None for graph nodes
+            node_text = node.text or node.node.get_content() if hasattr(node, 'node') else node.text
+            node_text = node_text or ""
+            text_snippet = node_text[:200] + "..." if len(node_text) > 200 else node_text
+            if not text_snippet:
+                text_snippet = "(Graph relationship node)"
+
+            source_info = {
+                "filename": filename,
+                "text_snippet": text_snippet,
+                "score": round(node.score, 3) if node.score is not None else None
+            }
+            if page is not None:
+                source_info["page"] = page
+            if timestamp:
+                source_info["timestamp"] = timestamp
+            all_sources.append(source_info)
+
+        return all_sources
+
+    def _check_caches(self, question: str, mode: str, start_time: float):
+        """
+        Looks the question up in the exact and semantic caches, after emptying
+        both if the graph changed (ingestion finished or /clear) since they filled.
+        Returns (cached_result_or_None, cache_key, query_vector, graph_version).
+        """
+        graph_version = db.graph_version
+        with self._cache_lock:
+            if self._cache_version != graph_version:
+                self.cache.clear()
+                self.semantic_cache.clear()
+                self._cache_version = graph_version
+                print(f"  🧹 Graph changed (v{graph_version}) — answer caches cleared")
+
+        # 1. Exact Cache
+        cache_key = self._generate_cache_key(question, mode)
+        with self._cache_lock:
+            cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ CACHE HIT! Instant response for: '{question}' (mode={mode})")
+            # Copy: the stored dict is shared with the semantic cache and other requests
+            return {**cached, "latency_ms": 0.0}, cache_key, None, graph_version  # Instant from cache
+
+        # 2. Semantic Cache (same question, different wording)
+        with stage("query_embedding"):
+            query_vector = self.semantic_cache.embed(question.strip())
+        semantic_hit = self.semantic_cache.lookup(mode, query_vector)
+        if semantic_hit is not None:
+            cached, similarity, matched_question = semantic_hit
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            print(f"⚡ SEMANTIC CACHE HIT! '{question}' ≈ '{matched_question}' "
+                  f"(cosine={similarity:.3f}, mode={mode})")
+            return {**cached, "latency_ms": round(elapsed_ms, 1)}, cache_key, query_vector, graph_version
+
+        return None, cache_key, query_vector, graph_version
+
+    def _save_to_caches(self, question: str, mode: str, cache_key: str, query_vector, result: dict,
+                        graph_version: int):
+        with self._cache_lock:
+            # Answered on a graph that has changed since — don't cache it
+            if graph_version != db.graph_version:
+                return
+            self.cache[cache_key] = result
+            self.semantic_cache.store(mode, question.strip(), query_vector, result)
+
+    def clear_caches(self):
+        """Empties the exact and semantic answer caches."""
+        with self._cache_lock:
+            self.cache.clear()
+        self.semantic_cache.clear()
+
+    def ask(self, question: str, mode: str = "hybrid", include_timings: bool = False) -> dict:
         """
         Sends the question through the retrieval pipeline.
         Checks the cache first for instant responses.
@@ -179,100 +385,130 @@ class QueryService:
         Args:
             question: The user's question
             mode: Retrieval mode — "hybrid" (default), "vector_only", or "synonym_only"
+            include_timings: Add the per-stage latency breakdown (ms) as "timings"
         """
         # Validate mode
         if mode not in VALID_MODES:
             mode = "hybrid"
 
-        # 1. Check Cache
-        cache_key = self._generate_cache_key(question, mode)
-        if cache_key in self.cache:
-            print(f"⚡ CACHE HIT! Instant response for: '{question}' (mode={mode})")
-            cached = self.cache[cache_key]
-            cached["latency_ms"] = 0.0  # Instant from cache
+        timer = start_request_timer()
+
+        # 1. Check the exact + semantic caches
+        start_time = time.perf_counter()
+        cached, cache_key, query_vector, graph_version = self._check_caches(question, mode, start_time)
+        if cached is not None:
+            if include_timings:
+                return {**cached, "timings": dict(timer.timings)}
             return cached
 
         # 2. Not in cache, run the heavy engine on the LIVE graph state
         print(f"🧠 Thinking deeply about: '{question}' (mode={mode})...")
-        start_time = time.perf_counter()
 
-        query_engine = self._get_query_engine(mode=mode)
-        response = query_engine.query(question)
+        cold_start = not self._is_engine_warm(mode)
+        with stage("engine_setup"):
+            query_engine = self._get_query_engine(mode=mode)
+
+        # Reuse the embedding computed for the semantic cache so the vector retriever doesn't re-embed
+        query_bundle = QueryBundle(query_str=question, embedding=query_vector.tolist())
+
+        timer.phase = "retrieval"
+        with stage("retrieval"):
+            nodes = query_engine.retrieve(query_bundle)
+
+        timer.phase = "synthesis"
+        with stage("synthesis"):
+            response = query_engine.synthesize(query_bundle, nodes)
+        timer.phase = None
 
         elapsed_ms = (time.perf_counter() - start_time) * 1000
 
-        answer_text = str(response)
-        all_sources = []
-        seen_sources = set()  # Deduplicate citations
+        # Prompt assembly = everything in synthesis that isn't the LLM call itself
+        timings = dict(timer.timings)
+        if "llm_synthesis" in timings:
+            timings["prompt_assembly"] = round(max(timings["synthesis"] - timings["llm_synthesis"], 0.0), 1)
+        timings["total"] = round(elapsed_ms, 1)
+        timing_stats.record(mode, timings)
+        print(f"  ⏱️ Stage timings (mode={mode}): {timings}")
 
-        if response.source_nodes:
-            for node in response.source_nodes:
-                meta = node.metadata
-                # Debug: log exactly what metadata comes back from Neo4j
-                print(f"  📋 Source node metadata keys: {list(meta.keys())}")
-                print(f"  📋 Source node metadata: {meta}")
-
-                # Try multiple key variants for filename
-                # LlamaIndex may store as file_name, we store as filename
-                filename = (
-                    meta.get("filename")
-                    or meta.get("file_name")
-                    or meta.get("source")
-                    or "Unknown File"
-                )
-
-                # Try multiple key variants for page number
-                page = meta.get("page_number") or meta.get("page_label")
-                if page is not None:
-                    try:
-                        page = int(page)
-                    except (ValueError, TypeError):
-                        page = None
-
-                # Try multiple key variants for timestamps (video)
-                start = meta.get("start")
-                end = meta.get("end")
-                timestamp = None
-                if start is not None and end is not None:
-                    timestamp = f"{start}s - {end}s"
-
-                # Deduplicate by (filename, page, timestamp)
-                dedup_key = (filename, page, timestamp)
-                if dedup_key in seen_sources:
-                    continue
-                seen_sources.add(dedup_key)
-
-                # Build text snippet — node.text can sometimes be None for graph nodes
-                node_text = node.text or node.node.get_content() if hasattr(node, 'node') else node.text
-                node_text = node_text or ""
-                text_snippet = node_text[:200] + "..." if len(node_text) > 200 else node_text
-                if not text_snippet:
-                    text_snippet = "(Graph relationship node)"
-
-                source_info = {
-                    "filename": filename,
-                    "text_snippet": text_snippet,
-                    "score": round(node.score, 3) if node.score is not None else None
-                }
-                if page is not None:
-                    source_info["page"] = page
-                if timestamp:
-                    source_info["timestamp"] = timestamp
-                all_sources.append(source_info)
+        answer_text = str(response)
+        all_sources = self._build_sources(response.source_nodes)
 
         # 3. Filter to only sources the LLM actually cited in its answer
         cited_sources = self._filter_cited_sources(answer_text, all_sources)
 
-        print(f"  ⏱️ Query completed in {elapsed_ms:.0f}ms (mode={mode})")
+        path = "cold" if cold_start else "warm"
+        print(f"  ⏱️ Query completed in {elapsed_ms:.0f}ms (mode={mode}, {path} engine)")
 
         final_result = {
             "answer": answer_text,
             "sources": cited_sources,
             "latency_ms": round(elapsed_ms, 1),
         }
-        # 4. Save to Cache for next time
-        self.cache[cache_key] = final_result
+        # 4. Save to both caches for next time
+        self._save_to_caches(question, mode, cache_key, query_vector, final_result, graph_version)
+        if include_timings:
+            return {**final_result, "timings": timings}
         return final_result
 
-# Singleton instance
-query_service = QueryService()
\ No newline at end of file
+    async def aask(self, question: str, mode: str = "hybrid", include_timings: bool = False) -> dict:
+        """
+        Async wrapper around ask() for async endpoints.
+        The Neo4j driver and local embedder are synchronous, so the whole query runs
+        on the bounded chat executor; at most CHAT_MAX_WORKERS queries run at once and
+        the rest wait without holding up the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.ask, question, mode, include_timings)
+
+    def ask_stream(self, question: str, mode: str = "hybrid"):
+        """
+        Streaming variant of ask(). Yields (event, data) tuples:
+            ("sources", {"sources": [...]})          — all retrieved sources, before generation
+            ("token", {"text": "..."})               — answer tokens as the LLM produces them
+            ("done", {"answer", "sources", "latency_ms", "ttfb_ms"})
+                                                     — cited sources only, plus timings
+        `ttfb_ms` is the time until the first answer token; `latency_ms` is the full request.
+        """
+        if mode not in VALID_MODES:
+            mode = "hybrid"
+
+        start_time = time.perf_counter()
+        cached, cache_key, query_vector, graph_version = self._check_caches(question, mode, start_time)
+        if cached is not None:
+            ttfb_ms = round((time.perf_counter() - start_time) * 1000, 1)
+            yield "sources", {"sources": cached["sources"]}
+            yield "token", {"text": cached["answer"]}
+            yield "done", {**cached, "ttfb_ms": ttfb_ms}
+            return
+
+        print(f"🧠 Streaming answer for: '{question}' (mode={mode})...")
+        query_engine = self._get_query_engine(mode=mode, streaming=True)
+        response = query_engine.query(question)
+
+        # Retrieval is done at this point — send sources before the first token
+        all_sources = self._build_sources(response.source_nodes)
+        yield "sources", {"sources": all_sources}
+
+        ttfb_ms = None
+        answer_parts = []
+        for token in response.response_gen:
+            if ttfb_ms is None:
+                ttfb_ms = round((time.perf_counter() - start_time) * 1000, 1)
+            answer_parts.append(token)
+            yield "token", {"text": token}
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        answer_text = "".join(answer_parts)
+        cited_sources = self._filter_cited_sources(answer_text, all_sources)
+        print(f"  ⏱️ Streamed answer in {elapsed_ms:.0f}ms (first token {ttfb_ms}ms, mode={mode})")
+
+        final_result = {
+            "answer": answer_text,
+            "sources": cited_sources,
+            "latency_ms": round(elapsed_ms, 1),
+        }
+        self._save_to_caches(question, mode, cache_key, query_vector, final_result, graph_version)
+        yield "done", {**final_result, "ttfb_ms": ttfb_ms}
+
+# Lazy singleton — opens its Neo4j storage context on first use or during the startup warm-up
+query_service = LazySingleton("query_service", QueryService)
\ No newline at end of file
@@ -0,0 +1,188 @@
+import contextvars
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from llama_index.core.callbacks import CBEventType, EventPayload
+from llama_index.core.callbacks.base_handler import BaseCallbackHandler
+
+from app.config import settings
+
+# Token usage accumulator for the LLM calls made inside the current reserve() block
+_current_usage = contextvars.ContextVar("neurospace_llm_usage", default=None)
+
+_DURATION_PART = re.compile(r"([\d.]+)(ms|h|m|s)")
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Parses Groq-style durations ('7.66s', '2m59.56s', '120ms', '30') into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)  # Plain seconds, as in Retry-After
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """True for a Groq/OpenAI-client error caused by a 429 response."""
+    return getattr(error, "status_code", None) == 429
+
+
+class TokenBucketLimiter:
+    """
+    Shared tokens-per-minute limiter for Groq calls.
+
+    Callers reserve an *estimate* before a call and settle with the *actual* usage
+    reported by the LLM afterwards, so small chunks don't pay for a worst case.
+    Rate-limit response headers correct the local view of the remaining quota,
+    and a 429 pauses every caller until its Retry-After has passed.
+
+    Graph extraction reserves every call. Chat calls only feed their response
+    headers in (see LLMFactory), so interactive queries never wait behind an
+    ingestion, but their usage and 429s still hold extraction back.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.refill_per_second = tokens_per_minute / 60.0
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        self.total_waited_s = 0.0
+        self.rate_limited_responses = 0
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+        self._last_refill = now
+
+    def acquire(self, tokens: int) -> float:
+        """Blocks until `tokens` are available and debits them. Returns seconds waited."""
+        tokens = min(float(tokens), self.capacity)  # A single call can never need more than a full bucket
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.total_waited_s += waited
+                    return waited
+                else:
+                    wait = (tokens - self._tokens) / self.refill_per_second
+            time.sleep(wait)
+            waited += wait
+
+    def settle(self, estimated: int, actual: int):
+        """Replaces an earlier estimate with the real usage (the bucket may go into debt)."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + estimated - actual)
+
+    def pause(self, seconds: float):
+        """Stops all callers for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def observe_response(self, status_code: int, headers):
+        """Syncs the bucket with Groq's rate-limit headers; honours Retry-After on 429."""
+        remaining = headers.get("x-ratelimit-remaining-tokens")
+        if remaining is not None:
+            try:
+                remaining = float(remaining)
+                with self._lock:
+                    self._refill(time.monotonic())
+                    self._tokens = min(self._tokens, remaining)
+            except ValueError:
+                pass
+
+        if status_code == 429:
+            self.rate_limited_responses += 1
+            retry_after = parse_duration(headers.get("retry-after"))
+            if retry_after is None:
+                retry_after = parse_duration(headers.get("x-ratelimit-reset-tokens")) or 60.0
+            print(f"  ⏳ Groq rate limit hit — pausing LLM calls for {retry_after:.1f}s")
+            self.pause(retry_after)
+
+    def httpx_event_hooks(self, is_async: bool = False) -> dict:
+        """Response hooks for the httpx clients used by the Groq LLM."""
+        if is_async:
+            async def on_response(response):
+                self.observe_response(response.status_code, response.headers)
+        else:
+            def on_response(response):
+                self.observe_response(response.status_code, response.headers)
+        return {"response": [on_response]}
+
+    @contextmanager
+    def reserve(self, estimated_tokens: int):
+        """
+        Reserves `estimated_tokens`, runs the block, then settles with the actual
+        usage of every LLM call made inside it. Yields the usage dict.
+        """
+        self.acquire(estimated_tokens)
+        usage = {"tokens": 0, "calls": 0, "seen": set()}
+        token = _current_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _current_usage.reset(token)
+            actual = usage["tokens"] if usage["calls"] else estimated_tokens
+            self.settle(estimated_tokens, actual)
+
+
+def _response_usage(response) -> tuple[str | None, int | None]:
+    """Pulls (response_id, total_tokens) out of an LLM response's raw payload."""
+    raw = getattr(response, "raw", None)
+    if raw is None:
+        return None, None
+    if isinstance(raw, dict):
+        usage = raw.get("usage") or {}
+        total = usage.get("total_tokens") if isinstance(usage, dict) else getattr(usage, "total_tokens", None)
+        return raw.get("id"), total
+    usage = getattr(raw, "usage", None)
+    return getattr(raw, "id", None), getattr(usage, "total_tokens", None)
+
+
+class LLMUsageHandler(BaseCallbackHandler):
+    """Adds the real token usage of each LLM call to the enclosing reserve() block."""
+
+    def __init__(self):
+        super().__init__(event_starts_to_ignore=[], event_ends_to_ignore=[])
+
+    def on_event_start(self, event_type, payload=None, event_id: str = "", parent_id: str = "", **kwargs):
+        return event_id
+
+    def on_event_end(self, event_type, payload=None, event_id: str = "", **kwargs):
+        usage = _current_usage.get()
+        if event_type != CBEventType.LLM or usage is None or not payload:
+            return
+        response = payload.get(EventPayload.RESPONSE) or payload.get(EventPayload.COMPLETION)
+        response_id, total = _response_usage(response)
+        if total is None or (response_id and response_id in usage["seen"]):
+            return
+        if response_id:
+            usage["seen"].add(response_id)
+        usage["tokens"] += total
+        usage["calls"] += 1
+
+    def start_trace(self, trace_id=None):
+        pass
+
+    def end_trace(self, trace_id=None, trace_map=None):
+        pass
+
+
+# Singleton — one Groq API key means one shared TPM budget for the whole process
+groq_limiter = TokenBucketLimiter(tokens_per_minute=settings.GROQ_TPM_LIMIT)
@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Answer cache keyed by query embedding instead of exact text.
+
+    A lookup embeds the question and returns the stored answer of the most
+    similar cached question in the same namespace (retrieval mode), as long as
+    the cosine similarity is at or above `threshold`.
+    Entries are evicted LRU once a namespace holds `maxsize` entries, and
+    expire `ttl` seconds after they were stored.
+    """
+
+    def __init__(self, embed_model, threshold: float = 0.92, maxsize: int = 256, ttl: float = 3600):
+        self.embed_model = embed_model
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        # namespace -> OrderedDict[question -> (unit_vector, stored_at, value)]
+        self._namespaces = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embeds a question and normalizes it so a dot product is the cosine similarity."""
+        vector = np.asarray(self.embed_model.get_query_embedding(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _evict_expired(self, entries: OrderedDict, now: float):
+        expired = [key for key, (_, stored_at, _) in entries.items() if now - stored_at > self.ttl]
+        for key in expired:
+            del entries[key]
+
+    def lookup(self, namespace: str, vector: np.ndarray):
+        """
+        Returns (value, similarity, matched_question) for the closest cached question,
+        or None if nothing in the namespace clears the threshold.
+        """
+        with self._lock:
+            entries = self._namespaces.get(namespace)
+            if entries:
+                self._evict_expired(entries, time.monotonic())
+            if not entries:
+                self.misses += 1
+                return None
+
+            keys = list(entries.keys())
+            matrix = np.stack([entries[key][0] for key in keys])
+            similarities = matrix @ vector
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            matched = keys[best]
+            entries.move_to_end(matched)  # Mark as most recently used
+            self.hits += 1
+            return entries[matched][2], similarity, matched
+
+    def store(self, namespace: str, question: str, vector: np.ndarray, value):
+        with self._lock:
+            entries = self._namespaces.setdefault(namespace, OrderedDict())
+            entries[question] = (vector, time.monotonic(), value)
+            entries.move_to_end(question)
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)  # Drop least recently used
+
+    def clear(self):
+        with self._lock:
+            self._namespaces.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": {ns: len(entries) for ns, entries in self._namespaces.items()},
+                "threshold": self.threshold,
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
@@ -18,6 +18,42 @@ from botocore.exceptions import EndpointConnectionError
 
 from ..config import settings
 
+class MultipartUpload:
+    """Streams one object to MinIO part by part (S3 multipart upload)."""
+
+    # S3 requires every part except the last to be at least 5 MB
+    PART_SIZE = 8 * 1024 * 1024
+
+    def __init__(self, s3, bucket: str, object_name: str, content_type: str | None = None):
+        self.s3 = s3
+        self.bucket = bucket
+        self.object_name = object_name
+        extra = {"ContentType": content_type} if content_type else {}
+        response = self.s3.create_multipart_upload(Bucket=bucket, Key=object_name, **extra)
+        self.upload_id = response["UploadId"]
+        self.parts = []
+
+    def upload_part(self, data: bytes):
+        part_number = len(self.parts) + 1
+        response = self.s3.upload_part(
+            Bucket=self.bucket, Key=self.object_name,
+            PartNumber=part_number, UploadId=self.upload_id, Body=data,
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+    def complete(self):
+        if not self.parts:
+            self.upload_part(b"")  # An empty file still needs one part
+        self.s3.complete_multipart_upload(
+            Bucket=self.bucket, Key=self.object_name, UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+        print(f" Upload successful: {self.object_name} ({len(self.parts)} part(s))")
+
+    def abort(self):
+        self.s3.abort_multipart_upload(Bucket=self.bucket, Key=self.object_name, UploadId=self.upload_id)
+
+
 class StorageService:
     def __init__(self):
         # Initialize the S3 Client
@@ -50,6 +86,11 @@ class StorageService:
         self.s3.upload_file(file_path, self.bucket, object_name)
         print(f" Upload successful: {object_name}")
 
+    def start_multipart_upload(self, object_name: str, content_type: str | None = None) -> MultipartUpload:
+        """Starts a part-by-part upload, for streaming a file while it is still arriving."""
+        print(f" Streaming {object_name} to MinIO...")
+        return MultipartUpload(self.s3, self.bucket, object_name, content_type)
+
     def download_file(self, object_name: str, download_path: str):
         """Downloads a file from MinIO to local disk."""
         self.s3.download_file(self.bucket, object_name, download_path)
@@ -0,0 +1,122 @@
+import contextvars
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from llama_index.core.callbacks import CBEventType
+from llama_index.core.callbacks.base_handler import BaseCallbackHandler
+
+# The timer for the request currently running in this thread / context.
+# Worker threads that help with a request (e.g. hybrid retrieval branches) must
+# run inside a copy of the caller's context to record into the same timer.
+_current_timer = contextvars.ContextVar("neurospace_stage_timer", default=None)
+
+
+class StageTimer:
+    """Collects per-stage durations (ms) for one /chat request."""
+
+    def __init__(self):
+        self.timings = {}
+        self.phase = None  # "retrieval" or "synthesis" — used to attribute LLM calls
+        self._lock = threading.Lock()
+        self._open = {}
+
+    def add(self, stage: str, elapsed_ms: float):
+        with self._lock:
+            self.timings[stage] = round(self.timings.get(stage, 0.0) + elapsed_ms, 1)
+
+    def start(self, key):
+        with self._lock:
+            self._open[key] = time.perf_counter()
+
+    def stop(self, key, stage: str):
+        with self._lock:
+            started = self._open.pop(key, None)
+        if started is not None:
+            self.add(stage, (time.perf_counter() - started) * 1000)
+
+
+def start_request_timer() -> StageTimer:
+    timer = StageTimer()
+    _current_timer.set(timer)
+    return timer
+
+
+def current_timer() -> StageTimer | None:
+    return _current_timer.get()
+
+
+@contextmanager
+def stage(name: str):
+    """Times the block into the current request's timer (no-op outside a request)."""
+    timer = _current_timer.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timer is not None:
+            timer.add(name, (time.perf_counter() - start) * 1000)
+
+
+class LLMTimingHandler(BaseCallbackHandler):
+    """
+    LlamaIndex callback handler that times LLM calls made during answer synthesis.
+    Lets us split synthesis into prompt assembly and the LLM call itself.
+    """
+
+    def __init__(self):
+        super().__init__(event_starts_to_ignore=[], event_ends_to_ignore=[])
+
+    def on_event_start(self, event_type, payload=None, event_id: str = "", parent_id: str = "", **kwargs):
+        timer = _current_timer.get()
+        if event_type == CBEventType.LLM and timer is not None and timer.phase == "synthesis":
+            timer.start(("llm", event_id))
+        return event_id
+
+    def on_event_end(self, event_type, payload=None, event_id: str = "", **kwargs):
+        timer = _current_timer.get()
+        if event_type == CBEventType.LLM and timer is not None:
+            timer.stop(("llm", event_id), "llm_synthesis")
+
+    def start_trace(self, trace_id=None):
+        pass
+
+    def end_trace(self, trace_id=None, trace_map=None):
+        pass
+
+
+class TimingStats:
+    """Keeps the most recent stage timings per mode and reports p50/p95."""
+
+    def __init__(self, window: int = 500):
+        self._samples = defaultdict(lambda: defaultdict(lambda: deque(maxlen=window)))
+        self._lock = threading.Lock()
+
+    def record(self, mode: str, timings: dict):
+        with self._lock:
+            for stage_name, elapsed_ms in timings.items():
+                self._samples[mode][stage_name].append(elapsed_ms)
+
+    @staticmethod
+    def _percentile(ordered: list, pct: float) -> float:
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> dict:
+        with self._lock:
+            result = {}
+            for mode, stages in self._samples.items():
+                result[mode] = {}
+                for stage_name, samples in stages.items():
+                    ordered = sorted(samples)
+                    result[mode][stage_name] = {
+                        "count": len(ordered),
+                        "p50_ms": self._percentile(ordered, 50),
+                        "p95_ms": self._percentile(ordered, 95),
+                    }
+            return result
+
+
+# Singleton — shared by the query service and the /timings endpoint
+timing_stats = TimingStats()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from ..config import settings
+from ..schemas import TranscriptSegment
+
+
+# Whisper emits short segments (2-5 s, a dozen words). Sent one by one, every
+# segment costs its own graph extraction call with almost no context.
+# This class merges consecutive segments into windows bounded by a token and a
+# duration budget, repeating the last few seconds of each window at the start
+# of the next so facts spanning a boundary stay together. Every chunk keeps the
+# start/end of the segments it covers, so citations still point at the video.
+class TranscriptChunker:
+    def __init__(self, max_tokens: int = 400, max_seconds: float = 120, overlap_seconds: float = 10):
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.overlap_seconds = overlap_seconds
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        # ~4 characters per token, the same estimate the extraction limiter starts from
+        return max(1, len(text) // 4)
+
+    def _fits(self, window: list[TranscriptSegment], segment: TranscriptSegment) -> bool:
+        if not window:
+            return True
+        tokens = sum(self.estimate_tokens(s.text) for s in window) + self.estimate_tokens(segment.text)
+        duration = segment.end - window[0].start
+        return tokens <= self.max_tokens and duration <= self.max_seconds
+
+    def _overlap(self, window: list[TranscriptSegment]) -> list[TranscriptSegment]:
+        """Trailing segments of `window` within overlap_seconds of its end (never the whole window)."""
+        if self.overlap_seconds <= 0 or len(window) < 2:
+            return []
+        tail = []
+        for segment in reversed(window[1:]):
+            if window[-1].end - segment.start > self.overlap_seconds:
+                break
+            tail.insert(0, segment)
+        return tail
+
+    @staticmethod
+    def _to_chunk(window: list[TranscriptSegment]) -> dict:
+        return {
+            "text": " ".join(s.text for s in window if s.text),
+            "start": round(window[0].start, 2),
+            "end": round(window[-1].end, 2),
+        }
+
+    def chunk(self, segments: list[TranscriptSegment]) -> list[dict]:
+        """Merges segments into {"text", "start", "end"} chunks for graph extraction."""
+        chunks = []
+        window: list[TranscriptSegment] = []
+        new_in_window = 0  # Segments not carried over from the previous window
+
+        for segment in segments:
+            if not segment.text:
+                continue
+            if not self._fits(window, segment) and new_in_window:
+                chunks.append(self._to_chunk(window))
+                window = self._overlap(window)
+                new_in_window = 0
+                # Drop overlap that would leave no room for the new segment
+                while window and not self._fits(window, segment):
+                    window.pop(0)
+            window.append(segment)
+            new_in_window += 1
+
+        if new_in_window:
+            chunks.append(self._to_chunk(window))
+        return chunks
+
+    @staticmethod
+    def calls_per_hour(chunk_count: int, duration_s: float) -> float:
+        """Graph extraction calls (one per chunk) per hour of video."""
+        return chunk_count / (duration_s / 3600) if duration_s else 0.0
+
+
+# Singleton instance
+transcript_chunker = TranscriptChunker(
+    max_tokens=settings.TRANSCRIPT_CHUNK_TOKENS,
+    max_seconds=settings.TRANSCRIPT_CHUNK_SECONDS,
+    overlap_seconds=settings.TRANSCRIPT_CHUNK_OVERLAP_SECONDS,
+)
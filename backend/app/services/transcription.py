@@ -1,59 +1,273 @@
 from __future__ import annotations
 
+import gc
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
-from faster_whisper import WhisperModel
+import numpy as np
 
+from ..config import settings
 from ..schemas import TranscriptSegment, TranscriptionResult
 
+SAMPLE_RATE = 16000  # Whisper works on 16 kHz mono audio
+
 
 # This service class encapsulates the logic for transcribing audio files using the Faster-Whisper model.
+# The model is loaded on the first transcription (not at import) and unloaded again
+# after `idle_unload_s` seconds without use, so API processes that never see a video
+# never pay for Whisper.
 class Transcriber:
     def __init__(
         self,
         model_size: str = "base",   # Options: tiny, base, small, medium, large
         device: str = "cpu",        # Options: cpu, cuda
         compute_type: str = "int8", # Options: int8, float16 (if using CUDA)
+        workers: int = 1,           # Parallel windows in transcribe_chunked (1 = single pass)
+        idle_unload_s: float = 0,   # Unload after this many idle seconds (0 = keep loaded)
     ):
         self.model_size = model_size 
         self.device = device
         self.compute_type = compute_type
+        self.workers = max(1, workers)
+        self.idle_unload_s = idle_unload_s
+
+        self._model = None
+        self._lock = threading.Lock()
+        # Loads run outside the lock (status() must never wait on one); other
+        # callers wait on this condition until the loading thread publishes the model
+        self._loading = False
+        self._load_done = threading.Condition(self._lock)
+        self._active = 0          # Transcriptions currently using the model
+        self._last_used = None    # time.monotonic() of the last release
+        self._unload_timer = None
+        self.load_seconds = None  # How long the last load took
 
-        print(f"Loading Whisper Model ({self.model_size})... this might take a minute...")
+    def _load_model(self):
+        # Imported here so importing this module stays cheap
+        from faster_whisper import WhisperModel
+
+        print(f"Loading Whisper Model ({self.model_size}, {self.compute_type})... this might take a minute...")
+        start_time = time.perf_counter()
         # Loads the AI model to memory. 
-        self.model = WhisperModel(
+        # num_workers > 1 keeps one model replica per worker so windows transcribed
+        # from different threads run truly in parallel; CPU cores are split between them.
+        cpu_threads = max(1, (os.cpu_count() or 1) // self.workers) if self.workers > 1 else 0
+        model = WhisperModel(
             self.model_size, 
             device=self.device,     # Runs on CPU
-            compute_type=self.compute_type)
-        print("Whisper Model Loaded!")
+            compute_type=self.compute_type,
+            num_workers=self.workers,
+            cpu_threads=cpu_threads)
+        self.load_seconds = time.perf_counter() - start_time
+        print(f"Whisper Model Loaded in {self.load_seconds:.1f}s!")
+        return model
+
+    @contextmanager
+    def _using_model(self):
+        """Loads the model if needed and holds it for the block; concurrent jobs share one copy."""
+        with self._lock:
+            if self._unload_timer is not None:
+                self._unload_timer.cancel()
+                self._unload_timer = None
+            while self._model is None and self._loading:
+                self._load_done.wait()  # Releases the lock while another thread loads
+            model = self._model
+            if model is not None:
+                self._active += 1
+            else:
+                self._loading = True
+
+        if model is None:
+            try:
+                model = self._load_model()
+            finally:
+                with self._lock:
+                    self._loading = False
+                    if model is not None:
+                        self._model = model
+                        self._active += 1
+                    self._load_done.notify_all()
+        try:
+            yield model
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._last_used = time.monotonic()
+                if self._active == 0 and self.idle_unload_s > 0:
+                    self._unload_timer = threading.Timer(self.idle_unload_s, self._unload_if_idle)
+                    self._unload_timer.daemon = True
+                    self._unload_timer.start()
+
+    def _unload_if_idle(self):
+        with self._lock:
+            if self._model is None or self._active:
+                return
+            if time.monotonic() - self._last_used < self.idle_unload_s:
+                return
+            self._model = None
+            self._unload_timer = None
+        gc.collect()
+        print(f"Whisper Model unloaded after {self.idle_unload_s:.0f}s idle.")
+
+    def load(self):
+        """Loads the model now (warm-up); the idle timer still applies afterwards."""
+        with self._using_model():
+            pass
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def status(self) -> dict:
+        with self._lock:
+            idle_s = time.monotonic() - self._last_used if self._last_used and not self._active else None
+            return {
+                "loaded": self._model is not None,
+                "loading": self._loading,
+                "model_size": self.model_size,
+                "compute_type": self.compute_type,
+                "device": self.device,
+                "active_jobs": self._active,
+                "idle_s": round(idle_s, 1) if idle_s is not None else None,
+                "idle_unload_s": self.idle_unload_s,
+                "load_seconds": round(self.load_seconds, 2) if self.load_seconds else None,
+            }
 
     # Transcribe the given audio file and return structured results.
-    def transcribe(self, audio_path: str) -> TranscriptionResult:   # Takes the path to an audio file and returns a structured transcription result.
-        if not os.path.exists(audio_path):
+    # `audio_path` may also be a 16 kHz mono float32 NumPy array (e.g. piped from ffmpeg); `name` labels it.
+    def transcribe(self, audio_path: str | np.ndarray, name: str | None = None) -> TranscriptionResult:   # Takes the path to an audio file and returns a structured transcription result.
+        if isinstance(audio_path, str) and not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-        print(f"Transcribing {audio_path}...")  
-        segments, info = self.model.transcribe(audio_path, beam_size=5) # Transcribe the audio file and get segments and language info.
-
-        result_segments = []
-        for segment in segments:
-            print(f"[{segment.start:.2f}s -> {segment.end:.2f}s] {segment.text}")
-            result_segments.append(
-                TranscriptSegment(
-                    start=float(segment.start),
-                    end=float(segment.end),
-                    text=(segment.text or "").strip(),
+        if self.workers > 1:
+            return self.transcribe_chunked(audio_path, name=name)
+
+        name = name or (os.path.basename(audio_path) if isinstance(audio_path, str) else "audio buffer")
+        with self._using_model() as model:
+            print(f"Transcribing {name}...")  
+            start_time = time.perf_counter()
+            segments, info = model.transcribe(audio_path, beam_size=5) # Transcribe the audio file and get segments and language info.
+
+            result_segments = []
+            for segment in segments:
+                print(f"[{segment.start:.2f}s -> {segment.end:.2f}s] {segment.text}")
+                result_segments.append(
+                    TranscriptSegment(
+                        start=float(segment.start),
+                        end=float(segment.end),
+                        text=(segment.text or "").strip(),
+                    )
                 )
-            )
 
+        self._log_real_time_factor(info.duration, time.perf_counter() - start_time, workers=1)
         return TranscriptionResult(
-            filename=os.path.basename(audio_path),
+            filename=name,
             segments=result_segments,
             language=info.language,
         )
 
+    @staticmethod
+    def _log_real_time_factor(audio_s: float, elapsed_s: float, workers: int):
+        rtf = elapsed_s / audio_s if audio_s else 0.0
+        print(f"Transcribed {audio_s:.0f}s of audio in {elapsed_s:.1f}s "
+              f"(real-time factor {rtf:.2f}, workers={workers})")
+
+    @staticmethod
+    def _split_at_silences(audio: np.ndarray, window_s: float) -> list[tuple[int, int]]:
+        """
+        Cuts the audio into contiguous windows of at most ~window_s seconds.
+        Cuts are placed in the middle of silences found by Silero VAD, so no word is
+        split between windows. A single speech run longer than window_s stays whole.
+        Returns [(start_sample, end_sample), ...] covering the whole audio.
+        """
+        max_samples = int(window_s * SAMPLE_RATE)
+        if len(audio) <= max_samples:
+            return [(0, len(audio))]
+
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+        windows = []
+        window_start = 0
+        for previous, current in zip(speech, speech[1:]):
+            # Cut in the silence between two speech runs once the window would overflow
+            if current["end"] - window_start > max_samples:
+                cut = (previous["end"] + current["start"]) // 2
+                if cut > window_start:
+                    windows.append((window_start, cut))
+                    window_start = cut
+        windows.append((window_start, len(audio)))
+        return windows
+
+    @staticmethod
+    def _transcribe_window(model, audio: np.ndarray, start: int, end: int, language: str):
+        """Transcribes one window; segment times are shifted to the whole file's timeline."""
+        offset = start / SAMPLE_RATE
+        segments, _ = model.transcribe(audio[start:end], beam_size=5, language=language)
+        return [
+            TranscriptSegment(
+                start=float(segment.start) + offset,
+                end=float(segment.end) + offset,
+                text=(segment.text or "").strip(),
+            )
+            for segment in segments
+        ]
+
+    def transcribe_chunked(self, audio, workers: int | None = None, window_s: float | None = None,
+                           name: str | None = None) -> TranscriptionResult:
+        """
+        Long-audio mode: splits the audio at VAD-detected silences into windows of
+        about TRANSCRIBE_WINDOW_SECONDS, transcribes the windows on parallel
+        threads (each on its own model replica, see num_workers), and stitches the
+        segments back together in order with absolute timestamps.
+
+        `audio` is a file path or a 16 kHz mono float32 NumPy array.
+        The language is detected once up front so every window uses the same one.
+        """
+        workers = max(1, workers or self.workers)
+        window_s = window_s or settings.TRANSCRIBE_WINDOW_SECONDS
+        name = name or (os.path.basename(audio) if isinstance(audio, str) else "audio buffer")
+        if isinstance(audio, str):
+            if not os.path.exists(audio):
+                raise FileNotFoundError(f"Audio file not found: {audio}")
+            from faster_whisper import decode_audio
+            audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+        with self._using_model() as model:
+            start_time = time.perf_counter()
+            duration_s = len(audio) / SAMPLE_RATE
+            windows = self._split_at_silences(audio, window_s)
+            language, _, _ = model.detect_language(audio[: 30 * SAMPLE_RATE])
+            print(f"Transcribing {name} ({duration_s:.0f}s) in {len(windows)} window(s), "
+                  f"language={language}, workers={workers}...")
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="neurospace-whisper") as pool:
+                futures = [pool.submit(self._transcribe_window, model, audio, start, end, language)
+                           for start, end in windows]
+                result_segments = []
+                for future in futures:
+                    for segment in future.result():
+                        print(f"[{segment.start:.2f}s -> {segment.end:.2f}s] {segment.text}")
+                        result_segments.append(segment)
+
+        self._log_real_time_factor(duration_s, time.perf_counter() - start_time, workers)
+        return TranscriptionResult(
+            filename=name,
+            segments=result_segments,
+            language=language,
+        )
+
 
-transcriber = Transcriber(model_size="small")     # Singleton instance of the Transcriber class that can be imported and used throughout the application.
+transcriber = Transcriber(
+    model_size=settings.WHISPER_MODEL_SIZE,
+    device=settings.WHISPER_DEVICE,
+    compute_type=settings.WHISPER_COMPUTE_TYPE,
+    workers=settings.TRANSCRIBE_WORKERS,
+    idle_unload_s=settings.WHISPER_IDLE_UNLOAD_SECONDS,
+)     # Singleton instance of the Transcriber class that can be imported and used throughout the application.
 
 # Audio file --> Whisper AI --> [segment1, segment2, ...] --> JSON transcript
 
@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from dataclasses import dataclass
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services.storage import MultipartUpload, get_storage
+
+READ_SIZE = 1024 * 1024  # 1 MB per read from the request
+
+
+@dataclass
+class SpooledUpload:
+    path: str                          # Unique spool file on local disk
+    content_hash: str                  # SHA-256 of the whole file
+    size: int                          # Bytes received
+    multipart: MultipartUpload | None  # In-progress MinIO upload (None if MinIO was unavailable)
+    elapsed_s: float
+
+    @property
+    def throughput_mb_s(self) -> float:
+        return self.size / (1024 * 1024) / self.elapsed_s if self.elapsed_s else 0.0
+
+
+def _write_and_hash(buffer, hasher, chunk: bytes):
+    hasher.update(chunk)
+    buffer.write(chunk)
+
+
+async def spool_upload(file: UploadFile, object_name: str) -> SpooledUpload:
+    """
+    Copies an upload to a unique spool file while hashing it and streaming it to
+    MinIO as a multipart upload. All disk, hashing and S3 work runs in the thread
+    pool, so the event loop is never blocked by a large file.
+
+    The multipart upload is left open: the caller completes it (new content) or
+    aborts it (duplicate content) once the hash is known. If the upload fails
+    (client disconnect, disk full, ...) the multipart upload is aborted and the
+    spool file removed before the error propagates.
+    """
+    os.makedirs(settings.UPLOAD_SPOOL_DIR, exist_ok=True)
+    spool_path = os.path.join(
+        settings.UPLOAD_SPOOL_DIR, f"{uuid.uuid4().hex}_{os.path.basename(file.filename)}"
+    )
+
+    start = time.perf_counter()
+    try:
+        storage = await run_in_threadpool(get_storage)
+        multipart = await run_in_threadpool(storage.start_multipart_upload, file.filename, file.content_type)
+    except Exception as e:
+        print(f" MinIO streaming unavailable (the job will upload later): {e}")
+        multipart = None
+
+    hasher = hashlib.sha256()
+    size = 0
+    part_buffer = bytearray()
+    pending_part = None  # At most one part upload in flight while we keep reading
+
+    async def send_part(data: bytes):
+        nonlocal multipart, pending_part
+        if pending_part is not None:
+            try:
+                await pending_part
+            except Exception as e:
+                print(f" MinIO part upload failed (the job will upload later): {e}")
+                await run_in_threadpool(abort_quietly, multipart)
+                multipart = None
+            pending_part = None
+        if multipart is not None and data:
+            pending_part = asyncio.ensure_future(run_in_threadpool(multipart.upload_part, data))
+
+    try:
+        with open(spool_path, "wb") as buffer:
+            while chunk := await file.read(READ_SIZE):
+                await run_in_threadpool(_write_and_hash, buffer, hasher, chunk)
+                size += len(chunk)
+                if multipart is not None:
+                    part_buffer.extend(chunk)
+                    if len(part_buffer) >= MultipartUpload.PART_SIZE:
+                        data = bytes(part_buffer)
+                        part_buffer.clear()
+                        await send_part(data)
+
+        # Flush the last (possibly short) part and wait for the one in flight
+        await send_part(bytes(part_buffer))
+        await send_part(b"")
+    except BaseException:  # Also a cancelled request
+        if pending_part is not None:
+            await asyncio.gather(pending_part, return_exceptions=True)
+        await run_in_threadpool(abort_quietly, multipart)
+        if os.path.exists(spool_path):
+            os.remove(spool_path)
+        raise
+
+    return SpooledUpload(
+        path=spool_path,
+        content_hash=hasher.hexdigest(),
+        size=size,
+        multipart=multipart,
+        elapsed_s=time.perf_counter() - start,
+    )
+
+
+def abort_quietly(multipart: MultipartUpload | None):
+    if multipart is None:
+        return
+    try:
+        multipart.abort()
+    except Exception as e:
+        print(f" Could not abort MinIO upload: {e}")
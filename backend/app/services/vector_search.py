@@ -1,10 +1,13 @@
 from app.database import db
-from app.services.llm_factory import llm_factory
+from app.services.embedding_batcher import embedding_batcher
 
 # Vector Search Service
 class VectorSearchService:
-    def __init__(self):
-        self.embed_model = llm_factory.embed_model
+    @property
+    def embed_model(self):
+        # Shared micro-batcher: batched with concurrent /chat embeddings, and the
+        # embedding model itself is only loaded on first use
+        return embedding_batcher
 
     def search_similar_chunks(self, query: str, limit: int = 3):
         """
@@ -2,14 +2,34 @@ import subprocess
 import os
 import shutil
 
+import numpy as np
+
 from ..config import settings
 
+PCM_SAMPLE_RATE = 16000  # What Whisper expects: 16 kHz mono
+
+
+def disk_io_bytes() -> tuple[int, int] | None:
+    """
+    (read_bytes, write_bytes) that hit the disk for this process plus its
+    finished child processes (ffmpeg), or None where the OS doesn't expose it.
+    Linux only: /proc/self/io for this process, getrusage block counts for children.
+    """
+    try:
+        import resource
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(": ") for line in f.read().splitlines())
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return (
+            int(counters["read_bytes"]) + children.ru_inblock * 512,
+            int(counters["write_bytes"]) + children.ru_oublock * 512,
+        )
+    except (ImportError, OSError, KeyError, ValueError):
+        return None
+
+
 class VideoProcessor:
-    def extract_audio(self, video_path: str, output_path: str) -> str:
-        """
-        Uses FFmpeg to strip audio from a video file.
-        Returns the path to the audio file.
-        """
+    def _ffmpeg(self, video_path: str) -> str:
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
@@ -19,6 +39,53 @@ class VideoProcessor:
                 "ffmpeg executable not found. Install ffmpeg and add it to PATH, "
                 "or set FFMPEG_PATH to the full path of ffmpeg.exe."
             )
+        return ffmpeg_exe
+
+    def extract_pcm(self, video_path: str) -> np.ndarray:
+        """
+        Uses FFmpeg to decode the audio track straight to 16 kHz mono PCM on stdout.
+        Returns it as a float32 NumPy array in [-1, 1], ready for Whisper, without
+        an intermediate audio file (1 hour of audio is ~230 MB as float32).
+        """
+        ffmpeg_exe = self._ffmpeg(video_path)
+        print(f" Decoding audio from {video_path} to 16 kHz PCM...")
+
+        # -vn : Drop the video stream
+        # -ac 1 -ar 16000 : Downmix to mono, resample to 16 kHz
+        # -f s16le : Raw signed 16-bit little-endian samples, no container
+        command = [
+            ffmpeg_exe,
+            "-nostdin",
+            "-i", video_path,
+            "-vn",
+            "-ac", "1",
+            "-ar", str(PCM_SAMPLE_RATE),
+            "-f", "s16le",
+            "-acodec", "pcm_s16le",
+            "-",
+        ]
+
+        try:
+            result = subprocess.run(
+                command,
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except subprocess.CalledProcessError as e:
+            print(f" FFmpeg failed: {e.stderr.decode()}")
+            raise e
+
+        audio = np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+        print(f" Decoded {len(audio) / PCM_SAMPLE_RATE:.0f}s of audio")
+        return audio
+
+    def extract_audio(self, video_path: str, output_path: str) -> str:
+        """
+        Uses FFmpeg to strip audio from a video file.
+        Returns the path to the audio file.
+        """
+        ffmpeg_exe = self._ffmpeg(video_path)
 
         print(f" Extracting audio from {video_path}...")
 
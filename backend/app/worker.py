@@ -1,52 +1,135 @@
 import os
+import time
+from contextlib import closing
 
-from .services.video import video_processor
+from .config import settings
+from .services.video import disk_io_bytes, video_processor
 from .services.transcription import transcriber
+from .services.transcript_chunker import transcript_chunker
 from .services.pdf import pdf_processor
 from .services.storage import get_storage
 from .services.graph_service import graph_service
 
-def process_file_background(file_path: str, filename: str, content_type: str):
+def _no_progress(stage: str, chunks_done: int | None = None, chunks_total: int | None = None):
+    pass
+
+
+class _counted:
+    """Wraps an iterator and counts the items that have passed through it."""
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self._iterator)
+        self.count += 1
+        return item
+
+
+def process_file_background(file_path: str, filename: str, content_type: str, progress=None,
+                            content_hash: str | None = None, already_uploaded: bool = False):
     """
     This function runs in the background.
-    FastAPI runs sync background tasks in a thread pool,
+    The ingestion job queue runs it on a worker thread,
     giving LlamaIndex its own thread for async I/O.
+
+    `progress(stage, chunks_done=None, chunks_total=None)` reports status back to the job.
+    `content_hash` (SHA-256 of the upload) is recorded on the Document once ingestion finishes.
+    `already_uploaded` skips the MinIO upload when /ingest already streamed the file there.
+    Failures are re-raised so the job is marked failed.
     """
+    progress = progress or _no_progress
     print(f" Background Task Started for: {filename}")
 
-    uploaded_to_minio = False
+    uploaded_to_minio = already_uploaded
     audio_path: str | None = None
     
     try:
-        # 1. Upload raw file to MinIO (Backup)
+        # 1. Upload raw file to MinIO (Backup), unless /ingest already streamed it there
         # If MinIO isn't running locally, don't block the rest of the pipeline.
-        try:
-            storage = get_storage()
-            storage.upload_file(file_path, filename)
-            uploaded_to_minio = True
-        except Exception as e:
-            print(f" MinIO upload failed (will retry after processing): {str(e)}")
+        if not uploaded_to_minio:
+            progress("uploading")
+            try:
+                storage = get_storage()
+                storage.upload_file(file_path, filename)
+                uploaded_to_minio = True
+            except Exception as e:
+                print(f" MinIO upload failed (will retry after processing): {str(e)}")
         
         extracted_text_chunks = []
+        streamed_chunks = 0
+        chunk_counts = {}
 
         # 2. Determine Pipeline
         if "video" in content_type:
-            print(" Running Video Pipeline...")
+            print(f" Running Video Pipeline (audio mode: {settings.AUDIO_EXTRACTION})...")
+            pipeline_start = time.perf_counter()
+            io_before = disk_io_bytes()
             
             # A. Extract Audio
-            audio_path = file_path.replace(".mp4", ".mp3")
-            video_processor.extract_audio(file_path, audio_path)
+            progress("extracting_audio")
+            if settings.AUDIO_EXTRACTION == "pcm":
+                # Raw 16 kHz mono PCM piped from ffmpeg: no MP3 encode, no temp file
+                audio = video_processor.extract_pcm(file_path)
+            else:
+                audio_path = file_path.replace(".mp4", ".mp3")
+                audio = video_processor.extract_audio(file_path, audio_path)
+            extract_s = time.perf_counter() - pipeline_start
             
             # B. Transcribe
-            result = transcriber.transcribe(audio_path)
+            progress("transcribing")
+            result = transcriber.transcribe(audio, name=filename)
+            del audio
+            transcribe_s = time.perf_counter() - pipeline_start - extract_s
+
+            io_after = disk_io_bytes()
+            io_report = ""
+            if io_before and io_after:
+                io_report = (f", disk read {(io_after[0] - io_before[0]) / 1e6:.1f} MB"
+                             f" / written {(io_after[1] - io_before[1]) / 1e6:.1f} MB")
+            print(f" Video pipeline: audio extraction {extract_s:.1f}s, transcription {transcribe_s:.1f}s"
+                  f"{io_report}")
             
             # Extract the text and timestamps from the video segments
-            extracted_text_chunks = [{"text": seg.text, "start": round(seg.start, 2), "end": round(seg.end, 2)} for seg in result.segments]
-            print(f" Video Processed! Found {len(result.segments)} segments.")
+            if settings.TRANSCRIPT_CHUNKING:
+                # Merge short segments so each extraction call sees a useful amount of context
+                extracted_text_chunks = transcript_chunker.chunk(result.segments)
+            else:
+                extracted_text_chunks = [{"text": seg.text, "start": round(seg.start, 2), "end": round(seg.end, 2)} for seg in result.segments]
+            duration_s = result.segments[-1].end if result.segments else 0.0
+            print(f" Video Processed! Found {len(result.segments)} segments → {len(extracted_text_chunks)} chunks "
+                  f"(LLM extraction calls per video hour: "
+                  f"{transcript_chunker.calls_per_hour(len(result.segments), duration_s):.0f} per segment → "
+                  f"{transcript_chunker.calls_per_hour(len(extracted_text_chunks), duration_s):.0f}).")
             
+        elif "pdf" in content_type and settings.PDF_STREAMING:
+            # --- STREAMING PDF PIPELINE ---
+            # Pages are parsed on a producer thread while the graph engine extracts,
+            # so the first chunks reach Neo4j before parsing finishes. The job's
+            # chunks_total stays null until the producer has parsed the last page.
+            print(" Running PDF Pipeline (streaming)...")
+            progress("building_graph", chunks_done=0)
+            # closing(): if extraction raises mid-stream, the producer thread, its
+            # process pool and the open PDF are released now, not whenever the
+            # traceback (which holds the suspended generator) is collected
+            with closing(pdf_processor.stream_chunks(
+                file_path, on_total=lambda total: progress("building_graph", chunks_total=total),
+            )) as chunks:
+                streamed = _counted(
+                    {"text": chunk.text, "page_number": chunk.page_number} for chunk in chunks
+                )
+                graph_service.process_document(streamed, filename, progress=progress, chunk_counts=chunk_counts)
+            print(f" PDF Processed! Streamed {streamed.count} chunks.")
+            streamed_chunks = streamed.count
+
         elif "pdf" in content_type:
             # --- PDF PIPELINE ---
             print(" Running PDF Pipeline...")
+            progress("parsing_pdf")
             result = pdf_processor.process_pdf(file_path)
             
             # Extract the text and page numbers from the PDF chunks
@@ -59,10 +142,18 @@ def process_file_background(file_path: str, filename: str, content_type: str):
         # 3. BUILD GRAPH (Entity Extraction)
         if extracted_text_chunks:
             print(f" Sending {len(extracted_text_chunks)} chunks to Graph Engine...")
-            graph_service.process_document(extracted_text_chunks, filename)
+            progress("building_graph", chunks_done=0, chunks_total=len(extracted_text_chunks))
+            graph_service.process_document(extracted_text_chunks, filename, progress=progress,
+                                           chunk_counts=chunk_counts)
+
+        # 4. Index the file content so identical re-uploads are aliased, not re-extracted.
+        # Not while chunks are missing: a re-upload must be able to resume them.
+        if content_hash and (extracted_text_chunks or streamed_chunks) and not chunk_counts.get("failed"):
+            graph_service.register_content_hash(filename, content_hash)
 
     except Exception as e:
         print(f" Background Task Failed: {str(e)}")
+        raise
     
     finally:
         # If MinIO upload failed at the start, retry once before deleting temp files.
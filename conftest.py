@@ -0,0 +1,59 @@
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+
+@pytest.fixture
+def query_service(monkeypatch):
+    """
+    A real QueryService over an in-memory property graph (Rag -USES-> Retrieval),
+    with a fake Groq LLM and mock embeddings. No Neo4j, network or API key needed.
+    """
+    from llama_index.core import StorageContext
+    from llama_index.core.base.llms.types import CompletionResponse, LLMMetadata
+    from llama_index.core.embeddings import MockEmbedding
+    from llama_index.core.graph_stores import SimplePropertyGraphStore
+    from llama_index.core.graph_stores.types import EntityNode, Relation
+    from llama_index.core.llms import CustomLLM
+    from llama_index.core.llms.callbacks import llm_completion_callback
+
+    from app.services import query_engine as query_engine_module
+    from app.services.embedding_batcher import EmbeddingBatcher
+
+    class FakeGroq(CustomLLM):
+        """Answers the synonym prompt with one keyword and everything else with a cited answer."""
+
+        @property
+        def metadata(self) -> LLMMetadata:
+            return LLMMetadata()
+
+        @llm_completion_callback()
+        def complete(self, prompt: str, formatted: bool = False, **kwargs) -> CompletionResponse:
+            if "KEYWORDS:" in prompt:
+                return CompletionResponse(text="rag")
+            return CompletionResponse(text="RAG retrieves context [notes.pdf, page 1].")
+
+        @llm_completion_callback()
+        def stream_complete(self, prompt: str, formatted: bool = False, **kwargs):
+            yield self.complete(prompt, formatted=formatted, **kwargs)
+
+    graph_store = SimplePropertyGraphStore()
+    rag = EntityNode(name="Rag", label="CONCEPT")
+    retrieval = EntityNode(name="Retrieval", label="CONCEPT")
+    graph_store.upsert_nodes([rag, retrieval])
+    graph_store.upsert_relations([Relation(label="USES", source_id=rag.id, target_id=retrieval.id)])
+
+    embed_model = MockEmbedding(embed_dim=8)
+    fake_factory = SimpleNamespace(
+        llm=FakeGroq(),
+        embed_model=embed_model,
+        get_storage_context=lambda: StorageContext.from_defaults(property_graph_store=graph_store),
+    )
+    monkeypatch.setattr(query_engine_module, "llm_factory", fake_factory)
+    monkeypatch.setattr(query_engine_module, "embedding_batcher", EmbeddingBatcher(lambda: embed_model))
+    return query_engine_module.QueryService()
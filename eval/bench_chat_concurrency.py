@@ -0,0 +1,137 @@
+"""
+NeuroSpace Benchmark — /chat Concurrency
+==========================================
+Fires questions at the /chat endpoint from 1, 8 and 32 concurrent clients and
+reports requests per second and latency percentiles for each level.
+
+While the load runs, a probe hits the health endpoint (/) every 100 ms.
+If /chat blocks the event loop, the probe latency climbs with the load.
+
+Usage:
+    1. Ensure backend is running: cd backend && uvicorn app.main:app
+    2. Ensure Neo4j is running with an ingested corpus
+    3. Run: python eval/bench_chat_concurrency.py
+
+Options:
+    --api-url       Backend URL (default: http://localhost:8000)
+    --levels        Concurrent client counts (default: 1 8 32)
+    --requests      Requests per client (default: 4)
+    --mode          Retrieval mode (default: hybrid)
+    --keep-cache    Don't flush the answer cache before each level
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+
+def load_questions() -> list[str]:
+    path = os.path.join(os.path.dirname(__file__), "questions.json")
+    with open(path, "r", encoding="utf-8") as f:
+        return [q["question"] for q in json.load(f)]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def probe_health(api_url: str, stop: threading.Event, samples: list[float]):
+    """Measures health-check latency until `stop` is set."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            requests.get(f"{api_url}/", timeout=30)
+            samples.append((time.perf_counter() - start) * 1000)
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.1)
+
+
+def run_level(api_url: str, clients: int, per_client: int, mode: str, questions: list[str]) -> dict:
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def client(client_id: int):
+        nonlocal errors
+        for i in range(per_client):
+            question = questions[(client_id * per_client + i) % len(questions)]
+            start = time.perf_counter()
+            try:
+                resp = requests.post(f"{api_url}/chat", json={"message": question, "mode": mode}, timeout=300)
+                ok = resp.status_code == 200
+            except requests.exceptions.RequestException:
+                ok = False
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with lock:
+                if ok:
+                    latencies.append(elapsed_ms)
+                else:
+                    errors += 1
+
+    probe_samples = []
+    stop = threading.Event()
+    probe = threading.Thread(target=probe_health, args=(api_url, stop, probe_samples), daemon=True)
+    probe.start()
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(client, range(clients)))
+    wall_s = time.perf_counter() - wall_start
+
+    stop.set()
+    probe.join()
+
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / wall_s, 2) if wall_s else 0.0,
+        "p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 1) if latencies else None,
+        "health_p95_ms": round(percentile(probe_samples, 95), 1) if probe_samples else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/chat concurrency benchmark")
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=4)
+    parser.add_argument("--mode", default="hybrid", choices=["hybrid", "vector_only", "synonym_only"])
+    parser.add_argument("--keep-cache", action="store_true")
+    args = parser.parse_args()
+
+    questions = load_questions()
+    results = []
+    for clients in args.levels:
+        if not args.keep_cache:
+            requests.delete(f"{args.api_url}/clear-cache", timeout=10)
+        print(f"  Running {clients} concurrent client(s)...")
+        results.append(run_level(args.api_url, clients, args.requests, args.mode, questions))
+
+    print(f"\n{'='*72}")
+    print(f"  /chat Concurrency Benchmark (mode={args.mode})")
+    print(f"{'='*72}")
+    print(f"  {'clients':>7} | {'ok':>4} | {'err':>3} | {'req/s':>6} | {'p50 ms':>8} | {'p95 ms':>8} | {'/ p95 ms':>8}")
+    for r in results:
+        print(f"  {r['clients']:>7} | {r['requests']:>4} | {r['errors']:>3} | {r['rps']:>6} | "
+              f"{str(r['p50_ms']):>8} | {str(r['p95_ms']):>8} | {str(r['health_p95_ms']):>8}")
+    print(f"{'='*72}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+NeuroSpace Benchmark — Query Embedding Throughput under Concurrency
+=====================================================================
+Compares two ways of serving concurrent query embeddings (what /chat and
+vector search need):
+  - direct: every caller runs its own get_query_embedding forward pass
+  - micro-batched: callers go through EmbeddingBatcher, which joins requests
+    arriving within EMBED_MICROBATCH_MAX_WAIT_MS into one batched pass
+at 1, 16 and 64 concurrent callers. Reports queries/sec, per-call p50/p95
+latency and the average batch size. Every query text is unique (eval
+questions with a numeric suffix), so the LRU cache is bypassed and only
+batching is measured; the last row repeats the questions to show the cache.
+
+No Neo4j or Groq needed; uses the configured EMBED_BACKEND.
+
+Usage:
+    Run (from backend/): python ../eval/bench_embedding_batching.py
+
+Options:
+    --levels        Concurrent callers to test (default: 1 16 64)
+    --queries       Queries per caller (default: 20)
+    --max-wait-ms   Batching window (default: EMBED_MICROBATCH_MAX_WAIT_MS)
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+# Make the backend `app` package importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.config import settings
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.llm_factory import LLMFactory
+
+QUESTIONS_PATH = os.path.join(os.path.dirname(__file__), "questions.json")
+
+
+def run_callers(embed, texts_per_caller: list[list[str]]) -> tuple[float, list[float]]:
+    """Runs one thread per caller; returns (wall seconds, per-call latencies)."""
+    latencies, lock = [], threading.Lock()
+    barrier = threading.Barrier(len(texts_per_caller) + 1)
+
+    def caller(texts):
+        barrier.wait()
+        own = []
+        for text in texts:
+            start = time.perf_counter()
+            embed(text)
+            own.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=caller, args=(texts,)) for texts in texts_per_caller]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query embedding throughput: direct vs micro-batched")
+    parser.add_argument("--levels", nargs="+", type=int, default=[1, 16, 64])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--max-wait-ms", type=float, default=settings.EMBED_MICROBATCH_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    with open(QUESTIONS_PATH, encoding="utf-8") as f:
+        questions = [q["question"] for q in json.load(f)]
+    model = LLMFactory.create_embed_model()
+    model.get_query_embedding("warm-up")
+
+    def workload(callers: int, unique: bool) -> list[list[str]]:
+        return [[questions[(c * args.queries + i) % len(questions)] + (f" ({c}-{i})" if unique else "")
+                 for i in range(args.queries)] for c in range(callers)]
+
+    rows = []
+    for callers in args.levels:
+        texts = workload(callers, unique=True)
+        wall_s, latencies = run_callers(model.get_query_embedding, texts)
+        rows.append((f"direct, {callers} callers", callers * args.queries / wall_s, latencies, None))
+
+        batcher = EmbeddingBatcher(lambda: model, max_batch_size=settings.EMBED_MICROBATCH_MAX_SIZE,
+                                   max_wait_ms=args.max_wait_ms, cache_size=0)
+        wall_s, latencies = run_callers(batcher.get_query_embedding, texts)
+        rows.append((f"batched, {callers} callers", callers * args.queries / wall_s, latencies,
+                     batcher.stats()["avg_batch_size"]))
+
+    callers = max(args.levels)
+    batcher = EmbeddingBatcher(lambda: model, max_batch_size=settings.EMBED_MICROBATCH_MAX_SIZE,
+                               max_wait_ms=args.max_wait_ms, cache_size=settings.QUERY_EMBED_CACHE_SIZE)
+    wall_s, latencies = run_callers(batcher.get_query_embedding, workload(callers, unique=False))
+    stats = batcher.stats()
+    rows.append((f"batched+LRU, {callers} callers", callers * args.queries / wall_s, latencies,
+                 stats["avg_batch_size"]))
+
+    print(f"\n{'='*78}")
+    print(f"  Query Embedding Throughput — {settings.EMBED_BACKEND}, {args.queries} queries/caller, "
+          f"{args.max_wait_ms:g} ms window")
+    print(f"{'='*78}")
+    print(f"  {'mode':<28} | {'queries/s':>9} | {'p50 ms':>7} | {'p95 ms':>7} | {'avg batch':>9}")
+    for name, qps, latencies, batch in rows:
+        p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+        print(f"  {name:<28} | {qps:>9.1f} | {p50:>7.1f} | {p95:>7.1f} | "
+              f"{f'{batch:.1f}' if batch is not None else '-':>9}")
+    print(f"  (LRU row: {stats['cache_hit_rate']:.0%} cache hits over repeated eval questions)")
+    print(f"{'='*78}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+NeuroSpace Benchmark — Embedding Backends (HuggingFace/torch vs int8 ONNX Runtime)
+====================================================================================
+Runs each embedding backend in its own subprocess (so RSS is not shared) and
+reports, per backend:
+  - model load time and RSS after loading
+  - single-query latency p50/p95 (one question at a time, as /chat embeds)
+  - batch throughput in texts/sec (PDF chunks, EMBED_BATCH_SIZE per call)
+Then compares the ONNX vectors against the torch ones:
+  - mean/min cosine similarity between the two vectors of the same text
+  - recall@k drift: overlap of each question's top-k chunks under both backends
+
+Corpus: chunks of the given PDFs (pdf.py splitter); queries: eval/questions.json.
+No Neo4j or Groq needed. ONNX runs need `pip install onnxruntime`.
+
+Usage:
+    Run (from backend/): python ../eval/bench_embeddings.py --threads 1 4
+
+Options:
+    --pdf           PDFs to embed (default: backend/test_files/Simple RAG.pdf)
+    --threads       ONNX intra-op thread counts to compare (default: 0 = auto)
+    --top-k         k for the recall drift (default: 5)
+    --repeat        Times the corpus is embedded for the throughput figure (default: 3)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+EVAL_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(EVAL_DIR, "..", "backend")
+
+CHILD = r"""
+import json, sys, time
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+with open(sys.argv[1], encoding="utf-8") as f:
+    data = json.load(f)
+queries, chunks, repeat = data["queries"], data["chunks"], data["repeat"]
+
+from app.services.llm_factory import LLMFactory
+out = {"rss_base_mb": rss_mb()}
+start = time.perf_counter()
+model = LLMFactory.create_embed_model()
+model.get_query_embedding("warm-up")
+out["load_s"] = time.perf_counter() - start
+out["rss_loaded_mb"] = rss_mb()
+
+latencies, query_vectors = [], []
+for query in queries:
+    start = time.perf_counter()
+    query_vectors.append(model.get_query_embedding(query))
+    latencies.append(time.perf_counter() - start)
+out["latencies"] = latencies
+
+start = time.perf_counter()
+for _ in range(repeat):
+    chunk_vectors = model.get_text_embedding_batch(chunks)
+out["batch_s"] = (time.perf_counter() - start) / repeat
+out["rss_peak_mb"] = rss_mb()
+
+out["query_vectors"], out["chunk_vectors"] = query_vectors, chunk_vectors
+with open(sys.argv[2], "w", encoding="utf-8") as f:
+    json.dump(out, f)
+"""
+
+
+def load_corpus(pdfs: list[str]) -> list[str]:
+    sys.path.insert(0, BACKEND_DIR)
+    from app.services.pdf import pdf_processor
+
+    return [chunk.text for path in pdfs for chunk in pdf_processor.process_pdf(path, workers=1).chunks]
+
+
+def load_queries() -> list[str]:
+    with open(os.path.join(EVAL_DIR, "questions.json"), encoding="utf-8") as f:
+        return [q["question"] for q in json.load(f)]
+
+
+def run_backend(backend: str, threads: int, payload_path: str) -> dict:
+    env = dict(os.environ, EMBED_BACKEND=backend, EMBED_ONNX_THREADS=str(threads))
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        out_path = f.name
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-c", CHILD, payload_path, out_path],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{backend} run failed:\n{proc.stderr[-2000:]}")
+        with open(out_path, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.unlink(out_path)
+
+
+def top_k(query_vectors, chunk_vectors, k: int) -> list[set]:
+    # Both backends return unit-length vectors, so the dot product is the cosine
+    scores = np.asarray(query_vectors) @ np.asarray(chunk_vectors).T
+    return [set(row) for row in np.argsort(-scores, axis=1)[:, :k]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding backend latency, throughput, memory and drift")
+    parser.add_argument("--pdf", nargs="+", default=[os.path.join(BACKEND_DIR, "test_files", "Simple RAG.pdf")])
+    parser.add_argument("--threads", nargs="+", type=int, default=[0])
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    chunks, queries = load_corpus(args.pdf), load_queries()
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+        json.dump({"queries": queries, "chunks": chunks, "repeat": args.repeat}, f)
+        payload_path = f.name
+
+    try:
+        runs = [("huggingface (torch)", run_backend("huggingface", 0, payload_path))]
+        for threads in args.threads:
+            runs.append((f"onnx int8, {threads or 'auto'} thr", run_backend("onnx", threads, payload_path)))
+    finally:
+        os.unlink(payload_path)
+
+    print(f"\n{'='*88}")
+    print(f"  Embedding Backend Benchmark — {len(chunks)} chunks, {len(queries)} queries")
+    print(f"{'='*88}")
+    print(f"  {'backend':<24} | {'load':>6} | {'p50 ms':>7} | {'p95 ms':>7} | {'texts/s':>8} | "
+          f"{'RSS model':>9} | {'RSS peak':>8}")
+    for name, run in runs:
+        p50, p95 = np.percentile(run["latencies"], [50, 95]) * 1000
+        model_mb = run["rss_loaded_mb"] - run["rss_base_mb"]
+        print(f"  {name:<24} | {run['load_s']:>5.1f}s | {p50:>7.1f} | {p95:>7.1f} | "
+              f"{len(chunks) / run['batch_s']:>8.1f} | {model_mb:>6.0f} MB | {run['rss_peak_mb']:>5.0f} MB")
+
+    reference = runs[0][1]
+    reference_top = top_k(reference["query_vectors"], reference["chunk_vectors"], args.top_k)
+    print(f"{'-'*88}")
+    print(f"  Drift vs torch            | {'mean cos':>8} | {'min cos':>8} | {f'recall@{args.top_k}':>9}")
+    for name, run in runs[1:]:
+        cosines = np.sum(np.asarray(run["chunk_vectors"]) * np.asarray(reference["chunk_vectors"]), axis=1)
+        run_top = top_k(run["query_vectors"], run["chunk_vectors"], args.top_k)
+        recall = np.mean([len(a & b) / len(a) for a, b in zip(reference_top, run_top)])
+        print(f"  {name:<25} | {cosines.mean():>8.4f} | {cosines.min():>8.4f} | {recall:>8.1%}")
+    print(f"{'='*88}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+NeuroSpace Benchmark — Graph Extraction Throughput
+====================================================
+Runs GraphService.process_document on the chunks of one PDF with the
+sequential loop (1 worker) and with N parallel extraction workers, and reports
+chunks/minute for each. Every run goes through the shared Groq token limiter,
+so results reflect the real TPM ceiling.
+
+Each run ingests under a throwaway filename (`__bench_w<N>__<pdf>`) and its
+Document/Chunk nodes are deleted afterwards. Extracted entities are left in place.
+
+Usage:
+    1. Ensure Neo4j is running and GROQ_API_KEY is set in backend/.env
+    2. Run (from backend/): python ../eval/bench_extraction.py --pdf "test_files/Simple RAG.pdf"
+
+Options:
+    --pdf           PDF to extract (default: backend/test_files/Simple RAG.pdf)
+    --workers       Worker counts to compare (default: 1 4)
+    --max-chunks    Only use the first N chunks (default: all)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+# Make the backend `app` package importable
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from app.database import db
+from app.services.graph_service import graph_service
+from app.services.pdf import pdf_processor
+
+
+def cleanup(filename: str):
+    with db.get_session() as session:
+        session.run(
+            "MATCH (c:Chunk) WHERE c.filename = $filename DETACH DELETE c",
+            filename=filename,
+        )
+        session.run("MATCH (d:Document {id: $filename}) DETACH DELETE d", filename=filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Graph extraction throughput benchmark")
+    parser.add_argument("--pdf", default=os.path.join(BACKEND_DIR, "test_files", "Simple RAG.pdf"))
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--max-chunks", type=int, default=None)
+    args = parser.parse_args()
+
+    result = pdf_processor.process_pdf(args.pdf)
+    chunks = [{"text": c.text, "page_number": c.page_number} for c in result.chunks]
+    if args.max_chunks:
+        chunks = chunks[: args.max_chunks]
+
+    db.connect()
+    rows = []
+    try:
+        for workers in args.workers:
+            filename = f"__bench_w{workers}__{os.path.basename(args.pdf)}"
+            cleanup(filename)
+            start = time.perf_counter()
+            graph_service.process_document(chunks, filename, workers=workers)
+            elapsed_s = time.perf_counter() - start
+            rows.append((workers, elapsed_s, len(chunks) / elapsed_s * 60 if elapsed_s else 0.0))
+            cleanup(filename)
+    finally:
+        db.close()
+
+    baseline = rows[0][2] if rows else 0.0
+    print(f"\n{'='*60}")
+    print(f"  Extraction Benchmark — {len(chunks)} chunks from {os.path.basename(args.pdf)}")
+    print(f"{'='*60}")
+    print(f"  {'workers':>7} | {'seconds':>8} | {'chunks/min':>10} | {'speedup':>7}")
+    for workers, elapsed_s, per_minute in rows:
+        speedup = per_minute / baseline if baseline else 0.0
+        print(f"  {workers:>7} | {elapsed_s:>8.1f} | {per_minute:>10.1f} | {speedup:>6.2f}x")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
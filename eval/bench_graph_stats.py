@@ -0,0 +1,146 @@
+"""
+NeuroSpace Benchmark — /stats Latency vs Graph Size
+=====================================================
+Grows a synthetic graph to each requested size and times GraphDB statistics:
+  - legacy: the seven full-graph Cypher scans /stats used to run
+  - count store: get_graph_stats() with an empty cache (count-store query
+    plus the one Chunk-only embedding scan)
+  - cached: get_graph_stats() when the graph version hasn't moved
+  - incremental: record_graph_write(), the per-batch refresh in
+    GRAPH_STATS_MODE=incremental
+
+Synthetic shape per 10 nodes: 1 Chunk (short embedding, skipped by the vector
+index), 9 entities each MENTIONED by it; plus 1 Document per 1,000 chunks.
+Benchmark nodes carry the __BenchStats__ label and are deleted afterwards.
+
+Usage:
+    1. Ensure Neo4j is running (1M nodes needs ~1 GB of free heap/page cache)
+    2. Run (from backend/): python ../eval/bench_graph_stats.py
+
+Options:
+    --sizes         Benchmark node counts to reach, cumulative (default: 10000 100000 1000000)
+    --runs          Timed runs per method (default: 5)
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+# Make the backend `app` package importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.config import settings
+from app.database import db
+
+NODES_PER_UNIT = 10
+UNITS_PER_WRITE = 5000
+
+# GraphDB.get_graph_stats before the count-store rewrite
+LEGACY_QUERIES = [
+    "MATCH (n) RETURN count(n) as total_nodes",
+    "MATCH ()-[r]->() RETURN count(r) as total_relationships",
+    "MATCH (n) UNWIND labels(n) AS label RETURN label, count(*) AS count ORDER BY count DESC",
+    "MATCH ()-[r]->() RETURN type(r) AS rel_type, count(*) AS count ORDER BY count DESC",
+    "MATCH (d:Document) RETURN count(d) as doc_count",
+    "MATCH (c:Chunk) WHERE c.embedding IS NOT NULL RETURN count(c) as vector_count",
+    "MATCH (e) WHERE NOT e:Chunk AND NOT e:Document RETURN count(e) as entity_count",
+]
+
+CREATE_UNITS = (
+    "UNWIND range($start, $end - 1) AS i "
+    "CREATE (c:__BenchStats__:Chunk {id: '__bench_chunk_' + i, embedding: [0.1, 0.2, 0.3, 0.4]}) "
+    "WITH c, i UNWIND range(1, 9) AS j "
+    "CREATE (c)-[:MENTIONS]->(:__BenchStats__:__Entity__ {id: '__bench_entity_' + i + '_' + j})"
+)
+CREATE_DOCUMENTS = (
+    "UNWIND range($start, $end - 1) AS i "
+    "CREATE (:__BenchStats__:Document {id: '__bench_document_' + i})"
+)
+CLEANUP = "MATCH (n:__BenchStats__) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS"
+
+
+def grow_to(units_from: int, units_to: int):
+    with db.get_session() as session:
+        for start in range(units_from, units_to, UNITS_PER_WRITE):
+            session.run(CREATE_UNITS, start=start, end=min(start + UNITS_PER_WRITE, units_to)).consume()
+        session.run(CREATE_DOCUMENTS, start=units_from // 1000, end=units_to // 1000).consume()
+
+
+def time_ms(fn, runs: int) -> float:
+    fn()  # Warm-up (plan cache, page cache)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def legacy_stats():
+    with db.get_session() as session:
+        for query in LEGACY_QUERIES:
+            list(session.run(query))
+
+
+def uncached_stats():
+    db._stats = None
+    db.get_graph_stats()
+
+
+def incremental_refresh():
+    settings.GRAPH_STATS_MODE = "incremental"
+    try:
+        db.record_graph_write(0)
+    finally:
+        settings.GRAPH_STATS_MODE = "cached"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/stats latency vs graph size")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    settings.GRAPH_STATS_MODE = "cached"
+    db.connect()
+    rows = []
+    units = 0
+    try:
+        for size in sorted(args.sizes):
+            target_units = size // NODES_PER_UNIT
+            print(f"  Growing benchmark graph to {size:,} nodes...")
+            grow_to(units, target_units)
+            units = target_units
+            db.bump_graph_version()
+
+            legacy_ms = time_ms(legacy_stats, args.runs)
+            uncached_ms = time_ms(uncached_stats, args.runs)
+            cached_ms = time_ms(db.get_graph_stats, args.runs)
+            incremental_ms = time_ms(incremental_refresh, args.runs)
+            rows.append((db.get_graph_stats()["total_nodes"], legacy_ms, uncached_ms, cached_ms, incremental_ms))
+    finally:
+        print("  Deleting benchmark nodes...")
+        with db.get_session() as session:
+            session.run(CLEANUP).consume()
+        db.bump_graph_version()
+        db.close()
+
+    print(f"\n{'='*80}")
+    print(f"  /stats Latency Benchmark (median of {args.runs} runs, ms)")
+    print(f"{'='*80}")
+    print(f"  {'graph nodes':>12} | {'legacy 7 scans':>14} | {'count store':>11} | {'cached':>8} | "
+          f"{'incremental':>11} | {'speed-up':>8}")
+    for total_nodes, legacy_ms, uncached_ms, cached_ms, incremental_ms in rows:
+        print(f"  {total_nodes:>12,} | {legacy_ms:>14.1f} | {uncached_ms:>11.1f} | {cached_ms:>8.3f} | "
+              f"{incremental_ms:>11.1f} | {legacy_ms / uncached_ms:>7.1f}x")
+    print(f"{'='*80}\n")
+
+
+if __name__ == "__main__":
+    main()
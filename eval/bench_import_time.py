@@ -0,0 +1,110 @@
+"""
+NeuroSpace Benchmark — API Cold Start (Import Profile & Time to Ready)
+========================================================================
+Measures how long a fresh API process takes to come up:
+  1. `import app.main` in a new interpreter with `python -X importtime`,
+     reporting total wall-clock seconds and the slowest top-level packages
+  2. with --serve, starts uvicorn and reports the seconds until the health
+     check (/) answers and until /ready returns 200 (background warm-up done)
+
+Usage:
+    Run (from backend/): python ../eval/bench_import_time.py --serve
+
+Options:
+    --top           Slowest top-level packages to list (default: 15)
+    --serve         Also time uvicorn start-up to / and /ready (needs Neo4j + GROQ_API_KEY)
+    --port          Port for --serve (default: 8099)
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import requests
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+
+def profile_import() -> tuple[float, dict]:
+    """Returns (wall seconds, {top-level package: cumulative seconds})."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    wall_s = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"import app.main failed:\n{proc.stderr[-2000:]}")
+
+    # Lines look like: "import time:      1234 |      56789 | <2 spaces per depth>package.module"
+    # A depth-0 entry carries the cumulative time of its whole import subtree.
+    packages = defaultdict(float)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name[1:].startswith(" "):
+            packages[name.strip().split(".")[0]] += int(cumulative) / 1e6
+    return wall_s, dict(packages)
+
+
+def time_to_ready(port: int, timeout_s: float = 600) -> tuple[float | None, float | None]:
+    """Starts uvicorn; returns seconds until / answers and until /ready is 200."""
+    url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    health_s = ready_s = None
+    try:
+        while time.perf_counter() - start < timeout_s and ready_s is None:
+            try:
+                if health_s is None:
+                    requests.get(f"{url}/", timeout=1)
+                    health_s = time.perf_counter() - start
+                if requests.get(f"{url}/ready", timeout=1).status_code == 200:
+                    ready_s = time.perf_counter() - start
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(0.1)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return health_s, ready_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API cold-start benchmark")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+
+    wall_s, packages = profile_import()
+
+    print(f"\n{'='*60}")
+    print(f"  API Cold-Start Benchmark")
+    print(f"{'='*60}")
+    print(f"  import app.main (fresh interpreter): {wall_s:.2f}s")
+    print(f"  Slowest top-level imports (cumulative):")
+    for name, seconds in sorted(packages.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"    {name:<32} {seconds:>7.3f}s")
+
+    if args.serve:
+        health_s, ready_s = time_to_ready(args.port)
+        print(f"{'-'*60}")
+        print(f"  uvicorn → / answering:  {health_s:.2f}s" if health_s else "  uvicorn → / never answered")
+        print(f"  uvicorn → /ready 200:   {ready_s:.2f}s" if ready_s else "  uvicorn → /ready never became 200")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+NeuroSpace Benchmark — Ingestion Embedding & Neo4j Write Time
+===============================================================
+Compares the per-chunk ingestion path (one embedding forward pass and one set
+of Neo4j upserts + Document link per chunk) with the batched path (batched
+embeddings, UNWIND upserts and one Document-link query per batch).
+
+Uses synthetic chunks with two pre-made triplets each, so no LLM calls are made.
+Results are reported per 1,000 chunks. Benchmark nodes are deleted afterwards.
+
+Usage:
+    1. Ensure Neo4j is running
+    2. Run (from backend/): python ../eval/bench_ingest_writes.py
+
+Options:
+    --chunks        Synthetic chunks to write (default: 1000)
+    --batch-size    Chunks per batch for the batched path (default: INGEST_BATCH_SIZE)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+# Make the backend `app` package importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from llama_index.core.graph_stores.types import EntityNode, Relation
+from llama_index.core.schema import MetadataMode, TextNode
+
+from app.config import settings
+from app.database import db
+from app.services.llm_factory import llm_factory
+
+BENCH_FILENAME = "__bench_ingest_writes__.pdf"
+LINK_QUERY = (
+    "MERGE (d:Document {id: $filename}) ON CREATE SET d.name = $filename "
+    "WITH d UNWIND $chunk_ids AS chunk_id "
+    "MATCH (c:Chunk {id: chunk_id}) "
+    "MERGE (d)-[:HAS_CHUNK]->(c)"
+)
+
+
+def make_chunks(count: int) -> list:
+    """Synthetic chunks (~900 chars) each carrying two entities and one relation."""
+    chunks = []
+    for i in range(count):
+        text = (f"Section {i}. Retrieval-augmented generation combines a retriever with a "
+                f"language model so answers stay grounded in source documents. ") * 6
+        node = TextNode(text=text, metadata={"filename": BENCH_FILENAME, "page_number": i // 4 + 1})
+        source = EntityNode(name=f"__bench_concept_{i}", label="Concept",
+                            properties={"triplet_source_id": node.node_id})
+        target = EntityNode(name=f"__bench_concept_{i + 1}", label="Concept",
+                            properties={"triplet_source_id": node.node_id})
+        relation = Relation(label="RELATED_TO", source_id=source.id, target_id=target.id,
+                            properties={"triplet_source_id": node.node_id})
+        chunks.append((node, [source, target], [relation]))
+    return chunks
+
+
+def write(store, chunks: list):
+    nodes = [node for node, _, _ in chunks]
+    store.upsert_llama_nodes(nodes)
+    store.upsert_nodes([kg for _, kg_nodes, _ in chunks for kg in kg_nodes])
+    store.upsert_relations([rel for _, _, rels in chunks for rel in rels])
+    with db.get_session() as session:
+        session.run(LINK_QUERY, filename=BENCH_FILENAME, chunk_ids=[n.node_id for n in nodes])
+
+
+def cleanup():
+    with db.get_session() as session:
+        session.run("MATCH (c:Chunk) WHERE c.filename = $f DETACH DELETE c", f=BENCH_FILENAME)
+        session.run("MATCH (d:Document {id: $f}) DETACH DELETE d", f=BENCH_FILENAME)
+        session.run("MATCH (e) WHERE e.name STARTS WITH '__bench_concept_' DETACH DELETE e")
+
+
+def run_per_chunk(store, embed_model, chunks: list) -> tuple[float, float]:
+    embed_s = write_s = 0.0
+    for chunk in chunks:
+        node = chunk[0]
+        start = time.perf_counter()
+        node.embedding = embed_model.get_text_embedding(node.get_content(metadata_mode=MetadataMode.EMBED))
+        embed_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        write(store, [chunk])
+        write_s += time.perf_counter() - start
+    return embed_s, write_s
+
+
+def run_batched(store, embed_model, chunks: list, batch_size: int) -> tuple[float, float]:
+    embed_s = write_s = 0.0
+    for offset in range(0, len(chunks), batch_size):
+        batch = chunks[offset: offset + batch_size]
+        texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node, _, _ in batch]
+        start = time.perf_counter()
+        embeddings = embed_model.get_text_embedding_batch(texts)
+        embed_s += time.perf_counter() - start
+        for (node, _, _), embedding in zip(batch, embeddings):
+            node.embedding = embedding
+
+        start = time.perf_counter()
+        write(store, batch)
+        write_s += time.perf_counter() - start
+    return embed_s, write_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestion embedding + Neo4j write benchmark")
+    parser.add_argument("--chunks", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=settings.INGEST_BATCH_SIZE)
+    args = parser.parse_args()
+
+    db.connect()
+    store = llm_factory.get_storage_context().property_graph_store
+    embed_model = llm_factory.embed_model
+    scale = 1000 / args.chunks
+
+    try:
+        cleanup()
+        before = run_per_chunk(store, embed_model, make_chunks(args.chunks))
+        cleanup()
+        after = run_batched(store, embed_model, make_chunks(args.chunks), args.batch_size)
+    finally:
+        cleanup()
+        db.close()
+
+    print(f"\n{'='*64}")
+    print(f"  Ingestion Write Benchmark — {args.chunks} chunks (batch size {args.batch_size})")
+    print(f"  Seconds per 1,000 chunks")
+    print(f"{'='*64}")
+    print(f"  {'path':<12} | {'embedding':>10} | {'neo4j write':>11} | {'total':>8}")
+    for name, (embed_s, write_s) in (("per-chunk", before), ("batched", after)):
+        print(f"  {name:<12} | {embed_s * scale:>10.2f} | {write_s * scale:>11.2f} | "
+              f"{(embed_s + write_s) * scale:>8.2f}")
+    print(f"{'='*64}\n")
+
+
+if __name__ == "__main__":
+    main()
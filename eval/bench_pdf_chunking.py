@@ -0,0 +1,87 @@
+"""
+NeuroSpace Benchmark — PDF Chunk Sizing vs LLM Tokens per Document
+====================================================================
+Splits one PDF with several chunking settings and estimates the LLM tokens
+graph extraction will send for it: per chunk, the chunk text plus the
+extraction prompt plus room for the returned triplets (the same estimate the
+Groq limiter reserves). Also reports the overlap overhead: chunk tokens
+relative to the document's own token count.
+
+No Groq calls are made. Real usage per ingested document is logged by
+GraphService ("Sent N tokens to the LLM in M extraction calls").
+
+Usage:
+    Run (from backend/): python ../eval/bench_pdf_chunking.py --pdf "test_files/Simple RAG.pdf"
+
+Options:
+    --pdf           PDF to split (default: backend/test_files/Simple RAG.pdf)
+    --configs       Settings to compare: "chars" or "<tokens>:<overlap>" (default: chars 256:32 512:32 1024:64)
+"""
+
+import argparse
+import os
+import sys
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+# Make the backend `app` package importable
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from llama_index.core.prompts.default_prompts import DEFAULT_KG_TRIPLET_EXTRACT_PROMPT
+
+from app.config import settings
+from app.services import pdf as pdf_module
+from app.services.pdf import count_tokens, pdf_processor
+
+MAX_PATHS_PER_CHUNK = 5  # GraphService._make_extractor
+OUTPUT_TOKENS = MAX_PATHS_PER_CHUNK * 25
+
+
+def split_with(config: str, path: str):
+    if config == "chars":
+        settings.PDF_SPLITTER = "chars"
+    else:
+        tokens, overlap = config.split(":")
+        settings.PDF_SPLITTER = "tokens"
+        settings.PDF_CHUNK_TOKENS = int(tokens)
+        settings.PDF_CHUNK_OVERLAP_TOKENS = int(overlap)
+    pdf_processor.splitter = pdf_module._make_splitter()
+    return pdf_processor.process_pdf(path, workers=1).chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF chunk sizing vs extraction tokens")
+    parser.add_argument("--pdf", default=os.path.join(BACKEND_DIR, "test_files", "Simple RAG.pdf"))
+    parser.add_argument("--configs", nargs="+", default=["chars", "256:32", "512:32", "1024:64"])
+    args = parser.parse_args()
+
+    prompt_tokens = count_tokens(DEFAULT_KG_TRIPLET_EXTRACT_PROMPT.template)
+    # Document tokens without overlap (a chunk size no page reaches = one chunk per page)
+    document_tokens = sum(count_tokens(c.text) for c in split_with("100000:0", args.pdf))
+
+    rows = []
+    for config in args.configs:
+        chunks = split_with(config, args.pdf)
+        chunk_tokens = sum(count_tokens(c.text) for c in chunks)
+        sent = chunk_tokens + len(chunks) * (prompt_tokens + OUTPUT_TOKENS)
+        rows.append((config, len(chunks), chunk_tokens / max(1, len(chunks)),
+                     chunk_tokens / max(1, document_tokens) - 1, sent))
+
+    baseline = rows[0][4] if rows else 0
+    print(f"\n{'='*76}")
+    print(f"  PDF Chunking Benchmark — {os.path.basename(args.pdf)} "
+          f"({document_tokens} tokens, prompt {prompt_tokens} tokens/call)")
+    print(f"{'='*76}")
+    print(f"  {'config':<10} | {'chunks':>6} | {'tok/chunk':>9} | {'overlap':>8} | "
+          f"{'tokens sent':>11} | {'vs first':>8}")
+    for config, count, per_chunk, overlap, sent in rows:
+        print(f"  {config:<10} | {count:>6} | {per_chunk:>9.0f} | {overlap:>7.1%} | "
+              f"{sent:>11} | {sent / baseline:>7.2f}x")
+    print(f"{'='*76}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+NeuroSpace Benchmark — Query Engine Cold Start vs Warm Path
+=============================================================
+Measures how long /chat spends building the PropertyGraphIndex + retrievers
+(cold start) versus reusing the long-lived engine (warm path).
+
+The exact and semantic answer caches are flushed before every query so each
+run goes through the full retrieval + synthesis pipeline.
+
+Usage:
+    1. Ensure Neo4j is running with an ingested corpus
+    2. Run (from backend/): python ../eval/bench_query_engine.py
+
+Options:
+    --mode          Retrieval mode: hybrid, vector_only, synonym_only (default: hybrid)
+    --runs          Warm queries to run after the cold one (default: 5)
+    --question      Question to ask (default: a corpus question)
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+# Make the backend `app` package importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.database import db
+from app.services.query_engine import query_service
+
+
+def time_engine_build(mode: str) -> tuple[float, float]:
+    """Returns (cold_ms, warm_ms) for fetching the query engine alone."""
+    db.bump_graph_version()  # Force a rebuild
+
+    start = time.perf_counter()
+    query_service._get_query_engine(mode=mode)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    query_service._get_query_engine(mode=mode)
+    warm_ms = (time.perf_counter() - start) * 1000
+    return cold_ms, warm_ms
+
+
+def time_queries(question: str, mode: str, runs: int) -> tuple[float, list[float]]:
+    """Returns (cold_query_ms, [warm_query_ms, ...]) for full ask() calls."""
+    db.bump_graph_version()
+
+    query_service.clear_caches()
+    start = time.perf_counter()
+    query_service.ask(question, mode=mode)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    warm = []
+    for _ in range(runs):
+        query_service.clear_caches()
+        start = time.perf_counter()
+        query_service.ask(question, mode=mode)
+        warm.append((time.perf_counter() - start) * 1000)
+    return cold_ms, warm
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query engine cold vs warm latency")
+    parser.add_argument("--mode", default="hybrid", choices=["hybrid", "vector_only", "synonym_only"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--question", default="What is retrieval-augmented generation?")
+    args = parser.parse_args()
+
+    db.connect()
+    try:
+        build_cold, build_warm = time_engine_build(args.mode)
+        query_cold, query_warm = time_queries(args.question, args.mode, args.runs)
+    finally:
+        db.close()
+
+    print(f"\n{'='*60}")
+    print(f"  Query Engine Benchmark (mode={args.mode})")
+    print(f"{'='*60}")
+    print(f"  Engine build  — cold: {build_cold:8.1f}ms   warm: {build_warm:8.3f}ms")
+    print(f"  Full query    — cold: {query_cold:8.1f}ms")
+    if query_warm:
+        print(f"                  warm: p50 {statistics.median(query_warm):.1f}ms "
+              f"| min {min(query_warm):.1f}ms | max {max(query_warm):.1f}ms "
+              f"({len(query_warm)} runs)")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
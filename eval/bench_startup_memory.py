@@ -0,0 +1,117 @@
+"""
+NeuroSpace Benchmark — API Startup Time & Resident Memory
+===========================================================
+Starts a fresh Python process that imports the API (`app.main`) and reports:
+  - import time (what every API process / replica pays at startup)
+  - RSS after import (a node that only serves /chat stays here)
+and, with --video, continues in the same process to run one video through
+audio extraction + transcription and reports:
+  - time of the first video job (includes the lazy Whisper load)
+  - RSS with Whisper loaded
+  - RSS after the idle unload (WHISPER_IDLE_UNLOAD_SECONDS is set to --idle)
+
+Each measurement runs in its own subprocess so nothing is already imported.
+RSS is read from /proc (Linux).
+
+Usage:
+    1. Ensure Neo4j is running (the API connects at import)
+    2. Run (from backend/): python ../eval/bench_startup_memory.py --video lecture.mp4
+
+Options:
+    --video         Video for the "with videos" run (omit for startup only)
+    --idle          Idle seconds before Whisper unloads in the video run (default: 5)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+CHILD = r"""
+import gc, json, sys, time
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+out = {}
+start = time.perf_counter()
+import app.main
+out["import_s"] = time.perf_counter() - start
+out["rss_import_mb"] = rss_mb()
+
+video, idle = sys.argv[1], float(sys.argv[2])
+if video:
+    from app.services.transcription import transcriber
+    from app.services.video import video_processor
+    start = time.perf_counter()
+    audio = video_processor.extract_pcm(video)
+    transcriber.transcribe(audio)
+    del audio
+    gc.collect()
+    out["first_video_s"] = time.perf_counter() - start
+    out["whisper_load_s"] = transcriber.load_seconds
+    out["rss_loaded_mb"] = rss_mb()
+    time.sleep(idle + 2)
+    out["unloaded"] = not transcriber.is_loaded
+    out["rss_unloaded_mb"] = rss_mb()
+
+print("__RESULT__" + json.dumps(out))
+"""
+
+
+def run_child(video: str, idle: float) -> dict:
+    env = dict(os.environ, WHISPER_IDLE_UNLOAD_SECONDS=str(idle))
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD, video or "", str(idle)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith("__RESULT__"):
+            return json.loads(line[len("__RESULT__"):])
+    raise RuntimeError(f"Benchmark child failed:\n{proc.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API startup time and RSS benchmark")
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--idle", type=float, default=5.0)
+    args = parser.parse_args()
+
+    def mb(value):
+        return f"{value:.0f} MB" if value is not None else "n/a"
+
+    without = run_child("", args.idle)
+    print(f"\n{'='*60}")
+    print(f"  Startup & Memory Benchmark")
+    print(f"{'='*60}")
+    print(f"  Without videos")
+    print(f"    import app.main:         {without['import_s']:.2f}s")
+    print(f"    RSS after startup:       {mb(without['rss_import_mb'])}")
+
+    if args.video:
+        with_video = run_child(args.video, args.idle)
+        print(f"  With one video ({os.path.basename(args.video)})")
+        print(f"    import app.main:         {with_video['import_s']:.2f}s")
+        print(f"    first video job:         {with_video['first_video_s']:.1f}s "
+              f"(Whisper load {with_video['whisper_load_s'] or 0:.1f}s)")
+        print(f"    RSS with Whisper loaded: {mb(with_video['rss_loaded_mb'])}")
+        print(f"    RSS after {args.idle:.0f}s idle:     {mb(with_video['rss_unloaded_mb'])} "
+              f"(unloaded: {'yes' if with_video['unloaded'] else 'NO'})")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+NeuroSpace Benchmark — Graph Extraction Calls per Video Hour
+==============================================================
+Counts how many graph extraction LLM calls a video costs, one per chunk:
+  - before: one chunk per Whisper segment
+  - after: segments merged by TranscriptChunker (token / duration budget with overlap)
+Results are normalised to calls per hour of video. Several budgets can be compared.
+
+The transcript comes from transcribing --audio, or from a saved /test-transcribe
+response (--transcript, JSON with a "segments" list), so no Groq calls are made.
+
+Usage:
+    Run (from backend/): python ../eval/bench_transcript_chunks.py --audio lecture.mp3
+
+Options:
+    --audio         Audio/video file to transcribe
+    --transcript    TranscriptionResult JSON instead of --audio
+    --budgets       token:seconds budgets to compare (default: the configured one, 200:60, 800:240)
+    --overlap       Overlap seconds (default: TRANSCRIPT_CHUNK_OVERLAP_SECONDS)
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+# Make the backend `app` package importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.config import settings
+from app.schemas import TranscriptSegment
+from app.services.transcript_chunker import TranscriptChunker
+
+
+def load_segments(args) -> list[TranscriptSegment]:
+    if args.transcript:
+        with open(args.transcript, encoding="utf-8") as f:
+            return [TranscriptSegment(**segment) for segment in json.load(f)["segments"]]
+    from app.services.transcription import transcriber
+    return transcriber.transcribe(args.audio).segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction calls per video hour, per segment vs merged chunks")
+    parser.add_argument("--audio", default=None)
+    parser.add_argument("--transcript", default=None)
+    parser.add_argument("--budgets", nargs="+", default=None)
+    parser.add_argument("--overlap", type=float, default=settings.TRANSCRIPT_CHUNK_OVERLAP_SECONDS)
+    args = parser.parse_args()
+    if not args.audio and not args.transcript:
+        parser.error("pass --audio or --transcript")
+
+    segments = load_segments(args)
+    duration_s = segments[-1].end if segments else 0.0
+    budgets = args.budgets or [
+        f"{settings.TRANSCRIPT_CHUNK_TOKENS}:{settings.TRANSCRIPT_CHUNK_SECONDS:g}", "200:60", "800:240",
+    ]
+
+    rows = [("per segment (before)", len(segments), TranscriptChunker.calls_per_hour(len(segments), duration_s),
+             sum(TranscriptChunker.estimate_tokens(s.text) for s in segments) / max(1, len(segments)))]
+    for budget in budgets:
+        tokens, seconds = budget.split(":")
+        chunker = TranscriptChunker(max_tokens=int(tokens), max_seconds=float(seconds),
+                                    overlap_seconds=args.overlap)
+        chunks = chunker.chunk(segments)
+        rows.append((f"merged {tokens} tok / {seconds}s", len(chunks),
+                     chunker.calls_per_hour(len(chunks), duration_s),
+                     sum(chunker.estimate_tokens(c["text"]) for c in chunks) / max(1, len(chunks))))
+
+    print(f"\n{'='*70}")
+    print(f"  Extraction Calls per Video Hour — {len(segments)} segments, "
+          f"{duration_s / 60:.1f} min (overlap {args.overlap:g}s)")
+    print(f"{'='*70}")
+    print(f"  {'chunking':<26} | {'chunks':>7} | {'calls/hour':>10} | {'avg tokens/chunk':>16}")
+    for name, count, per_hour, avg_tokens in rows:
+        print(f"  {name:<26} | {count:>7} | {per_hour:>10.0f} | {avg_tokens:>16.0f}")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
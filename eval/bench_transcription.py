@@ -0,0 +1,82 @@
+"""
+NeuroSpace Benchmark — Transcription Real-Time Factor
+=======================================================
+Transcribes one audio/video file with the single-pass Whisper path
+(Transcriber.transcribe, workers=1) and with the chunked parallel path
+(Transcriber.transcribe_chunked: VAD-split windows on N worker replicas).
+Reports the real-time factor (processing seconds / audio seconds, lower is
+better) and the speedup, plus segment and word counts so transcript drift
+between the two paths is visible.
+
+Usage:
+    Run (from backend/): python ../eval/bench_transcription.py --audio lecture.mp3
+
+Options:
+    --audio         Audio or video file to transcribe (anything ffmpeg/PyAV can decode)
+    --model         Whisper model size (default: small)
+    --workers       Worker counts for the chunked path (default: 2 4)
+    --window        Window length in seconds for the chunked path (default: TRANSCRIBE_WINDOW_SECONDS)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+# Make the backend `app` package importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from faster_whisper import decode_audio
+
+from app.config import settings
+from app.services.transcription import SAMPLE_RATE, Transcriber
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Whisper real-time factor benchmark")
+    parser.add_argument("--audio", required=True)
+    parser.add_argument("--model", default="small")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--window", type=float, default=settings.TRANSCRIBE_WINDOW_SECONDS)
+    args = parser.parse_args()
+
+    # Decode once so every run transcribes the same samples and decoding isn't timed
+    audio = decode_audio(args.audio, sampling_rate=SAMPLE_RATE)
+    audio_s = len(audio) / SAMPLE_RATE
+
+    rows = []
+    single = Transcriber(model_size=args.model, workers=1)
+    single.load()  # Model load is not part of the timed run
+    start = time.perf_counter()
+    result = single.transcribe(audio)
+    rows.append(("single pass", time.perf_counter() - start, len(result.segments),
+                 sum(len(s.text.split()) for s in result.segments)))
+    del single
+
+    for workers in args.workers:
+        chunked = Transcriber(model_size=args.model, workers=workers)
+        chunked.load()
+        start = time.perf_counter()
+        result = chunked.transcribe_chunked(audio, window_s=args.window)
+        rows.append((f"chunked x{workers}", time.perf_counter() - start, len(result.segments),
+                     sum(len(s.text.split()) for s in result.segments)))
+        del chunked
+
+    baseline = rows[0][1]
+    print(f"\n{'='*68}")
+    print(f"  Transcription Benchmark — {os.path.basename(args.audio)} "
+          f"({audio_s / 60:.1f} min, model={args.model}, window={args.window:.0f}s)")
+    print(f"{'='*68}")
+    print(f"  {'path':<12} | {'seconds':>8} | {'RTF':>6} | {'speedup':>7} | {'segments':>8} | {'words':>6}")
+    for name, elapsed_s, segment_count, words in rows:
+        print(f"  {name:<12} | {elapsed_s:>8.1f} | {elapsed_s / audio_s:>6.3f} | "
+              f"{baseline / elapsed_s:>6.2f}x | {segment_count:>8} | {words:>6}")
+    print(f"{'='*68}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+NeuroSpace Benchmark — Upload Throughput & Event-Loop Stalls
+==============================================================
+Uploads a large synthetic "video" to /ingest (default 2 GB) and reports:
+  - upload throughput (MB/s, client-side wall clock)
+  - event-loop stall time: while the upload runs, a probe hits the health
+    endpoint (/) every 50 ms. A blocked event loop shows up as probe latency.
+
+The file is random-prefixed so it never matches an earlier upload's hash.
+It is streamed as a hand-built multipart body, so the client never holds it in memory.
+Note: the queued job will fail at the audio-extraction step (the bytes are not
+a real MP4), and the object stays in MinIO until /clear.
+
+Usage:
+    1. Ensure the backend (and MinIO) are running
+    2. Run: python eval/bench_upload.py --size-mb 2048
+
+Options:
+    --api-url       Backend URL (default: http://localhost:8000)
+    --size-mb       Upload size in MB (default: 2048)
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import requests
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+BLOCK = 1024 * 1024
+
+
+def make_file(size_mb: int) -> str:
+    """Writes a unique file of size_mb MB (one random block repeated) and returns its path."""
+    block = os.urandom(BLOCK)
+    fd, path = tempfile.mkstemp(suffix=".mp4")
+    with os.fdopen(fd, "wb") as f:
+        f.write(uuid.uuid4().bytes)
+        for _ in range(size_mb):
+            f.write(block)
+    return path
+
+
+def multipart_body(path: str, filename: str, boundary: str):
+    """Yields a multipart/form-data body for one file field, reading the file in blocks."""
+    yield (f"--{boundary}\r\n"
+           f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+           f"Content-Type: video/mp4\r\n\r\n").encode()
+    with open(path, "rb") as f:
+        while block := f.read(BLOCK):
+            yield block
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+def probe_health(api_url: str, stop: threading.Event, samples: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            requests.get(f"{api_url}/", timeout=60)
+            samples.append((time.perf_counter() - start) * 1000)
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/ingest upload throughput + event-loop stall benchmark")
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--size-mb", type=int, default=2048)
+    args = parser.parse_args()
+
+    print(f"  Generating {args.size_mb} MB test file...")
+    path = make_file(args.size_mb)
+    size_mb = os.path.getsize(path) / BLOCK
+    filename = f"__bench_upload_{uuid.uuid4().hex[:8]}.mp4"
+    boundary = uuid.uuid4().hex
+
+    samples = []
+    stop = threading.Event()
+    probe = threading.Thread(target=probe_health, args=(args.api_url, stop, samples), daemon=True)
+
+    try:
+        # Baseline probe latency with an idle server
+        idle = []
+        for _ in range(20):
+            start = time.perf_counter()
+            requests.get(f"{args.api_url}/", timeout=10)
+            idle.append((time.perf_counter() - start) * 1000)
+
+        probe.start()
+        start = time.perf_counter()
+        resp = requests.post(
+            f"{args.api_url}/ingest",
+            data=multipart_body(path, filename, boundary),
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+            timeout=3600,
+        )
+        elapsed_s = time.perf_counter() - start
+        stop.set()
+        probe.join()
+    finally:
+        os.remove(path)
+
+    idle_p50 = statistics.median(idle)
+    stalls = [s - idle_p50 for s in samples if s - idle_p50 > 100]
+
+    print(f"\n{'='*60}")
+    print(f"  Upload Benchmark — {size_mb:.0f} MB → /ingest (HTTP {resp.status_code})")
+    print(f"{'='*60}")
+    print(f"  Upload time:        {elapsed_s:.1f}s ({size_mb / elapsed_s:.1f} MB/s)")
+    print(f"  Health probe idle:  p50 {idle_p50:.1f}ms")
+    if samples:
+        print(f"  Health probe load:  p50 {statistics.median(samples):.1f}ms | max {max(samples):.1f}ms "
+              f"({len(samples)} probes)")
+    print(f"  Event-loop stalls:  {len(stalls)} probe(s) >100ms over idle, "
+          f"{sum(stalls) / 1000:.2f}s total")
+    print(f"  Response: {resp.text[:200]}")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+NeuroSpace Benchmark — Video Audio Extraction: MP3 file vs piped PCM
+======================================================================
+Runs the audio half of the video pipeline on one video in both modes:
+  - mp3: ffmpeg encodes an MP3 (-q:a 0) to disk, Whisper decodes it again
+  - pcm: ffmpeg decodes straight to 16 kHz mono PCM on a pipe (no temp file)
+and reports wall-clock time for extraction and transcription and the disk
+bytes read/written (this process + ffmpeg; Linux only).
+
+Note: the OS page cache absorbs most reads after the first run, so the first
+mode to run pays the cold read of the video. Use --repeat to warm it up first.
+
+Usage:
+    Run (from backend/): python ../eval/bench_video_audio.py --video lecture.mp4
+
+Options:
+    --video         Video file to process
+    --repeat        Runs per mode; the last one is reported (default: 1)
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Force UTF-8 output on Windows to avoid cp1252 emoji encoding errors
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+# Make the backend `app` package importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.services.transcription import transcriber
+from app.services.video import disk_io_bytes, video_processor
+
+
+def run(video: str, mode: str) -> dict:
+    io_before = disk_io_bytes()
+    start = time.perf_counter()
+    audio_path = None
+    if mode == "pcm":
+        audio = video_processor.extract_pcm(video)
+    else:
+        fd, audio_path = tempfile.mkstemp(suffix=".mp3")
+        os.close(fd)
+        audio = video_processor.extract_audio(video, audio_path)
+    extract_s = time.perf_counter() - start
+
+    result = transcriber.transcribe(audio, name=os.path.basename(video))
+    total_s = time.perf_counter() - start
+    io_after = disk_io_bytes()
+    if audio_path:
+        os.remove(audio_path)
+
+    return {
+        "extract_s": extract_s,
+        "transcribe_s": total_s - extract_s,
+        "total_s": total_s,
+        "read_mb": (io_after[0] - io_before[0]) / 1e6 if io_before and io_after else None,
+        "written_mb": (io_after[1] - io_before[1]) / 1e6 if io_before and io_after else None,
+        "segments": len(result.segments),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MP3 vs piped PCM audio extraction benchmark")
+    parser.add_argument("--video", required=True)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ("mp3", "pcm"):
+        for _ in range(args.repeat):
+            results[mode] = run(args.video, mode)
+
+    def mb(value):
+        return f"{value:>9.1f}" if value is not None else f"{'n/a':>9}"
+
+    print(f"\n{'='*76}")
+    print(f"  Video Audio Benchmark — {os.path.basename(args.video)}")
+    print(f"{'='*76}")
+    print(f"  {'mode':<5} | {'extract s':>9} | {'transcribe s':>12} | {'total s':>8} | "
+          f"{'read MB':>9} | {'write MB':>9} | {'segs':>5}")
+    for mode, r in results.items():
+        print(f"  {mode:<5} | {r['extract_s']:>9.1f} | {r['transcribe_s']:>12.1f} | {r['total_s']:>8.1f} | "
+              f"{mb(r['read_mb'])} | {mb(r['written_mb'])} | {r['segments']:>5}")
+    print(f"{'='*76}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import sys
+import os
+from concurrent.futures import TimeoutError
+
+import pytest
+
+# Add backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app.services.embedding_batcher import EmbeddingBatcher
+
+
+class ThreadKilled(BaseException):
+    """Escapes the batcher's `except Exception`, like a crash of the thread itself."""
+
+
+class FlakyModel:
+    def __init__(self):
+        self.fail_with = None
+
+    def get_text_embedding_batch(self, texts):
+        if self.fail_with is not None:
+            raise self.fail_with
+        return [[float(len(text))] for text in texts]
+
+
+def test_thread_death_fails_waiters_and_restarts(monkeypatch):
+    monkeypatch.setattr("threading.excepthook", lambda args: None)  # Expected crash, keep the output quiet
+    model = FlakyModel()
+    batcher = EmbeddingBatcher(lambda: model, max_wait_ms=1, cache_size=0)
+
+    model.fail_with = ThreadKilled()
+    with pytest.raises(ThreadKilled):
+        batcher.submit("first").result(timeout=5)
+
+    model.fail_with = None
+    try:
+        assert batcher.submit("second").result(timeout=5) == [6.0]
+    except TimeoutError:
+        pytest.fail("submit() hung after the batcher thread died")
+
+
+def test_short_batch_fails_instead_of_hanging():
+    model = FlakyModel()
+    model.get_text_embedding_batch = lambda texts: []
+    batcher = EmbeddingBatcher(lambda: model, max_wait_ms=1, cache_size=0)
+    with pytest.raises(RuntimeError):
+        batcher.submit("lost").result(timeout=5)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,58 @@
+import sys
+import os
+
+# Add backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app.services.job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue
+
+
+def test_job_interrupted_max_attempts_times_is_failed(tmp_path):
+    # stale_after=-1: every running job looks abandoned, as after a crash
+    queue = JobQueue(str(tmp_path / "jobs.db"), stale_after=-1, max_attempts=2)
+    job_id = queue.enqueue(str(tmp_path / "huge.pdf"), "huge.pdf", "application/pdf")
+
+    assert queue._claim_next()["id"] == job_id
+    assert queue._requeue_interrupted() == 1
+    assert queue.get(job_id)["status"] == QUEUED
+
+    assert queue._claim_next()["id"] == job_id
+    assert queue._requeue_interrupted() == 0
+    job = queue.get(job_id)
+    assert job["status"] == FAILED
+    assert job["error"] == "interrupted 2 times"
+    assert queue._claim_next() is None
+
+
+def test_stalled_worker_cannot_finish_a_job_claimed_elsewhere(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    stalled = JobQueue(db_path)
+    other = JobQueue(db_path, stale_after=-1)
+    job_id = stalled.enqueue(str(tmp_path / "notes.pdf"), "notes.pdf", "application/pdf")
+
+    assert stalled._claim_next()["id"] == job_id
+    assert other._requeue_interrupted() == 1  # `stalled` missed its heartbeats
+    assert other._claim_next()["id"] == job_id
+
+    assert not stalled.update(job_id, stage="building_graph")
+    assert stalled._finish(job_id, DONE) is None
+    job = other.get(job_id)
+    assert job["status"] == RUNNING and job["owner"] == other.owner
+
+    assert other._finish(job_id, DONE) == []
+    assert other.get(job_id)["status"] == DONE
+
+
+def test_duplicate_of_a_queued_job_is_aliased_when_it_finishes(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    job_id, duplicate_of = queue.enqueue_unique("/spool/a", "notes.pdf", "application/pdf", "sha")
+    assert duplicate_of is None
+    assert queue.enqueue_unique("/spool/b", "notes (1).pdf", "application/pdf", "sha") == (None, "notes.pdf")
+
+    assert queue._claim_next()["id"] == job_id
+    assert queue._finish(job_id, DONE) == ["notes (1).pdf"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
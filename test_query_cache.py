@@ -0,0 +1,22 @@
+import sys
+import os
+
+# Add backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app.database import db
+
+
+def test_answer_caches_follow_graph_version(query_service):
+    first = query_service.ask("What is RAG?", mode="synonym_only")
+    assert query_service.ask("What is RAG?", mode="synonym_only")["latency_ms"] == 0.0  # Exact cache hit
+    assert first["latency_ms"] > 0.0  # The stored answer itself isn't mutated by the hit
+
+    db.bump_graph_version()  # e.g. an ingestion finished
+    assert query_service.ask("What is RAG?", mode="synonym_only")["latency_ms"] > 0.0
+    assert query_service.semantic_cache.stats()["entries"] == {"synonym_only": 1}
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
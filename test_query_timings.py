@@ -0,0 +1,17 @@
+import sys
+
+
+def test_synthesis_timings_after_engine_build(query_service):
+    result = query_service.ask("What is RAG?", mode="synonym_only", include_timings=True)
+
+    timings = result["timings"]
+    assert "llm_synthesis" in timings
+    assert "prompt_assembly" in timings
+    # Single-retriever modes must go through the timed sync sub-retriever path too
+    assert "synonym_expansion" in timings
+    assert "graph_traversal" in timings
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,75 @@
+import sys
+import os
+
+import pytest
+
+# Add backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app.services.rate_limiter import TokenBucketLimiter, is_rate_limited, parse_duration
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("1m2.5s", 62.5),
+    ("2m59.56s", 179.56),
+    ("7.66s", 7.66),
+    ("120ms", 0.12),
+    ("1h", 3600.0),
+    ("30", 30.0),  # Retry-After is plain seconds
+])
+def test_parse_duration(value, seconds):
+    assert parse_duration(value) == pytest.approx(seconds)
+
+
+@pytest.mark.parametrize("value", [None, "", "soon"])
+def test_parse_duration_rejects_missing_or_garbage(value):
+    assert parse_duration(value) is None
+
+
+def test_settle_with_more_than_estimated_puts_the_bucket_in_debt():
+    limiter = TokenBucketLimiter(tokens_per_minute=60_000)  # Refills 1000 tokens/s
+    with limiter.reserve(100) as usage:
+        usage["tokens"], usage["calls"] = 60_100, 1  # A full bucket more than reserved
+    assert limiter._tokens == pytest.approx(-100, abs=20)
+    # The debt is paid back before the next caller gets tokens
+    assert limiter.acquire(0) == pytest.approx(0.1, abs=0.03)
+
+
+def test_settle_without_reported_usage_keeps_the_estimate():
+    limiter = TokenBucketLimiter(tokens_per_minute=6000)
+    with limiter.reserve(1000):
+        pass
+    assert limiter._tokens == pytest.approx(5000, abs=1)
+
+
+def test_remaining_tokens_header_lowers_the_bucket():
+    limiter = TokenBucketLimiter(tokens_per_minute=6000)
+    limiter.observe_response(200, {"x-ratelimit-remaining-tokens": "250"})
+    assert limiter._tokens == pytest.approx(250, abs=1)
+    limiter.observe_response(200, {"x-ratelimit-remaining-tokens": "not a number"})
+    assert limiter._tokens == pytest.approx(250, abs=1)
+
+
+def test_429_pauses_acquire_for_retry_after():
+    limiter = TokenBucketLimiter(tokens_per_minute=600_000)
+    limiter.observe_response(429, {"retry-after": "0.3"})
+    assert limiter.rate_limited_responses == 1
+    assert limiter.acquire(1) == pytest.approx(0.3, abs=0.05)
+
+
+def test_429_without_retry_after_uses_the_token_reset():
+    limiter = TokenBucketLimiter(tokens_per_minute=600_000)
+    limiter.observe_response(429, {"x-ratelimit-reset-tokens": "200ms"})
+    assert limiter.acquire(1) == pytest.approx(0.2, abs=0.05)
+
+
+def test_is_rate_limited():
+    class RateLimitError(Exception):
+        status_code = 429
+
+    assert is_rate_limited(RateLimitError())
+    assert not is_rate_limited(ValueError())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,44 @@
+import sys
+import os
+import threading
+import time
+
+# Add backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app.services.transcription import Transcriber
+
+
+def test_status_does_not_wait_for_a_model_load(monkeypatch):
+    transcriber = Transcriber()
+    release = threading.Event()
+    loads = []
+
+    def slow_load():
+        loads.append(1)
+        release.wait(5)
+        transcriber.load_seconds = 0.1
+        return object()
+
+    monkeypatch.setattr(transcriber, "_load_model", slow_load)
+    loaders = [threading.Thread(target=transcriber.load) for _ in range(2)]
+    for loader in loaders:
+        loader.start()
+    while not loads:
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    status = transcriber.status()
+    assert time.perf_counter() - start < 0.5
+    assert status["loading"] and not status["loaded"]
+
+    release.set()
+    for loader in loaders:
+        loader.join(5)
+    assert len(loads) == 1  # The second caller waited for the first load instead of loading again
+    assert transcriber.status()["loaded"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
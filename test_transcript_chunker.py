@@ -0,0 +1,75 @@
+import sys
+import os
+
+# Add backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app.schemas import TranscriptSegment
+from app.services.transcript_chunker import TranscriptChunker
+
+
+def whisper_segments(count: int, seconds: float = 3.0) -> list[TranscriptSegment]:
+    """`count` back-to-back segments of 10 estimated tokens (40 chars) each."""
+    return [
+        TranscriptSegment(start=i * seconds, end=(i + 1) * seconds, text=f"segment {i:03d} ".ljust(40, "x"))
+        for i in range(count)
+    ]
+
+
+def covered(chunk: dict, segments: list[TranscriptSegment]) -> list[TranscriptSegment]:
+    return [s for s in segments if s.start >= chunk["start"] and s.end <= chunk["end"]]
+
+
+def test_chunks_stay_within_budgets_and_overlap():
+    chunker = TranscriptChunker(max_tokens=50, max_seconds=12, overlap_seconds=4)
+    segments = whisper_segments(20)
+    chunks = chunker.chunk(segments)
+
+    assert chunks[0]["start"] == 0.0
+    assert chunks[-1]["end"] == 60.0
+    for chunk in chunks:
+        inside = covered(chunk, segments)
+        assert chunk["text"] == " ".join(s.text for s in inside)
+        assert sum(chunker.estimate_tokens(s.text) for s in inside) <= 50
+        assert chunk["end"] - chunk["start"] <= 12
+
+    for previous, current in zip(chunks, chunks[1:]):
+        # The next chunk repeats the tail of the previous one, at most overlap_seconds of it
+        assert current["start"] < previous["end"]
+        assert previous["end"] - current["start"] <= 4
+        assert current["end"] > previous["end"]
+    assert len(chunks) < len(segments)
+
+
+def test_overlap_is_trimmed_to_fit_the_next_segment():
+    chunker = TranscriptChunker(max_tokens=25, max_seconds=600, overlap_seconds=60)
+    segments = whisper_segments(2) + [TranscriptSegment(start=6.0, end=9.0, text="y" * 80)]  # 20 tokens
+    chunks = chunker.chunk(segments)
+
+    assert [c["start"] for c in chunks] == [0.0, 6.0]
+    assert chunks[1]["text"] == "y" * 80  # No room for the overlapping segment
+    assert chunks[0]["end"] == 6.0
+
+
+def test_oversized_segment_becomes_its_own_chunk():
+    chunker = TranscriptChunker(max_tokens=50, max_seconds=120, overlap_seconds=0)
+    long_run = TranscriptSegment(start=3.0, end=200.0, text="z" * 4000)  # 1000 tokens, 197 s
+    segments = [whisper_segments(1)[0], long_run,
+                TranscriptSegment(start=200.0, end=203.0, text="after")]
+    chunks = chunker.chunk(segments)
+
+    assert [(c["start"], c["end"]) for c in chunks] == [(0.0, 3.0), (3.0, 200.0), (200.0, 203.0)]
+    assert chunks[1]["text"] == long_run.text
+
+
+def test_empty_segments_are_skipped():
+    chunker = TranscriptChunker()
+    segments = [TranscriptSegment(start=0.0, end=2.0, text=""),
+                TranscriptSegment(start=2.0, end=4.0, text="hello")]
+    assert chunker.chunk(segments) == [{"text": "hello", "start": 2.0, "end": 4.0}]
+    assert chunker.chunk([]) == []
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
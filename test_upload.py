@@ -0,0 +1,56 @@
+import asyncio
+import sys
+import os
+
+import pytest
+
+# Add backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app.services import upload as upload_module
+
+
+class FakeMultipart:
+    def __init__(self):
+        self.parts = []
+        self.aborted = False
+
+    def upload_part(self, data: bytes):
+        self.parts.append(data)
+
+    def abort(self):
+        self.aborted = True
+
+
+class DisconnectingUpload:
+    """An UploadFile whose client goes away after two reads."""
+    filename = "notes.pdf"
+    content_type = "application/pdf"
+
+    def __init__(self):
+        self.reads = 0
+
+    async def read(self, size: int) -> bytes:
+        self.reads += 1
+        if self.reads > 2:
+            raise ConnectionResetError("client disconnected")
+        return b"x" * 8
+
+
+def test_failed_upload_aborts_multipart_and_removes_spool_file(monkeypatch, tmp_path):
+    multipart = FakeMultipart()
+    storage = type("Storage", (), {"start_multipart_upload": lambda self, name, content_type: multipart})()
+    monkeypatch.setattr(upload_module, "get_storage", lambda: storage)
+    monkeypatch.setattr(upload_module.settings, "UPLOAD_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(upload_module.MultipartUpload, "PART_SIZE", 8)  # A part per read
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(upload_module.spool_upload(DisconnectingUpload(), "notes.pdf"))
+
+    assert multipart.parts  # Parts were in flight when the client went away
+    assert multipart.aborted
+    assert os.listdir(tmp_path) == []
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))